@@ -0,0 +1,155 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Benchmarks of the rotor and aerodynamic feature computation.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import numpy as np
+from benchmark_data import SAMPLE_SIZES, load_benchmark_data
+from src.models import rotor_models, aerodynamic_models
+
+# ChangingAxisRotorModel is only used as base class of the tilting and bi-directional rotors
+ROTOR_TYPES = [
+    "RotorModel",
+    "LinearRotorModel",
+    "BiDirectionalRotorModel",
+    "TiltingRotorModel",
+]
+AERO_MODELS = ["FuselageDragModel", "LinearWingModel", "PhiAerodynamicsModel"]
+
+ROTOR_CONFIG = {
+    "description": "benchmark rotor",
+    "dataframe_name": "u0",
+    "rotor_axis": [0, 0, -1],
+    "turning_direction": 1,
+    "position": [0.15, 0.15, 0.0],
+    "diameter": 0.24,
+    "tilt_axis": [0, 1, 0],
+    "max_tilt_angle_deg": 90,
+}
+
+AERO_CONFIG = {"area": 0.41, "chord": 0.19, "stall_angle_deg": 20}
+
+
+class RotorFeatures:
+    params = [ROTOR_TYPES, SAMPLE_SIZES]
+    param_names = ["rotor_type", "n_samples"]
+    timeout = 120.0
+
+    def setup(self, rotor_type, n_samples):
+        data_df = load_benchmark_data("quadrotor_model", n_samples)
+        u_vec = data_df["u0"].to_numpy()
+        self.u_vec = np.clip((u_vec - u_vec.min()) / np.ptp(u_vec), 0.0, 1.0)
+        self.tilt_vec = 0.5 * (1.0 + np.sin(np.arange(n_samples) * 1e-3))
+        self.v_airspeed_mat = data_df[["vx", "vy", "vz"]].to_numpy()
+        self.angular_vel_mat = data_df[
+            ["ang_vel_x", "ang_vel_y", "ang_vel_z"]
+        ].to_numpy()
+
+    def build_rotor(self, rotor_type):
+        rotor_config = dict(ROTOR_CONFIG, rotor_type=rotor_type)
+        if rotor_type == "LinearRotorModel":
+            return rotor_models.LinearRotorModel(self.u_vec)
+        elif rotor_type == "BiDirectionalRotorModel":
+            return rotor_models.BiDirectionalRotorModel(
+                rotor_config,
+                2.0 * self.u_vec - 1.0,
+                self.v_airspeed_mat,
+                angular_vel_mat=self.angular_vel_mat,
+            )
+        elif rotor_type == "TiltingRotorModel":
+            return rotor_models.TiltingRotorModel(
+                rotor_config,
+                self.u_vec,
+                self.v_airspeed_mat,
+                self.tilt_vec,
+                angular_vel_mat=self.angular_vel_mat,
+            )
+        return rotor_models.RotorModel(
+            rotor_config,
+            self.u_vec,
+            self.v_airspeed_mat,
+            angular_vel_mat=self.angular_vel_mat,
+        )
+
+    def time_force_features(self, rotor_type, n_samples):
+        self.build_rotor(rotor_type).compute_actuator_force_matrix()
+
+    def time_moment_features(self, rotor_type, n_samples):
+        self.build_rotor(rotor_type).compute_actuator_moment_matrix()
+
+
+class AeroFeatures:
+    params = [AERO_MODELS, SAMPLE_SIZES]
+    param_names = ["aero_model", "n_samples"]
+    timeout = 120.0
+
+    def setup(self, aero_model, n_samples):
+        data_df = load_benchmark_data("fixedwing_model", n_samples)
+        self.v_airspeed_mat = data_df[["vx", "vy", "vz"]].to_numpy()
+        self.angle_of_attack_vec = np.arctan2(
+            self.v_airspeed_mat[:, 2], self.v_airspeed_mat[:, 0]
+        )
+        self.angle_of_sideslip_vec = np.arctan2(
+            self.v_airspeed_mat[:, 1], np.linalg.norm(self.v_airspeed_mat, axis=1)
+        ).reshape(-1, 1)
+        self.elevator_vec = data_df["elevator"].to_numpy()
+        self.angular_vel_mat = data_df[
+            ["ang_vel_x", "ang_vel_y", "ang_vel_z"]
+        ].to_numpy()
+        if aero_model == "FuselageDragModel":
+            self.model = aerodynamic_models.FuselageDragModel()
+        else:
+            self.model = getattr(aerodynamic_models, aero_model)(AERO_CONFIG)
+
+    def time_force_features(self, aero_model, n_samples):
+        if aero_model == "FuselageDragModel":
+            self.model.compute_fuselage_features(self.v_airspeed_mat)
+        else:
+            self.model.compute_aero_force_features(
+                self.v_airspeed_mat, self.angle_of_attack_vec, self.elevator_vec
+            )
+
+    def time_moment_features(self, aero_model, n_samples):
+        if aero_model == "FuselageDragModel":
+            # the fuselage drag model has no moment features
+            raise NotImplementedError()
+        self.model.compute_aero_moment_features(
+            self.v_airspeed_mat,
+            self.angle_of_attack_vec,
+            self.elevator_vec,
+            self.angular_vel_mat,
+            self.angle_of_sideslip_vec,
+        )
@@ -0,0 +1,69 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Benchmarks of the complete model estimation for the shipped configs.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import os
+import tempfile
+from benchmark_data import (
+    SAMPLE_SIZES,
+    BENCHMARK_MODELS,
+    get_config_path,
+    generate_benchmark_data,
+)
+from generate_parametric_model import start_model_estimation
+
+
+class FullPipeline:
+    params = [BENCHMARK_MODELS, SAMPLE_SIZES]
+    param_names = ["model", "n_samples"]
+    timeout = 300.0
+    repeat = 1
+
+    def setup(self, model_name, n_samples):
+        self.log_path = generate_benchmark_data(model_name, n_samples)
+        # the results are written to model_results/ relative to the working directory
+        self.work_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.work_dir.name, "model_results"))
+        self.cwd = os.getcwd()
+        os.chdir(self.work_dir.name)
+
+    def teardown(self, model_name, n_samples):
+        os.chdir(self.cwd)
+        self.work_dir.cleanup()
+
+    def time_estimate_model(self, model_name, n_samples):
+        start_model_estimation(get_config_path(model_name), self.log_path, plot=False)
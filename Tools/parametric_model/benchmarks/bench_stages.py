@@ -0,0 +1,145 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Benchmarks of the individual stages of the identification pipeline: resampling,
+assembly of the regression matrices, Fisher information and the optimizers.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import functools
+import numpy as np
+import src.models as models
+import src.optimizers as optimizers
+from benchmark_data import (
+    SAMPLE_SIZES,
+    BENCHMARK_MODELS,
+    get_config_path,
+    load_benchmark_data,
+)
+from src.models.model_config import ModelConfig
+from src.tools.dataframe_tools import resample_dataframe_list
+
+OPTIMIZERS = ["LinearRegressor", "QPOptimizer", "RobustRegressor"]
+
+# topics of a quadrotor ulog with their approximate rates [Hz]
+RESAMPLING_TOPICS = {
+    "actuator_outputs": (["u0", "u1", "u2", "u3"], 400.0),
+    "vehicle_local_position": (["vx", "vy", "vz"], 100.0),
+    "vehicle_attitude": (["q0", "q1", "q2", "q3"], 200.0),
+    "vehicle_angular_velocity": (["ang_vel_x", "ang_vel_y", "ang_vel_z"], 800.0),
+    "sensor_combined": (["acc_b_x", "acc_b_y", "acc_b_z"], 200.0),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def prepare_benchmark_model(model_name, n_samples):
+    """Model with computed features, shared between the stage benchmarks."""
+    config = get_config_path(model_name)
+    model = getattr(models, ModelConfig(config).model_class)(config)
+    model.load_dataframes(load_benchmark_data(model_name, n_samples).copy())
+    model.prepare_regression_matrices()
+    return model
+
+
+class Resampling:
+    params = [SAMPLE_SIZES]
+    param_names = ["n_samples"]
+    timeout = 120.0
+
+    def setup(self, n_samples):
+        # n_samples is the number of resampled samples at 250 Hz
+        data_df = load_benchmark_data("quadrotor_model", n_samples)
+        t_start = data_df["timestamp"].iloc[0]
+        duration = n_samples / 250.0
+        rng = np.random.default_rng(0)
+        self.df_list = []
+        for topic_columns, rate in RESAMPLING_TOPICS.values():
+            n_topic = int(duration * rate)
+            # jittered topic timestamps that cover the resampled time range
+            timestamps = (
+                t_start
+                + 1e6
+                * (np.arange(-1, n_topic + 1) + 0.2 * rng.random(n_topic + 2))
+                / rate
+            )
+            source_index = np.linspace(0, n_samples - 1, n_topic + 2).astype(int)
+            topic_df = data_df[topic_columns].iloc[source_index].reset_index(drop=True)
+            topic_df.insert(0, "timestamp", timestamps)
+            self.df_list.append(topic_df)
+        self.time_window = {"t_start": t_start, "t_end": t_start + 1e6 * duration}
+
+    def time_resample_dataframe_list(self, n_samples):
+        resample_dataframe_list(self.df_list, self.time_window, 250.0)
+
+
+class Assembly:
+    params = [BENCHMARK_MODELS, SAMPLE_SIZES]
+    param_names = ["model", "n_samples"]
+    timeout = 120.0
+
+    def setup(self, model_name, n_samples):
+        self.model = prepare_benchmark_model(model_name, n_samples)
+
+    def time_assemble_regression_matrices(self, model_name, n_samples):
+        self.model.assemble_regression_matrices(["lin", "rot"])
+
+
+class FisherInformation:
+    params = [BENCHMARK_MODELS, SAMPLE_SIZES]
+    param_names = ["model", "n_samples"]
+    timeout = 120.0
+
+    def setup(self, model_name, n_samples):
+        self.model = prepare_benchmark_model(model_name, n_samples)
+
+    def time_compute_fisher_information(self, model_name, n_samples):
+        self.model.compute_fisher_information()
+
+
+class Optimizers:
+    params = [OPTIMIZERS, SAMPLE_SIZES]
+    param_names = ["optimizer", "n_samples"]
+    timeout = 120.0
+
+    def setup(self, optimizer, n_samples):
+        model = prepare_benchmark_model("quadrotor_model", n_samples)
+        self.X, self.y, self.coef_name_list = model.assemble_regression_matrices(
+            ["lin", "rot"]
+        )
+        self.optimizer_config = model.optimizer_config
+
+    def time_estimate_parameters(self, optimizer, n_samples):
+        getattr(optimizers, optimizer)(
+            self.optimizer_config, self.coef_name_list
+        ).estimate_parameters(self.X, self.y)
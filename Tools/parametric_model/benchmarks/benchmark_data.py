@@ -0,0 +1,201 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Offline generation of large synthetic flight logs for the benchmark suite.
+
+The shipped example logs in resources/ are extended to the benchmark sizes by playing them
+alternately forwards and backwards (which keeps all signals continuous), adding a small
+amount of sensor noise to every measured signal and regenerating the timestamps at the
+resample frequency of the model config. The datasets are stored as flight data containers
+(.ddf) so that the benchmarks can memory map them instead of parsing csv files.
+
+    python3 Tools/parametric_model/benchmarks/benchmark_data.py [--sizes 10000 100000]
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PARAMETRIC_MODEL_DIR = os.path.dirname(BENCHMARK_DIR)
+RESOURCES_DIR = os.path.join(PARAMETRIC_MODEL_DIR, "..", "..", "resources")
+CONFIG_DIR = os.path.join(PARAMETRIC_MODEL_DIR, "configs")
+DATA_DIR = os.environ.get(
+    "PARAMETRIC_MODEL_BENCHMARK_DATA", os.path.join(BENCHMARK_DIR, "data")
+)
+
+if PARAMETRIC_MODEL_DIR not in sys.path:
+    sys.path.insert(0, PARAMETRIC_MODEL_DIR)
+
+from src.models.model_config import ModelConfig
+from src.tools import flight_data_container
+
+SAMPLE_SIZES = [10000, 100000, 1000000]
+BENCHMARK_MODELS = ["quadrotor_model", "fixedwing_model"]
+
+# measured signals that are perturbed by sensor noise
+NOISY_COLUMNS = [
+    "vx",
+    "vy",
+    "vz",
+    "q0",
+    "q1",
+    "q2",
+    "q3",
+    "ang_vel_x",
+    "ang_vel_y",
+    "ang_vel_z",
+    "acc_b_x",
+    "acc_b_y",
+    "acc_b_z",
+    "ang_acc_b_x",
+    "ang_acc_b_y",
+    "ang_acc_b_z",
+]
+
+
+def get_config_path(model_name):
+    return os.path.join(CONFIG_DIR, model_name + ".yaml")
+
+
+def get_benchmark_data_path(model_name, n_samples, data_dir=DATA_DIR):
+    return os.path.join(
+        data_dir,
+        model_name + "_" + str(n_samples) + flight_data_container.FILE_EXTENSION,
+    )
+
+
+def generate_benchmark_dataframe(model_name, n_samples, noise_ratio=0.01, seed=0):
+    """
+    Inputs:
+    model_name: name of the example log in resources/ and its config in configs/
+    n_samples: number of samples of the generated log
+    noise_ratio: standard deviation of the added noise relative to the standard deviation
+        of the signal
+
+    Returns:
+    data_df: dataframe with the columns of the example log
+    """
+    source_df = pd.read_csv(
+        os.path.join(RESOURCES_DIR, model_name + ".csv"), index_col=0
+    )
+    source_mat = source_df.to_numpy(dtype=float)
+
+    # forwards and backwards playback keeps the signals continuous at the seams
+    n_source = source_mat.shape[0]
+    period = np.arange(n_samples) % (2 * n_source)
+    row_index = np.where(period < n_source, period, 2 * n_source - 1 - period)
+    data_mat = source_mat[row_index, :]
+
+    rng = np.random.default_rng(seed)
+    for col in NOISY_COLUMNS:
+        if col in source_df:
+            i = source_df.columns.get_loc(col)
+            data_mat[:, i] += (
+                noise_ratio * np.std(source_mat[:, i]) * rng.normal(size=n_samples)
+            )
+    data_df = pd.DataFrame(data_mat, columns=source_df.columns)
+    if all(q in data_df for q in ["q0", "q1", "q2", "q3"]):
+        q_mat = data_df[["q0", "q1", "q2", "q3"]].to_numpy()
+        data_df[["q0", "q1", "q2", "q3"]] = q_mat / np.linalg.norm(
+            q_mat, axis=1, keepdims=True
+        )
+
+    resample_freq = ModelConfig(get_config_path(model_name)).dynamics_model_config[
+        "resample_freq"
+    ]
+    data_df["timestamp"] = source_mat[0, source_df.columns.get_loc("timestamp")] + (
+        np.arange(n_samples) * 1e6 / resample_freq
+    )
+    return data_df
+
+
+def generate_benchmark_data(model_name, n_samples, data_dir=DATA_DIR, overwrite=False):
+    """Generate the benchmark log if it does not exist yet and return its path."""
+    file_path = get_benchmark_data_path(model_name, n_samples, data_dir)
+    if os.path.exists(file_path) and not overwrite:
+        return file_path
+    os.makedirs(data_dir, exist_ok=True)
+    resample_freq = ModelConfig(get_config_path(model_name)).dynamics_model_config[
+        "resample_freq"
+    ]
+    flight_data_container.save_flight_data(
+        file_path,
+        generate_benchmark_dataframe(model_name, n_samples),
+        sample_rate=resample_freq,
+        source_path=os.path.join(RESOURCES_DIR, model_name + ".csv"),
+    )
+    return file_path
+
+
+def load_benchmark_data(model_name, n_samples, data_dir=DATA_DIR):
+    """Memory map a benchmark log, generating it first if necessary."""
+    return flight_data_container.load_flight_data(
+        generate_benchmark_data(model_name, n_samples, data_dir)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate the synthetic flight logs of the benchmark suite."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=SAMPLE_SIZES,
+        help="Number of samples of the generated logs.",
+    )
+    parser.add_argument(
+        "--models",
+        type=str,
+        nargs="+",
+        default=BENCHMARK_MODELS,
+        help="Example logs in resources/ to generate the benchmark logs from.",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Regenerate logs that already exist.",
+    )
+    arg_list = parser.parse_args()
+    for model_name in arg_list.models:
+        for n_samples in arg_list.sizes:
+            file_path = generate_benchmark_data(
+                model_name, n_samples, overwrite=arg_list.overwrite
+            )
+            print("Benchmark data generated: ", file_path)
@@ -0,0 +1,343 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Runner of the parametric model benchmark suite.
+
+The benchmarks follow the conventions of airspeed velocity (asv): every bench_*.py module
+contains classes with a params / param_names grid, optional setup and teardown methods and
+time_* methods that are timed for every parameter combination. A benchmark whose setup or
+first call exceeds its timeout attribute is not run for larger n_samples.
+
+The results are written as json. A previous result file can be passed with --compare to fail
+(exit code 1) if any benchmark became slower than --max_slowdown times its baseline:
+
+    python3 Tools/parametric_model/benchmarks/run_benchmarks.py --output results.json
+    python3 Tools/parametric_model/benchmarks/run_benchmarks.py --compare results.json
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import os
+import sys
+import re
+import json
+import time
+import glob
+import inspect
+import platform
+import argparse
+import itertools
+import importlib
+import contextlib
+import subprocess
+import traceback
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+PARAMETRIC_MODEL_DIR = os.path.dirname(BENCHMARK_DIR)
+for path in [PARAMETRIC_MODEL_DIR, BENCHMARK_DIR]:
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+RESULT_FORMAT_VERSION = 1
+PACKAGES = ["numpy", "pandas", "scipy", "sklearn", "cvxpy"]
+
+
+@contextlib.contextmanager
+def suppress_output():
+    """Redirect stdout and stderr on file descriptor level (prints and progress bars)."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = [os.dup(1), os.dup(2)]
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+        os.dup2(devnull.fileno(), 2)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+
+
+def discover_benchmarks(bench_filter=None):
+    """Returns a list of (name, benchmark class, method name) tuples."""
+    benchmark_list = []
+    for file_path in sorted(glob.glob(os.path.join(BENCHMARK_DIR, "bench_*.py"))):
+        module_name = os.path.splitext(os.path.basename(file_path))[0]
+        module = importlib.import_module(module_name)
+        for class_name, benchmark_class in inspect.getmembers(module, inspect.isclass):
+            if benchmark_class.__module__ != module_name:
+                continue
+            for method_name in sorted(dir(benchmark_class)):
+                if not method_name.startswith("time_"):
+                    continue
+                name = module_name + "." + class_name + "." + method_name
+                if bench_filter is None or re.search(bench_filter, name):
+                    benchmark_list.append((name, benchmark_class, method_name))
+    return benchmark_list
+
+
+def get_param_grid(benchmark_class):
+    params = getattr(benchmark_class, "params", [])
+    param_names = getattr(benchmark_class, "param_names", [])
+    if len(params) > 0 and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    return param_names, list(itertools.product(*params))
+
+
+def run_benchmark(benchmark_class, method_name, param_values, repeat):
+    """Returns a result dict with status and the measured times [s]."""
+    benchmark = benchmark_class()
+    timeout = getattr(benchmark_class, "timeout", 60.0)
+    repeat = getattr(benchmark_class, "repeat", repeat)
+    result = {"status": "ok", "times": []}
+    try:
+        with suppress_output():
+            setup_start = time.perf_counter()
+            if hasattr(benchmark, "setup"):
+                benchmark.setup(*param_values)
+            result["setup_time"] = time.perf_counter() - setup_start
+            try:
+                if result["setup_time"] > timeout:
+                    result["status"] = "timeout"
+                    return result
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    getattr(benchmark, method_name)(*param_values)
+                    result["times"].append(time.perf_counter() - start)
+                    if result["times"][-1] > timeout:
+                        result["status"] = "timeout"
+                        break
+            finally:
+                if hasattr(benchmark, "teardown"):
+                    benchmark.teardown(*param_values)
+    except NotImplementedError:
+        result["status"] = "skipped"
+    except Exception:
+        result["status"] = "failed"
+        result["error"] = traceback.format_exc(limit=3)
+    return result
+
+
+def get_environment_info():
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = importlib.import_module(package).__version__
+        except ImportError:
+            packages[package] = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARK_DIR,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit or None,
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+            "python_version": platform.python_version(),
+        },
+        "packages": packages,
+    }
+
+
+def run_benchmarks(bench_filter=None, max_samples=None, repeat=3):
+    results = []
+    # benchmarks that timed out are skipped for larger n_samples
+    timed_out = set()
+    for name, benchmark_class, method_name in discover_benchmarks(bench_filter):
+        param_names, param_grid = get_param_grid(benchmark_class)
+        for param_values in param_grid:
+            params = dict(zip(param_names, param_values))
+            n_samples = params.get("n_samples", None)
+            other_params = tuple(
+                (key, value) for key, value in params.items() if key != "n_samples"
+            )
+            if max_samples is not None and n_samples is not None:
+                if n_samples > max_samples:
+                    continue
+            if (name, other_params) in timed_out:
+                result = {"status": "skipped", "times": []}
+            else:
+                result = run_benchmark(
+                    benchmark_class, method_name, param_values, repeat
+                )
+            if result["status"] == "timeout":
+                timed_out.add((name, other_params))
+            result.update({"name": name, "params": params, "n_samples": n_samples})
+            if len(result["times"]) > 0 and result["status"] == "ok":
+                times = sorted(result["times"])
+                result["min"] = times[0]
+                result["median"] = times[len(times) // 2]
+                if n_samples is not None:
+                    result["samples_per_second"] = n_samples / result["median"]
+            print_result(result)
+            results.append(result)
+    return results
+
+
+def format_params(params):
+    return ", ".join(str(value) for value in params.values())
+
+
+def print_result(result):
+    if result["status"] == "ok":
+        summary = "{:>10.4f} s".format(result["median"])
+        if "samples_per_second" in result:
+            summary += "{:>14.0f} samples/s".format(result["samples_per_second"])
+    else:
+        summary = "{:>12}".format(result["status"])
+    print(
+        "{:<66}{:<36}{}".format(
+            result["name"], format_params(result["params"]), summary
+        )
+    )
+    if result["status"] == "failed":
+        print(result["error"])
+
+
+def compare_results(results, baseline_results, max_slowdown):
+    """Print the slowdown of every benchmark with respect to the baseline and return
+    the list of regressions."""
+    baseline_dict = {
+        (result["name"], json.dumps(result["params"], sort_keys=True)): result
+        for result in baseline_results
+    }
+    regressions = []
+    print(
+        "==============================================================================="
+    )
+    print(
+        "                        Comparison to Baseline                                 "
+    )
+    print(
+        "==============================================================================="
+    )
+    for result in results:
+        key = (result["name"], json.dumps(result["params"], sort_keys=True))
+        if key not in baseline_dict or baseline_dict[key]["status"] != "ok":
+            continue
+        baseline = baseline_dict[key]
+        if result["status"] != "ok":
+            slowdown = float("inf")
+        else:
+            slowdown = result["median"] / baseline["median"]
+        if slowdown > max_slowdown:
+            regressions.append(key)
+        print(
+            "{:<66}{:<36}{:>8.2f}x{}".format(
+                result["name"],
+                format_params(result["params"]),
+                slowdown,
+                "  REGRESSION" if slowdown > max_slowdown else "",
+            )
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the parametric model benchmark suite."
+    )
+    parser.add_argument(
+        "--bench",
+        type=str,
+        default=None,
+        help="Regular expression selecting the benchmarks (module.Class.time_method).",
+    )
+    parser.add_argument(
+        "--max_samples",
+        type=int,
+        default=None,
+        help="Skip benchmark cases with more samples.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed calls per benchmark case, the median is reported.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Json result file, defaults to benchmarks/results/benchmarks_<time>.json.",
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="Json result file of a previous run to compare against.",
+    )
+    parser.add_argument(
+        "--max_slowdown",
+        type=float,
+        default=1.25,
+        help="Maximum tolerated ratio of the median time to the baseline.",
+    )
+    arg_list = parser.parse_args()
+
+    results = run_benchmarks(arg_list.bench, arg_list.max_samples, arg_list.repeat)
+
+    output_path = arg_list.output
+    if output_path is None:
+        output_path = os.path.join(
+            BENCHMARK_DIR,
+            "results",
+            "benchmarks_" + time.strftime("%Y-%m-%d-%H-%M-%S") + ".json",
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    report = {"version": RESULT_FORMAT_VERSION, "date": time.time()}
+    report.update(get_environment_info())
+    report["results"] = results
+    with open(output_path, "w") as outfile:
+        json.dump(report, outfile, indent=2)
+    print("Benchmark results saved to: ")
+    print(output_path)
+
+    if arg_list.compare is not None:
+        with open(arg_list.compare) as file:
+            baseline_results = json.load(file)["results"]
+        regressions = compare_results(results, baseline_results, arg_list.max_slowdown)
+        if len(regressions) > 0:
+            print(len(regressions), "benchmarks regressed by more than the tolerance.")
+            sys.exit(1)
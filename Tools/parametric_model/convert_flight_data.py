@@ -0,0 +1,105 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import argparse
+import logging
+from src.tools import DataHandler
+from src.tools import flight_data_container
+from src.tools.logging_tools import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def export_flight_data(config, log_path, output_path):
+    """Load and resample a log as configured and store it in a flight data container."""
+    data_handler = DataHandler(config)
+    data_handler.loadLogs(log_path)
+    flight_data_container.save_flight_data(
+        output_path,
+        data_handler.get_dataframes(),
+        sample_rate=data_handler.resample_freq,
+        source_path=log_path,
+    )
+    logger.info("Flight data exported to: %s", output_path)
+
+
+def import_flight_data(input_path, output_path):
+    """Convert a flight data container to csv."""
+    header, _ = flight_data_container.read_flight_data_header(input_path)
+    logger.info("Source log: %s %s", header["source"], header["source_sha256"])
+    flight_data_container.load_flight_data(input_path, mmap_mode="r").to_csv(
+        output_path
+    )
+    logger.info("Flight data imported to: %s", output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert flight logs to and from the binary flight data container (.ddf)."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Resample a ulg or csv log and save it as .ddf file."
+    )
+    export_parser.add_argument(
+        "--config",
+        metavar="config",
+        type=str,
+        default="configs/quadrotor_model.yaml",
+        help="Configuration file path for pipeline configurations",
+    )
+    export_parser.add_argument(
+        "log_path", type=str, help="The path of the log to convert."
+    )
+    export_parser.add_argument(
+        "output_path", type=str, help="The path of the .ddf file to write."
+    )
+
+    import_parser = subparsers.add_parser("import", help="Convert a .ddf file to csv.")
+    import_parser.add_argument(
+        "input_path", type=str, help="The path of the .ddf file to read."
+    )
+    import_parser.add_argument(
+        "output_path", type=str, help="The path of the csv file to write."
+    )
+
+    arg_list = parser.parse_args()
+    configure_logging()
+    if arg_list.command == "export":
+        export_flight_data(arg_list.config, arg_list.log_path, arg_list.output_path)
+    else:
+        import_flight_data(arg_list.input_path, arg_list.output_path)
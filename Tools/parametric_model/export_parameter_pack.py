@@ -0,0 +1,85 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import argparse
+import logging
+import os
+import yaml
+from src.models.model_config import ModelConfig
+from src.tools import parameter_pack
+from src.tools.logging_tools import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def export_parameter_pack(model_results, output_path=None, config=None):
+    """Convert a model results yaml file into a binary parameter pack."""
+    with open(model_results) as file:
+        result_dict = yaml.load(file, Loader=yaml.FullLoader)
+    model_name = os.path.basename(model_results).rsplit("_", 1)[0]
+    model_class = None if config is None else ModelConfig(config).model_class
+    if output_path is None:
+        output_path = os.path.splitext(model_results)[0] + parameter_pack.FILE_EXTENSION
+    parameter_pack.save_parameter_pack(
+        output_path, result_dict, model_name, model_class
+    )
+    logger.info("Parameter pack exported to: %s", output_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert a model results yaml file into a binary parameter pack (.ddp)."
+    )
+    parser.add_argument(
+        "model_results", type=str, help="The path of the model results yaml file."
+    )
+    parser.add_argument(
+        "output_path",
+        type=str,
+        nargs="?",
+        default=None,
+        help="The path of the .ddp file to write (default: next to the yaml file).",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="config",
+        type=str,
+        default=None,
+        help="Configuration file path of the model, stores the model class in the pack.",
+    )
+    arg_list = parser.parse_args()
+    configure_logging()
+    export_parameter_pack(arg_list.model_results, arg_list.output_path, arg_list.config)
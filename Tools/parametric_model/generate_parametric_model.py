@@ -38,12 +38,31 @@ __license__ = "BSD 3"
 
 import os
 import src.models as models
-import src.models.extractor_models as extractors
-from src.tools import DataHandler, string_to_bool
+from src.models.model_config import ModelConfig
+from src.tools import (
+    DataHandler,
+    string_to_bool,
+    AutomaticDataSelector,
+    DOptimalDataSelector,
+    dataframe_tools,
+    stage_profiler,
+    profile_stage,
+)
+from src.tools.logging_tools import configure_logging
 import argparse
+import logging
 import pandas as pd
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+
+def prepare_model_features(model):
+    with profile_stage("features"):
+        model.prepare_regression_matrices()
+    with profile_stage("fisher_information"):
+        model.compute_fisher_information()
+
 
 def start_model_estimation(
     config,
@@ -53,13 +72,24 @@ def start_model_estimation(
     plot=False,
     normalization=True,
     extraction=False,
+    cross_validation=0,
+    regularization_path=False,
+    segment_min_duration=0.0,
+    segment_padding=0.0,
+    profile=False,
+    profile_memory=False,
+    report=False,
+    report_workers=None,
+    parameter_pack=False,
+    prior=None,
+    prior_statistics=(),
+    prior_weight=1.0,
+    save_statistics=False,
 ):
-    # Flag for enabling automatic data selection.
-    data_handler = DataHandler(config, selection_var)
-    data_handler.loadLogs(log_path)
-    data_df = data_handler.get_dataframes()
-    model_class = data_handler.config.model_class
+    if profile:
+        stage_profiler.start_profiling(track_memory=profile_memory)
 
+    model_class = ModelConfig(config).model_class
     try:
         # This will call the model constructor directly from the model_class
         # in the yaml config (self-describing)
@@ -72,14 +102,22 @@ def start_model_estimation(
         )
         raise AttributeError(error_str)
 
+    # Only the topics the model needs are loaded from the log
+    data_handler = DataHandler(
+        config, selection_var, required_columns=model.get_required_columns()
+    )
+    with profile_stage("data_loading"):
+        data_handler.loadLogs(log_path)
+    data_df = data_handler.get_dataframes()
+    model.log_file_list = data_handler.log_file_list
+
     # Interactive data selection
     if data_selection == "interactive":
-        print("Interactive data selection enabled...")
+        logger.info("Interactive data selection enabled")
         import vpselector
 
         model.load_dataframes(data_df)
-        model.prepare_regression_matrices()
-        model.compute_fisher_information()
+        prepare_model_features(model)
         # Parse actuator topics, and remove the timestamp from it
         actuator_topics = data_handler.config_dict["data"]["required_ulog_topics"][
             "actuator_outputs"
@@ -107,20 +145,17 @@ def start_model_estimation(
                 model.data_df, visual_dataframe_selector_config_dict
             )
         )
-        print("Interactive data selection completed.")
+        logger.info("Interactive data selection completed.")
 
-        model.prepare_regression_matrices()
-        model.compute_fisher_information()
+        prepare_model_features(model)
 
     # Setpoint based data selection
     elif data_selection == "setpoint":
-        print("Setpoint based data selection enabled...")
+        logger.info("Setpoint based data selection enabled")
 
         selector = selection_var.split("/")[1]
 
-        zero_crossings = np.where(
-            np.diff(np.sign(data_df[selector] + (data_df[selector] == 0)))
-        )[0]
+        zero_crossings = dataframe_tools.compute_zero_crossings(data_df[selector])
 
         if len(zero_crossings) == 0:
             raise AttributeError(
@@ -132,44 +167,92 @@ def start_model_estimation(
                 "All selection variable activations have to start and end during the flight phase"
             )
 
-        acc_df = pd.DataFrame()
-
-        for i in range(0, len(zero_crossings), 2):
-            start = zero_crossings[i]
-            end = zero_crossings[i + 1]
-            acc_df = pd.concat([acc_df, data_df.iloc[start:end]], ignore_index=True)
+        with profile_stage("data_selection"):
+            acc_df = dataframe_tools.extract_segments(
+                data_df,
+                zero_crossings[0::2],
+                zero_crossings[1::2],
+                min_length=int(segment_min_duration * data_handler.resample_freq),
+                padding=int(segment_padding * data_handler.resample_freq),
+            )
 
         model.load_dataframes(acc_df)
-        print("Setpoint based data selection completed.")
+        logger.info("Setpoint based data selection completed.")
 
-        model.prepare_regression_matrices()
-        model.compute_fisher_information()
+        prepare_model_features(model)
 
-    elif data_selection == "auto":  # Automatic data selection (WIP)
-        print("Automatic data selection enabled...")
-        from active_dataframe_selector.automatic_data_selector import (
-            AutomaticDataSelector,
-        )
+    elif data_selection in ["auto", "d_optimal"]:  # Automatic data selection
+        logger.info("Automatic data selection enabled")
+        model.load_dataframes(data_df)
+        prepare_model_features(model)
 
-        # The goal is to identify automatically the most relevant parts of a log.
-        # Currently the draft is designed to choose the most informative 10% of the logs with regards to
-        # force and moment parameters. This threshold is currently not validated at all and the percentage
-        # can vary drastically from log to log.
-        data_selector = AutomaticDataSelector(model.data_df)
-        model.load_dataframes(data_selector.select_dataframes(10))
-        print("Automatic data selection completed.")
+        # Select the most informative windows with regards to force and moment
+        # parameters. Defaults to 10% of the log, see the optional
+        # automatic_data_selection entry of the config for other targets.
+        selection_config = (
+            data_handler.config_dict.get("automatic_data_selection", None) or {}
+        )
+        window_length = max(
+            int(
+                selection_config.get("window_duration", 1.0)
+                * data_handler.resample_freq
+            ),
+            1,
+        )
+        with profile_stage("data_selection"):
+            if data_selection == "auto":
+                # windows with the highest Fisher information score
+                data_selector = AutomaticDataSelector(
+                    model.data_df, window_length=window_length
+                )
+                selected_df = data_selector.select_dataframes(
+                    ratio=selection_config.get("ratio", 10),
+                    sample_budget=selection_config.get("sample_budget", None),
+                    target_information=selection_config.get("target_information", None),
+                )
+            else:
+                # windows that jointly maximize the determinant of the Fisher information
+                factors, window_starts = model.compute_window_information_factors(
+                    window_length, max_rank=selection_config.get("max_rank", 3)
+                )
+                data_selector = DOptimalDataSelector(
+                    model.data_df, factors, window_starts
+                )
+                selected_df = data_selector.select_dataframes(
+                    ratio=selection_config.get("ratio", 10),
+                    sample_budget=selection_config.get("sample_budget", None),
+                    min_gain=selection_config.get("min_gain", 0.0),
+                )
+        model.load_dataframes(selected_df)
+        logger.info("Automatic data selection completed.")
 
-        model.prepare_regression_matrices()
-        model.compute_fisher_information()
+        prepare_model_features(model)
 
     else:
         model.load_dataframes(data_df)
-        model.prepare_regression_matrices()
-        model.compute_fisher_information()
+        prepare_model_features(model)
+
+    if cross_validation > 1:
+        with profile_stage("cross_validation"):
+            model.cross_validate_model(cross_validation)
+
+    if regularization_path:
+        with profile_stage("regularization_path"):
+            model.compute_regularization_path(
+                cross_validation if cross_validation > 1 else 5
+            )
+        model.save_regularization_path_to_csv("model_results/")
 
-    model.estimate_model()
+    with profile_stage("estimation"):
+        model.estimate_model(prior, prior_statistics, prior_weight)
+    if save_statistics:
+        model.save_regression_statistics("model_results/")
+    if parameter_pack:
+        model.save_parameter_pack("model_results/")
 
     if extraction:
+        import src.models.extractor_models as extractors
+
         try:
             coefficient_list = model.get_model_coeffs()
             extractor = getattr(extractors, data_handler.config.extractor_class)(
@@ -186,13 +269,27 @@ def start_model_estimation(
             )
             raise AttributeError(error_str)
 
-        extractor.compute_px4_params()
+        with profile_stage("extraction"):
+            extractor.compute_px4_params()
         px4_params = extractor.get_px4_params()
         extractor.save_px4_params_to_yaml("model_results/")
 
-    if plot:
-        model.compute_residuals()
-        model.plot_model_predicitons()
+    if plot or report:
+        with profile_stage("plotting"):
+            model.compute_residuals()
+            if report:
+                model.save_model_report(
+                    "model_results/",
+                    n_workers=report_workers,
+                    data_figure_specs=data_handler.get_report_figure_specs(),
+                )
+            if plot:
+                model.plot_model_predicitons()
+
+    if profile:
+        profiler = stage_profiler.stop_profiling()
+        profiler.log_report()
+        profiler.save_report_to_yaml(model.model_name + "_profile", "model_results/")
 
     return
 
@@ -219,7 +316,7 @@ if __name__ == "__main__":
         metavar="data_selection",
         type=str,
         default="none",
-        help="Data selection scheme none | interactive | setpoint | auto (Beta)",
+        help="Data selection scheme none | interactive | setpoint | auto | d_optimal",
     )
     parser.add_argument(
         "--selection_var",
@@ -251,5 +348,118 @@ if __name__ == "__main__":
         required=False,
         help="Determine if the actuator data should be normalized before model estimation (False for simulation data).",
     )
+    parser.add_argument(
+        "--cross_validation",
+        metavar="cross_validation",
+        type=int,
+        default=0,
+        required=False,
+        help="Number of folds for cross validation on contiguous flight segments (0 to disable).",
+    )
+    parser.add_argument(
+        "--regularization_path",
+        metavar="regularization_path",
+        type=string_to_bool,
+        default="False",
+        required=False,
+        help="Solve along the ridge / bound scaling grid in optimizer_config/regularization_path and save a table of coefficients and validation errors.",
+    )
+    parser.add_argument(
+        "--segment_min_duration",
+        metavar="segment_min_duration",
+        type=float,
+        default=0.0,
+        required=False,
+        help="Setpoint based data selection: minimum duration of a selected segment [s].",
+    )
+    parser.add_argument(
+        "--segment_padding",
+        metavar="segment_padding",
+        type=float,
+        default=0.0,
+        required=False,
+        help="Setpoint based data selection: time added before and after every selected segment [s].",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="profile",
+        type=string_to_bool,
+        default="False",
+        required=False,
+        help="Time every pipeline stage, track its peak memory and save a profiling report to model_results.",
+    )
+    parser.add_argument(
+        "--profile_memory",
+        metavar="profile_memory",
+        type=string_to_bool,
+        default="False",
+        help="Additionally trace the peak memory allocated in every profiled stage (slow).",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="report",
+        type=string_to_bool,
+        default="False",
+        help="Render all diagnostic plots headless to png files with an html index in model_results.",
+    )
+    parser.add_argument(
+        "--report_workers",
+        metavar="report_workers",
+        type=int,
+        default=None,
+        help="Number of processes rendering the report figures (default: number of cpus).",
+    )
+    parser.add_argument(
+        "--parameter_pack",
+        metavar="parameter_pack",
+        type=string_to_bool,
+        default="False",
+        help="Additionally save the results as binary parameter pack (.ddp) in model_results.",
+    )
+    parser.add_argument(
+        "--prior",
+        metavar="prior",
+        type=str,
+        default=None,
+        help="Model results yaml file of a previous estimation, its coefficients are used as prior weighted by their Cramer-Rao bounds.",
+    )
+    parser.add_argument(
+        "--prior_statistics",
+        metavar="prior_statistics",
+        type=str,
+        action="append",
+        default=[],
+        help="Regression statistics (.npz) of a previous log, which are added to the statistics of this log (repeatable).",
+    )
+    parser.add_argument(
+        "--prior_weight",
+        metavar="prior_weight",
+        type=float,
+        default=1.0,
+        help="Scaling of the prior precision relative to the measurement noise.",
+    )
+    parser.add_argument(
+        "--save_statistics",
+        metavar="save_statistics",
+        type=string_to_bool,
+        default="False",
+        help="Save the regression statistics (including the prior statistics) to model_results for later estimations.",
+    )
+    parser.add_argument(
+        "--log_level",
+        metavar="log_level",
+        type=str,
+        default="INFO",
+        help="Logging level DEBUG | INFO | WARNING | ERROR, WARNING keeps throughput sensitive runs quiet.",
+    )
+    parser.add_argument(
+        "--log_format",
+        metavar="log_format",
+        type=str,
+        default="text",
+        help="Log output format text | json (one machine parseable record per line).",
+    )
     arg_list = parser.parse_args()
-    start_model_estimation(**vars(arg_list))
+    arg_dict = vars(arg_list)
+    configure_logging(arg_dict.pop("log_level"), arg_dict.pop("log_format"))
+    start_model_estimation(**arg_dict)
@@ -0,0 +1,135 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import argparse
+import logging
+import yaml
+from src.tools import SyntheticDataGenerator, string_to_bool, flight_data_container
+from src.tools.logging_tools import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def generate_synthetic_data(
+    config,
+    model_results,
+    output_path,
+    duration=600.0,
+    excitation=None,
+    noise=True,
+    seed=0,
+):
+    generator = SyntheticDataGenerator(config, model_results)
+    excitation_dict = None
+    if excitation is not None:
+        with open(excitation) as file:
+            excitation_dict = yaml.load(file, Loader=yaml.FullLoader)
+    data_df = generator.generate(
+        duration=duration,
+        excitation=excitation_dict,
+        noise=None if noise else False,
+        seed=seed,
+    )
+    if output_path.endswith(flight_data_container.FILE_EXTENSION):
+        flight_data_container.save_flight_data(
+            output_path,
+            data_df,
+            sample_rate=generator.resample_freq,
+            source_path=model_results,
+        )
+    else:
+        data_df.to_csv(output_path)
+    logger.info(
+        "Synthetic flight data with %d samples saved to: %s",
+        data_df.shape[0],
+        output_path,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic flight data from identified model coefficients."
+    )
+    parser.add_argument(
+        "output_path",
+        type=str,
+        help="Path of the generated log (csv or ddf).",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="config",
+        type=str,
+        default="configs/quadrotor_model.yaml",
+        help="Configuration file path for pipeline configurations",
+    )
+    parser.add_argument(
+        "--model_results",
+        metavar="model_results",
+        type=str,
+        required=True,
+        help="Model results file path with the coefficients to simulate",
+    )
+    parser.add_argument(
+        "--duration",
+        metavar="duration",
+        type=float,
+        default=600.0,
+        help="Duration of the generated log [s].",
+    )
+    parser.add_argument(
+        "--excitation",
+        metavar="excitation",
+        type=str,
+        default=None,
+        help="Yaml file with excitation specs that replace the defaults of the generator.",
+    )
+    parser.add_argument(
+        "--noise",
+        metavar="noise",
+        type=string_to_bool,
+        default="True",
+        help="Add accelerometer and angular acceleration noise.",
+    )
+    parser.add_argument(
+        "--seed",
+        metavar="seed",
+        type=int,
+        default=0,
+        help="Seed of the sensor noise.",
+    )
+    arg_list = parser.parse_args()
+    configure_logging()
+    generate_synthetic_data(**vars(arg_list))
@@ -8,10 +8,15 @@ import inspect
 from src.models import MultiRotorModel, FixedWingModel
 from src.models.model_config import ModelConfig
 import src.models as models
-from src.tools import DataHandler
+from src.tools import DataHandler, ForwardSimulator, stage_profiler, profile_stage
+from src.tools import parameter_pack, rollout_metrics
+from src.tools.logging_tools import configure_logging
 import argparse
+import logging
 import yaml
 
+logger = logging.getLogger(__name__)
+
 
 def str2bool(v):
     if isinstance(v, bool):
@@ -26,29 +31,51 @@ def str2bool(v):
         raise argparse.ArgumentTypeError("Boolean value expected.")
 
 
-def start_model_prediction(config, model_results, log_path, data_selection=False):
+def start_model_prediction(
+    config,
+    model_results,
+    log_path,
+    data_selection=False,
+    profile=False,
+    profile_memory=False,
+    plot=True,
+    report=False,
+    report_workers=None,
+    rollout_horizon=None,
+):
+    if profile:
+        stage_profiler.start_profiling(track_memory=profile_memory)
+
     data_selection_enabled = data_selection
-    print("Visual Data selection enabled: ", data_selection_enabled)
+    logger.info("Visual data selection enabled: %s", data_selection_enabled)
 
     try:
-        with open(model_results) as file:
-            # The FullLoader parameter handles the conversion from YAML
-            # scalar values to Python the dictionary format
-            model_results_dict = yaml.load(file, Loader=yaml.FullLoader)
-            assert type(model_results_dict) is dict
+        if model_results.endswith(parameter_pack.FILE_EXTENSION):
+            model_results_dict = parameter_pack.load_result_dict(model_results)
             opt_coefs_dict = model_results_dict["coefficients"]
+        else:
+            with open(model_results) as file:
+                # The FullLoader parameter handles the conversion from YAML
+                # scalar values to Python the dictionary format
+                model_results_dict = yaml.load(file, Loader=yaml.FullLoader)
+                assert type(model_results_dict) is dict
+                opt_coefs_dict = model_results_dict["coefficients"]
 
     except:
-        print("Could not load yaml model results file. Does the specified file exist?")
-        print(model_results)
+        logger.error(
+            "Could not load model results file %s. Does the specified file exist?",
+            model_results,
+        )
         exit(1)
 
     data_handler = DataHandler(config)
-    data_handler.loadLogs(log_path)
+    with profile_stage("data_loading"):
+        data_handler.loadLogs(log_path)
 
     if data_selection_enabled:
         data_handler.visually_select_data()
-    data_handler.visualize_data()
+    if plot:
+        data_handler.visualize_data()
 
     data_df = data_handler.get_dataframes()
 
@@ -65,10 +92,40 @@ def start_model_prediction(config, model_results, log_path, data_selection=False
         )
         raise AttributeError(error_str)
 
+    if rollout_horizon is not None:
+        # before the prediction, which normalizes the actuator outputs of data_df in place
+        with profile_stage("rollouts"):
+            simulator = ForwardSimulator(config, opt_coefs_dict)
+            metrics_dict = rollout_metrics.compute_rollout_metrics(
+                simulator, data_df, horizon=rollout_horizon
+            )
+        rollout_metrics.log_rollout_metrics(metrics_dict)
+        rollout_metrics.save_rollout_metrics_to_yaml(
+            metrics_dict, simulator.model.model_name + "_rollout_metrics"
+        )
+
     model.load_dataframes(data_df)
-    model.predict_model(opt_coefs_dict)
-    model.compute_residuals()
-    model.plot_model_predicitons()
+    model.log_file_list = data_handler.log_file_list
+    with profile_stage("prediction"):
+        model.predict_model(opt_coefs_dict)
+    if plot or report:
+        with profile_stage("plotting"):
+            model.compute_residuals()
+            if report:
+                model.save_model_report(
+                    "model_results/",
+                    n_workers=report_workers,
+                    data_figure_specs=data_handler.get_report_figure_specs(),
+                )
+            if plot:
+                model.plot_model_predicitons()
+
+    if profile:
+        profiler = stage_profiler.stop_profiling()
+        profiler.log_report()
+        profiler.save_report_to_yaml(
+            model.model_name + "_prediction_profile", "model_results/"
+        )
 
     return
 
@@ -101,7 +158,65 @@ if __name__ == "__main__":
         "--model_results",
         metavar="model_results",
         type=str,
-        help="Model results file path for optimal parameters",
+        help="Model results file path (yaml or .ddp parameter pack) for optimal parameters",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="profile",
+        type=str2bool,
+        default=False,
+        help="Time every pipeline stage, track its peak memory and save a profiling report to model_results.",
+    )
+    parser.add_argument(
+        "--profile_memory",
+        metavar="profile_memory",
+        type=str2bool,
+        default=False,
+        help="Additionally trace the peak memory allocated in every profiled stage (slow).",
+    )
+    parser.add_argument(
+        "--plot",
+        metavar="plot",
+        type=str2bool,
+        default=True,
+        help="Show plots after the prediction.",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="report",
+        type=str2bool,
+        default=False,
+        help="Render all diagnostic plots headless to png files with an html index in model_results.",
+    )
+    parser.add_argument(
+        "--report_workers",
+        metavar="report_workers",
+        type=int,
+        default=None,
+        help="Number of processes rendering the report figures (default: number of cpus).",
+    )
+    parser.add_argument(
+        "--rollout_horizon",
+        metavar="rollout_horizon",
+        type=float,
+        default=None,
+        help="Replay the logged inputs open loop from many start points over this horizon [s] and report the state prediction errors.",
+    )
+    parser.add_argument(
+        "--log_level",
+        metavar="log_level",
+        type=str,
+        default="INFO",
+        help="Logging level DEBUG | INFO | WARNING | ERROR, WARNING keeps throughput sensitive runs quiet.",
+    )
+    parser.add_argument(
+        "--log_format",
+        metavar="log_format",
+        type=str,
+        default="text",
+        help="Log output format text | json (one machine parseable record per line).",
     )
     arg_list = parser.parse_args()
-    start_model_prediction(**vars(arg_list))
+    arg_dict = vars(arg_list)
+    configure_logging(arg_dict.pop("log_level"), arg_dict.pop("log_format"))
+    start_model_prediction(**arg_dict)
@@ -0,0 +1,229 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import argparse
+import json
+import logging
+import os
+from src.tools import model_registry
+from src.tools import string_to_bool
+from src.tools.logging_tools import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def format_value(value, precision=6):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return "{0:.{1}g}".format(value, precision)
+    return str(value)
+
+
+def print_table(header, row_list):
+    row_list = [[format_value(value) for value in row] for row in row_list]
+    widths = [
+        max([len(str(title))] + [len(row[i]) for row in row_list])
+        for i, title in enumerate(header)
+    ]
+    print(
+        "  ".join(
+            str(title).ljust(width) for title, width in zip(header, widths)
+        ).rstrip()
+    )
+    for row in row_list:
+        print(
+            "  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+        )
+
+
+def index_results(registry, result_path, prune=True):
+    """Register the results files of a directory that are missing in the registry."""
+    n_registered = registry.index_directory(result_path)
+    n_removed = registry.remove_missing() if prune else 0
+    logger.info(
+        "Registered %d results files, removed %d missing files.",
+        n_registered,
+        n_removed,
+    )
+
+
+def query_results(registry, **query_kwargs):
+    run_list = registry.query(**query_kwargs)
+    print_table(
+        ["id", "model", "kind", "created", "samples", "R2", "RMSE", "config", "file"],
+        [
+            [
+                run["id"],
+                run["model_name"],
+                run["kind"],
+                run["created"],
+                run["n_samples"],
+                run["r2"],
+                run["rmse"],
+                None if run["config_hash"] is None else run["config_hash"][:12],
+                os.path.relpath(run["file_path"]),
+            ]
+            for run in run_list
+        ],
+    )
+
+
+def show_result(registry, run):
+    run_dict = registry.get_run(run)
+    for key in ["id", "file_path", "model_name", "kind", "created", "config_hash"]:
+        print("{0}: {1}".format(key, format_value(run_dict[key])))
+    print("metrics: {0}".format(json.dumps(run_dict["metrics"])))
+    print("fim: {0}".format(json.dumps(run_dict["fim"])))
+    for log in run_dict["logs"]:
+        print("log: {0} {1}".format(log["log_hash"], format_value(log["log_file"])))
+    print_table(
+        ["coefficient", "value", "cramer_rao_bound"],
+        [
+            [name, value, run_dict["cramer_rao_bounds"][name]]
+            for name, value in run_dict["coefficients"].items()
+        ],
+    )
+
+
+def diff_results(registry, run_a, run_b):
+    print_table(
+        ["coefficient", "a", "b", "b - a", "z"],
+        [
+            [diff["name"], diff["a"], diff["b"], diff["delta"], diff["z"]]
+            for diff in registry.diff(run_a, run_b)
+        ],
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Select and compare identification runs of the model registry."
+    )
+    parser.add_argument(
+        "--registry",
+        metavar="registry",
+        type=str,
+        default=os.path.join("model_results", model_registry.REGISTRY_FILE),
+        help="Path of the model registry database.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser(
+        "index", help="Register existing results files of a directory."
+    )
+    index_parser.add_argument(
+        "result_path",
+        type=str,
+        nargs="?",
+        default="model_results",
+        help="The directory of the results yaml files.",
+    )
+    index_parser.add_argument(
+        "--prune",
+        metavar="prune",
+        type=string_to_bool,
+        default=True,
+        help="Remove runs whose results file no longer exists.",
+    )
+
+    query_parser = subparsers.add_parser("query", help="List matching runs.")
+    query_parser.add_argument("--model", type=str, default=None, help="Model name.")
+    query_parser.add_argument(
+        "--kind",
+        type=str,
+        choices=["estimation", "prediction"],
+        default=None,
+        help="Only list estimation or prediction runs.",
+    )
+    query_parser.add_argument(
+        "--config_hash", type=str, default=None, help="Prefix of the config hash."
+    )
+    query_parser.add_argument(
+        "--log_hash", type=str, default=None, help="Prefix of a log hash."
+    )
+    query_parser.add_argument(
+        "--min_r2", type=float, default=None, help="Minimum R2 of the runs."
+    )
+    query_parser.add_argument(
+        "--order_by",
+        type=str,
+        choices=model_registry.ORDER_COLUMNS,
+        default="r2",
+        help="Sort column, runs are listed in descending order.",
+    )
+    query_parser.add_argument(
+        "--ascending",
+        type=string_to_bool,
+        default=False,
+        help="List the runs in ascending order.",
+    )
+    query_parser.add_argument(
+        "--limit", type=int, default=20, help="Maximum number of listed runs."
+    )
+
+    show_parser = subparsers.add_parser(
+        "show", help="Show the metrics, logs and coefficients of a run."
+    )
+    show_parser.add_argument("run", type=str, help="Run id or results file path.")
+
+    diff_parser = subparsers.add_parser(
+        "diff", help="Compare the coefficients of two runs."
+    )
+    diff_parser.add_argument("run_a", type=str, help="Run id or results file path.")
+    diff_parser.add_argument("run_b", type=str, help="Run id or results file path.")
+
+    arg_list = parser.parse_args()
+    configure_logging()
+    with model_registry.ModelRegistry(arg_list.registry) as registry:
+        if arg_list.command == "index":
+            index_results(registry, arg_list.result_path, arg_list.prune)
+        elif arg_list.command == "query":
+            query_results(
+                registry,
+                model_name=arg_list.model,
+                kind=arg_list.kind,
+                config_hash=arg_list.config_hash,
+                log_hash=arg_list.log_hash,
+                min_r2=arg_list.min_r2,
+                order_by=arg_list.order_by,
+                descending=not arg_list.ascending,
+                limit=arg_list.limit,
+            )
+        elif arg_list.command == "show":
+            show_result(registry, arg_list.run)
+        else:
+            diff_results(registry, arg_list.run_a, arg_list.run_b)
@@ -1,8 +1,18 @@
+import importlib
+
 from . import aerodynamic_models
 from . import rotor_models
-from . import model_plots
-from . import extractor_models
 from .dynamics_model import DynamicsModel
 from .multirotor_model import MultiRotorModel
 from .model_config import ModelConfig
 from .fixedwing_model import FixedWingModel
+
+# The plots (matplotlib, seaborn) and the parameter extraction (scipy.optimize) are slow to
+# import and only needed by some runs, these subpackages are imported on first access.
+_LAZY_SUBMODULES = ("model_plots", "extractor_models")
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
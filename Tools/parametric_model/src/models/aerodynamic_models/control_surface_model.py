@@ -37,11 +37,14 @@ __maintainer__ = "Manuel Yves Galliker"
 __license__ = "BSD 3"
 
 import math
+import logging
 import numpy as np
 
 from src.tools.math_tools import cropped_sym_sigmoid
 from scipy.spatial.transform import Rotation
-from progress.bar import Bar
+from src.tools.logging_tools import ProgressReporter
+
+logger = logging.getLogger(__name__)
 
 """
 The control surface model is conform to PX4's standard plane
@@ -108,42 +111,42 @@ class ControlSurfaceModel:
         return X_moments
 
     def compute_actuator_force_matrix(self, v_airspeed_mat, angle_of_attack_vec):
-        print("Computing force features for control surface:", self.name)
+        logger.debug("Computing force features for control surface: %s", self.name)
 
         X_forces = self.compute_actuator_force_features(
             0, v_airspeed_mat[0, :], angle_of_attack_vec[0, :]
         )
-        rotor_features_bar = Bar(
-            "Feature Computatiuon", max=self.actuator_input_vec.shape[0]
+        feature_progress = ProgressReporter(
+            "Feature computation", self.actuator_input_vec.shape[0], logger
         )
         for index in range(1, self.n_timestamps):
             X_force_curr = self.compute_actuator_force_features(
                 index, v_airspeed_mat[index, :], angle_of_attack_vec[index, :]
             )
             X_forces = np.vstack((X_forces, X_force_curr))
-            rotor_features_bar.next()
-        rotor_features_bar.finish()
+            feature_progress.next()
+        feature_progress.finish()
         coef_list_forces = ["c_l_delta", "c_d_delta"]
         self.X_forces = X_forces
         self.X_thrust = X_forces[:, 1:]
         return X_forces, coef_list_forces
 
     def compute_actuator_moment_matrix(self, v_airspeed_mat, angle_of_attack_vec):
-        print("Computing moment features for control surface:", self.name)
+        logger.debug("Computing moment features for control surface: %s", self.name)
 
         X_aero = self.compute_actuator_moment_features(
             0, v_airspeed_mat[0, :], angle_of_attack_vec[0]
         )
-        rotor_features_bar = Bar(
-            "Feature Computatiuon", max=self.actuator_input_vec.shape[0]
+        feature_progress = ProgressReporter(
+            "Feature computation", self.actuator_input_vec.shape[0], logger
         )
         for index in range(1, self.n_timestamps):
             X_moment_curr = self.compute_actuator_moment_features(
                 index, v_airspeed_mat[index, :], angle_of_attack_vec[index]
             )
             X_aero = np.vstack((X_aero, X_moment_curr))
-            rotor_features_bar.next()
-        rotor_features_bar.finish()
+            feature_progress.next()
+        feature_progress.finish()
         coef_dict = {
             self.name
             + "c_m_x_delta": {
@@ -37,10 +37,13 @@ __maintainer__ = "Julius Schlapbach"
 __license__ = "BSD 3"
 
 import math
+import logging
 import numpy as np
 
 from scipy.spatial.transform import Rotation
-from progress.bar import Bar
+from src.tools.logging_tools import ProgressReporter
+
+logger = logging.getLogger(__name__)
 
 
 class LinearWingModel:
@@ -159,14 +162,16 @@ class LinearWingModel:
         X_aero = self.compute_wing_force_features(
             v_airspeed_mat[0, :], angle_of_attack_vec[0], elevator_input_vec[0]
         )
-        aero_features_bar = Bar("Feature Computation", max=v_airspeed_mat.shape[0])
+        feature_progress = ProgressReporter(
+            "Feature computation", v_airspeed_mat.shape[0], logger
+        )
         for i in range(1, len(angle_of_attack_vec)):
             X_curr = self.compute_wing_force_features(
                 v_airspeed_mat[i, :], angle_of_attack_vec[i], elevator_input_vec[i]
             )
             X_aero = np.vstack((X_aero, X_curr))
-            aero_features_bar.next()
-        aero_features_bar.finish()
+            feature_progress.next()
+        feature_progress.finish()
         coef_dict = {
             "cl0": {"lin": {"x": "cl0_x", "y": "cl0_y", "z": "cl0_z"}},
             "clalpha": {"lin": {"x": "clalpha_x", "y": "clalpha_y", "z": "clalpha_z"}},
@@ -214,7 +219,7 @@ class LinearWingModel:
         v_airspeed_mat: numpy array of dimension (n,3) with columns for [v_a_x, v_a_y, v_a_z]
         angle_of_attack_vec: vector of size (n) with corresponding AoA values
         """
-        print("Starting computation of aero moment features...")
+        logger.debug("Starting computation of aero moment features")
         X_aero = self.compute_wing_moment_features(
             v_airspeed_mat[0, :],
             angle_of_attack_vec[0],
@@ -222,7 +227,9 @@ class LinearWingModel:
             angular_vel_mat[0, :],
             angle_of_sideslip_vec[0],
         )
-        aero_features_bar = Bar("Feature Computation", max=v_airspeed_mat.shape[0])
+        feature_progress = ProgressReporter(
+            "Feature computation", v_airspeed_mat.shape[0], logger
+        )
         for i in range(1, len(angle_of_attack_vec)):
             X_curr = self.compute_wing_moment_features(
                 v_airspeed_mat[i, :],
@@ -232,8 +239,8 @@ class LinearWingModel:
                 angle_of_sideslip_vec[i],
             )
             X_aero = np.vstack((X_aero, X_curr))
-            aero_features_bar.next()
-        aero_features_bar.finish()
+            feature_progress.next()
+        feature_progress.finish()
 
         coef_dict = {
             "cm0": {"rot": {"x": "cm0_x", "y": "cm0_y", "z": "cm0_z"}},
@@ -37,11 +37,14 @@ __maintainer__ = "Jaeyoung Lim"
 __license__ = "BSD 3"
 
 import math
+import logging
 import numpy as np
 
 from src.tools.math_tools import cropped_sym_sigmoid
 from scipy.spatial.transform import Rotation
-from progress.bar import Bar
+from src.tools.logging_tools import ProgressReporter
+
+logger = logging.getLogger(__name__)
 
 """
 The PhiAerodynamics model is a global singularity free aerodynamics model
@@ -134,14 +137,16 @@ class PhiAerodynamicsModel:
         X_aero = self.compute_wing_force_features(
             v_airspeed_mat[0, :], angle_of_attack_vec[0], elevator_input
         )
-        aero_features_bar = Bar("Feature Computatiuon", max=v_airspeed_mat.shape[0])
+        feature_progress = ProgressReporter(
+            "Feature computation", v_airspeed_mat.shape[0], logger
+        )
         for i in range(1, len(angle_of_attack_vec)):
             X_curr = self.compute_wing_force_features(
                 v_airspeed_mat[i, :], angle_of_attack_vec[i], elevator_input
             )
             X_aero = np.vstack((X_aero, X_curr))
-            aero_features_bar.next()
-        aero_features_bar.finish()
+            feature_progress.next()
+        feature_progress.finish()
         coef_dict = {
             "phifv_11": {
                 "lin": {"x": "phifv_11_x", "y": "phifv_11_y", "z": "phifv_11_z"}
@@ -217,7 +222,7 @@ class PhiAerodynamicsModel:
         v_airspeed_mat: numpy array of dimension (n,3) with columns for [v_a_x, v_a_y, v_a_z]
         angle_of_attack_vec: vector of size (n) with corresponding AoA values
         """
-        print("Starting computation of aero moment features...")
+        logger.debug("Starting computation of aero moment features")
         X_aero = self.compute_wing_moment_features(
             v_airspeed_mat[0, :],
             angle_of_attack_vec[0],
@@ -225,7 +230,9 @@ class PhiAerodynamicsModel:
             angular_vel_mat[0, :],
             angle_of_sideslip_vec[0],
         )
-        aero_features_bar = Bar("Feature Computatiuon", max=v_airspeed_mat.shape[0])
+        feature_progress = ProgressReporter(
+            "Feature computation", v_airspeed_mat.shape[0], logger
+        )
         for i in range(1, len(angle_of_attack_vec)):
             X_curr = self.compute_wing_moment_features(
                 v_airspeed_mat[i, :],
@@ -235,8 +242,8 @@ class PhiAerodynamicsModel:
                 angle_of_sideslip_vec[i],
             )
             X_aero = np.vstack((X_aero, X_curr))
-            aero_features_bar.next()
-        aero_features_bar.finish()
+            feature_progress.next()
+        feature_progress.finish()
         coef_dict = {
             "phimv_11": {
                 "rot": {"x": "phimv_11_x", "y": "phimv_11_y", "z": "phimv_11_z"}
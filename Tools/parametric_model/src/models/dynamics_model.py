@@ -36,11 +36,22 @@ __author__ = "Manuel Yves Galliker"
 __maintainer__ = "Manuel Yves Galliker"
 __license__ = "BSD 3"
 
-from src.tools.math_tools import cropped_sym_sigmoid
+from src.tools.math_tools import (
+    cropped_sym_sigmoid,
+    r2_between_numpy_arrays,
+    rmse_between_numpy_arrays,
+)
 from src.tools.quat_utils import quaternion_to_rotation_matrix
 from src.tools.dataframe_tools import resample_dataframe_list
 from src.tools.ulog_tools import load_ulog, pandas_from_topic
-from .model_plots import model_plots, aerodynamics_plots, linear_model_plots
+from src.tools.stage_profiler import profile_stage
+from src.tools.logging_tools import log_section
+from src.tools import parameter_pack
+from src.tools import model_registry
+from src.tools.regression_statistics import (
+    RegressionStatistics,
+    compute_contiguous_folds,
+)
 from .rotor_models import (
     RotorModel,
     LinearRotorModel,
@@ -48,26 +59,35 @@ from .rotor_models import (
     TiltingRotorModel,
     ChangingAxisRotorModel,
 )
-import matplotlib.pyplot as plt
-from scipy.linalg import block_diag
 import src.optimizers as optimizers
 import numpy as np
+import os
+import sqlite3
 import yaml
 import time
 import warnings
 import math
 import pandas as pd
-from progress.bar import Bar
+import logging
 
 """ The model class contains properties shared between all models and shgall simplyfy automated checks and the later
 export to a sitl gazebo model by providing a unified interface for all models. """
 
+logger = logging.getLogger(__name__)
+
+# samples per chunk of the model evaluation with known coefficients
+WRENCH_CHUNK_SIZE = 10000
+# columns of the forces and moments in the wrench arrays
+WRENCH_COLUMNS = {"lin": [0, 1, 2], "rot": [3, 4, 5]}
+
 
 class DynamicsModel:
     def __init__(self, config_dict, normalization=True):
         assert type(config_dict) is dict, "req_topics_dict input must be a dict"
         assert bool(config_dict), "req_topics_dict can not be empty"
         self.model_name = "unknown_model"
+        # flight logs of the data, recorded in the model registry
+        self.log_file_list = []
         self.config_dict = config_dict
         self.resample_freq = config_dict["resample_freq"]
         self.optimizer_config = config_dict["optimizer_config"]
@@ -86,6 +106,7 @@ class DynamicsModel:
 
         # used to generate a dict with the resulting coefficients later on.
         self.coef_name_list = []
+        self.X = None
         self.y_dict = {}
         self.coef_dict = {}
         self.result_dict = {}
@@ -93,28 +114,28 @@ class DynamicsModel:
     def prepare_regression_matrices(self):
         if "V_air_body_x" not in self.data_df:
             if self.apply_normalization:
-                self.normalize_actuators()
-            self.compute_airspeed_from_groundspeed(["vx", "vy", "vz"])
+                with profile_stage("normalization"):
+                    self.normalize_actuators()
+            with profile_stage("airspeed"):
+                self.compute_airspeed_from_groundspeed(["vx", "vy", "vz"])
 
         # Rotor features
-        angular_vel_mat = self.data_df[
-            ["ang_vel_x", "ang_vel_y", "ang_vel_z"]
-        ].to_numpy()
-        self.compute_rotor_features(self.rotor_config_dict, angular_vel_mat)
-
-        if self.estimate_forces and self.estimate_moments:
-            self.prepare_force_regression_matrices()
-            self.prepare_moment_regression_matrices()
-
-        elif self.estimate_forces:
-            self.prepare_force_regression_matrices()
-
-        elif self.estimate_moments:
-            self.prepare_moment_regression_matrices()
+        with profile_stage("rotor_features"):
+            angular_vel_mat = self.data_df[
+                ["ang_vel_x", "ang_vel_y", "ang_vel_z"]
+            ].to_numpy()
+            self.compute_rotor_features(self.rotor_config_dict, angular_vel_mat)
 
-        else:
+        if not (self.estimate_forces or self.estimate_moments):
             raise ValueError("Neither Forces nor Moments estimation activated")
 
+        # Force and moment measurements together with the aerodynamic features
+        with profile_stage("aero_features"):
+            if self.estimate_forces:
+                self.prepare_force_regression_matrices()
+            if self.estimate_moments:
+                self.prepare_moment_regression_matrices()
+
         return
 
     def prepare_force_regression_matrices(self):
@@ -154,6 +175,30 @@ class DynamicsModel:
 
         return X, y, coef_list
 
+    def get_required_columns(self):
+        """
+        Dataframe columns the model reads from the log. The DataHandler only loads and
+        resamples the topics providing these columns.
+        """
+        required_columns = ["timestamp", "q0", "q1", "q2", "q3", "vx", "vy", "vz"]
+        required_columns += ["ang_vel_x", "ang_vel_y", "ang_vel_z"]
+        for topic_type, topic_dict in self.req_topics_dict.items():
+            if "actuator_type" in topic_dict:
+                required_columns += self.get_topic_list_from_topic_type(topic_type)
+        for rotor_group_list in getattr(self, "rotor_config_dict", {}).values():
+            for rotor_config_dict in rotor_group_list:
+                required_columns.append(rotor_config_dict["dataframe_name"])
+                if "tilt_actuator_dataframe_name" in rotor_config_dict:
+                    required_columns.append(
+                        rotor_config_dict["tilt_actuator_dataframe_name"]
+                    )
+        if self.estimate_forces:
+            required_columns += ["acc_b_x", "acc_b_y", "acc_b_z"]
+        if self.estimate_moments:
+            required_columns += ["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"]
+        # drop duplicates
+        return list(dict.fromkeys(required_columns))
+
     def get_topic_list_from_topic_type(self, topic_type):
         topic_type_name_dict = self.req_topics_dict[topic_type]
         if "dataframe_name" in topic_type_name_dict.keys():
@@ -166,15 +211,10 @@ class DynamicsModel:
     def compute_airspeed_from_groundspeed(self, airspeed_topic_list):
         groundspeed_ned_mat = (self.data_df[airspeed_topic_list]).to_numpy()
         airspeed_body_mat = self.rot_to_body_frame(groundspeed_ned_mat)
-        aoa_vec = np.zeros((airspeed_body_mat.shape[0], 1))
-        sideslip_vec = np.zeros((airspeed_body_mat.shape[0], 1))
-        for i in range(airspeed_body_mat.shape[0]):
-            aoa_vec[i, :] = math.atan2(airspeed_body_mat[i, 2], airspeed_body_mat[i, 0])
-            sideslip_vec[i, :] = math.atan2(
-                airspeed_body_mat[i, 1], airspeed_body_mat[i, 0]
-            )
+        aoa_vec = np.arctan2(airspeed_body_mat[:, 2], airspeed_body_mat[:, 0])
+        sideslip_vec = np.arctan2(airspeed_body_mat[:, 1], airspeed_body_mat[:, 0])
 
-        airspeed_body_mat = np.hstack((airspeed_body_mat, aoa_vec, sideslip_vec))
+        airspeed_body_mat = np.column_stack((airspeed_body_mat, aoa_vec, sideslip_vec))
         airspeed_body_df = pd.DataFrame(
             airspeed_body_mat,
             columns=[
@@ -250,8 +290,10 @@ class DynamicsModel:
                             / (self.max_output - self.min_output)
                         )
             else:
-                print("actuator type unknown:", self.actuator_type[i])
-                print("normalization failed")
+                logger.error(
+                    "Actuator type unknown: %s, normalization failed",
+                    self.actuator_type[i],
+                )
                 exit(1)
             self.data_df[self.actuator_columns[i]] = actuator_data
 
@@ -268,8 +310,10 @@ class DynamicsModel:
         if "rotor_type" not in rotor_config_dict.keys():
             # Set default rotor model
             rotor_type = "RotorModel"
-            print("no Rotor model specified for ", rotor_input_name)
-            print("Selecting default: RotorModel")
+            logger.warning(
+                "No rotor model specified for %s, selecting default: RotorModel",
+                rotor_input_name,
+            )
         else:
             rotor_type = rotor_config_dict["rotor_type"]
 
@@ -307,9 +351,12 @@ class DynamicsModel:
                 angular_vel_mat=angular_vel_mat,
             )
         else:
-            print(rotor_type, " is not a valid rotor model.")
-            print("Valid rotor models are: ", valid_rotor_types)
-            print("Adapt your config file to a valid rotor model!")
+            logger.error(
+                "%s is not a valid rotor model. Valid rotor models are: %s. "
+                "Adapt your config file to a valid rotor model!",
+                rotor_type,
+                valid_rotor_types,
+            )
             exit(1)
 
         return rotor
@@ -402,15 +449,9 @@ class DynamicsModel:
         vec_mat: numpy array of dimensions (n,3),
         containing the horizontally stacked 3D vectors [x,y,z] in world frame.
         """
-        vec_mat_transformed = np.zeros(vec_mat.shape)
-        for i in range(vec_mat.shape[0]):
-            R_world_to_body = np.linalg.inv(
-                quaternion_to_rotation_matrix(self.q_mat[i, :])
-            )
-            vec_mat_transformed[i, :] = np.transpose(
-                R_world_to_body @ np.transpose(vec_mat[i, :])
-            )
-        return vec_mat_transformed
+        # the inverse of the rotation R_body_to_world is its transpose
+        R_body_to_world = self.compute_body_to_world_rotations()
+        return np.einsum("nji,nj->ni", R_body_to_world, vec_mat)
 
     def rot_to_world_frame(self, vec_mat):
         """
@@ -420,11 +461,15 @@ class DynamicsModel:
         vec_mat: numpy array of dimensions (n,3),
         containing the horizontally stacked 3D vectors [x,y,z] in body frame.
         """
-        vec_mat_transformed = np.zeros(vec_mat.shape)
-        for i in range(vec_mat.shape[0]):
-            R_body_to_world = quaternion_to_rotation_matrix(self.q_mat[i, :])
-            vec_mat_transformed[i, :] = R_body_to_world @ vec_mat[i, :]
-        return vec_mat_transformed
+        R_body_to_world = self.compute_body_to_world_rotations()
+        return np.einsum("nij,nj->ni", R_body_to_world, vec_mat)
+
+    def compute_body_to_world_rotations(self):
+        """
+        Returns the rotation matrices from FRD body frame to NED world frame of all samples
+        as numpy array of dimensions (n,3,3).
+        """
+        return np.moveaxis(quaternion_to_rotation_matrix(self.q_mat.T), -1, 0)
 
     def generate_model_dict(self, coefficient_list, metrics_dict, model_dict):
         assert len(self.coef_name_list) == len(coefficient_list), (
@@ -441,6 +486,10 @@ class DynamicsModel:
             "metrics": metrics_dict,
             "number of samples": self.n_samples,
         }
+        if hasattr(self, "cross_validation_dict"):
+            self.result_dict["cross_validation"] = self.cross_validation_dict
+        if hasattr(self, "prior_dict"):
+            self.result_dict["prior"] = self.prior_dict
 
     def save_result_dict_to_yaml(
         self,
@@ -455,66 +504,368 @@ class DynamicsModel:
             yaml.dump(self.result_dict, outfile, default_flow_style=False)
             if not results_only:
                 yaml.dump(self.fisher_metric, outfile, default_flow_style=False)
-        print(
-            "-------------------------------------------------------------------------------"
-        )
-        print("Complete results saved to: ")
-        print(file_path)
-        print(
-            "-------------------------------------------------------------------------------"
+        logger.info(
+            "Complete results saved to: %s", file_path, extra={"file_path": file_path}
         )
+        registry_dict = dict(self.result_dict)
+        if not results_only:
+            registry_dict.update(self.fisher_metric)
+        self.register_results(file_path, registry_dict, result_path)
+
+    def register_results(self, file_path, registry_dict, result_path="model_results/"):
+        """Add a results file to the model registry of the results directory."""
+        db_path = os.path.join(result_path, model_registry.REGISTRY_FILE)
+        try:
+            with model_registry.ModelRegistry(db_path) as registry:
+                registry.register(
+                    file_path,
+                    registry_dict,
+                    model_name=self.model_name,
+                    config_hash=model_registry.compute_config_hash(self.config_dict),
+                    log_files=self.log_file_list,
+                )
+        except sqlite3.Error as error:
+            # the results file is complete, a locked or corrupt registry only misses it
+            logger.warning("Results could not be added to %s: %s", db_path, error)
 
-    def load_dataframes(self, data_frame):
+    def set_data_df(self, data_frame):
         self.data_df = data_frame
         self.n_samples = self.data_df.shape[0]
         self.quaternion_df = self.data_df[["q0", "q1", "q2", "q3"]]
         self.q_mat = self.quaternion_df.to_numpy()
-        print(
-            "-------------------------------------------------------------------------------"
+
+    def load_dataframes(self, data_frame):
+        self.set_data_df(data_frame)
+        logger.debug(
+            "Initialized dataframe with the following columns: %s",
+            list(self.data_df.columns),
+        )
+        logger.info(
+            "Data contains %d timestamps.",
+            self.n_samples,
+            extra={"n_samples": self.n_samples},
         )
-        print("Initialized dataframe with the following columns: ")
-        print(list(self.data_df.columns))
-        print("Data contains ", self.n_samples, "timestamps.")
 
-    def predict_model(self, opt_coefs_dict):
-        print(
-            "==============================================================================="
+    def save_parameter_pack(self, result_path="model_results/"):
+        """Save the coefficients and rotor geometry of the results as binary parameter pack."""
+        timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+        file_path = os.path.join(
+            result_path,
+            self.model_name + "_" + timestr + parameter_pack.FILE_EXTENSION,
         )
-        print(
-            "                        Preparing Model Features                               "
+        parameter_pack.save_parameter_pack(
+            file_path, self.result_dict, self.model_name, type(self).__name__
         )
-        print(
-            "==============================================================================="
+        logger.info(
+            "Parameter pack saved to: %s", file_path, extra={"file_path": file_path}
         )
-        self.prepare_regression_matrices()
+        return file_path
 
+    def predict_model(self, opt_coefs_dict):
+        log_section(logger, "Preparing Model Features")
+        with profile_stage("features"):
+            self.wrench_mats = self.evaluate_wrench(opt_coefs_dict)
+        self.X = None
+        with profile_stage("metrics"):
+            self.generate_prediction_results(opt_coefs_dict)
+
+    def evaluate_wrench(self, opt_coefs_dict, chunk_size=WRENCH_CHUNK_SIZE):
+        """
+        Evaluate the model with known coefficients on the loaded data. The features are
+        computed chunk by chunk and multiplied with the coefficients right away, the
+        regression matrix of the complete data is never assembled. The feature columns are
+        kept in data_df for the plots.
+
+        Inputs:
+        opt_coefs_dict: dict of coefficient names and values
+        chunk_size: number of samples evaluated at once
+
+        Returns:
+        measured_mat, pred_mat: numpy arrays of shape (n, 6) with the measured and predicted
+            forces and moments (see WRENCH_COLUMNS), nan if not estimated
+        """
         configuration = []
         if self.estimate_forces:
             configuration.append("lin")
         if self.estimate_moments:
             configuration.append("rot")
-        self.X, self.y, self.coef_name_list = self.assemble_regression_matrices(
-            configuration
+        columns = sum(
+            [WRENCH_COLUMNS[measurement] for measurement in configuration], []
         )
 
-        c_opt_list = []
-        for coef in self.coef_name_list:
-            c_opt_list.append(opt_coefs_dict[coef])
-
+        full_df = self.data_df
+        measured_mat = np.full((full_df.shape[0], 6), np.nan)
+        pred_mat = np.full((full_df.shape[0], 6), np.nan)
+        chunk_df_list = []
+        coef_vec = None
+        for start in range(0, full_df.shape[0], chunk_size):
+            # the feature code joins new columns on a range index
+            self.set_data_df(
+                full_df.iloc[start : start + chunk_size].reset_index(drop=True)
+            )
+            self.prepare_regression_matrices()
+            X, y, self.coef_name_list = self.assemble_regression_matrices(configuration)
+            if coef_vec is None:
+                coef_vec = np.array(
+                    [opt_coefs_dict[coef] for coef in self.coef_name_list]
+                )
+                self.feature_gram = np.zeros((coef_vec.shape[0], coef_vec.shape[0]))
+                self.feature_sum = np.zeros(coef_vec.shape[0])
+                self.n_feature_rows = 0
+            # the regression targets are stacked axis by axis
+            rows = slice(start, start + self.n_samples)
+            measured_mat[rows, columns] = y.reshape((-1, self.n_samples)).T
+            pred_mat[rows, columns] = (X @ coef_vec).reshape((-1, self.n_samples)).T
+            # moments of the features for the correlation matrix
+            self.feature_gram += X.T @ X
+            self.feature_sum += np.sum(X, axis=0)
+            self.n_feature_rows += X.shape[0]
+            chunk_df_list.append(self.data_df)
+
+        data_df = pd.concat(chunk_df_list, ignore_index=True)
+        data_df.index = full_df.index
+        self.set_data_df(data_df)
+        return measured_mat, pred_mat
+
+    def compute_feature_correlation(self):
+        """Correlation matrix of the regression features (columns of X)."""
+        if self.X is not None:
+            gram = self.X.T @ self.X
+            feature_sum = np.sum(self.X, axis=0)
+            n_rows = self.X.shape[0]
+        else:
+            gram = self.feature_gram
+            feature_sum = self.feature_sum
+            n_rows = self.n_feature_rows
+        cov_mat = gram - np.outer(feature_sum, feature_sum) / n_rows
+        std_vec = np.sqrt(np.diag(cov_mat))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return cov_mat / np.outer(std_vec, std_vec)
+
+    def estimate_model(self, prior_results=None, prior_statistics=(), prior_weight=1.0):
+        """
+        Estimate the coefficients from the loaded data.
+
+        Inputs:
+        prior_results: optional path of a previous model results yaml file. Its coefficients
+            are used as Gaussian prior with the Cramer-Rao bounds as standard deviations.
+        prior_statistics: paths of regression statistics of previous logs (see
+            save_regression_statistics), which are added to the statistics of this log
+        prior_weight: scales the prior precision relative to the measurement noise
+        """
+        log_section(logger, "Preparing Model Features")
+        configuration = []
+        if self.estimate_forces:
+            configuration.append("lin")
+        if self.estimate_moments:
+            configuration.append("rot")
+        with profile_stage("assembly"):
+            self.X, self.y, self.coef_name_list = self.assemble_regression_matrices(
+                configuration
+            )
         self.initialize_optimizer()
-        self.optimizer.set_optimal_coefficients(c_opt_list, self.X, self.y)
-        self.generate_prediction_results()
+        with profile_stage("solve"):
+            if prior_results is None and len(prior_statistics) == 0:
+                if isinstance(self.optimizer, optimizers.RobustRegressor):
+                    self.estimate_robust_model(configuration)
+                else:
+                    self.optimizer.estimate_parameters(self.X, self.y)
+            else:
+                self.estimate_model_with_prior(
+                    configuration, prior_results, prior_statistics, prior_weight
+                )
+        with profile_stage("metrics"):
+            self.generate_optimization_results()
+
+        return
 
-    def estimate_model(self):
-        print(
-            "==============================================================================="
+    def estimate_robust_model(self, configuration, prior_gram=None, prior_moment=None):
+        """
+        Estimate the coefficients with the RobustRegressor, the residual scales are
+        estimated per measurement axis. prior_gram and prior_moment are added to the
+        normal equations of every reweighting iteration without being reweighted.
+        """
+        self.optimizer.estimate_parameters(
+            self.X,
+            self.y,
+            sample_weights=self.compute_sample_weights(configuration),
+            group_ids=np.repeat(np.arange(3 * len(configuration)), self.n_samples),
+            prior_gram=prior_gram,
+            prior_moment=prior_moment,
         )
-        print(
-            "                        Preparing Model Features                               "
+
+    def compute_sample_weights(self, configuration):
+        """
+        Per sample weights of the stacked regression rows, read from the column of the
+        data given by optimizer_config/robust_regression/sample_weights. The value
+        "fisher_information" weights the force and moment rows with the normalized
+        Fisher information of the samples.
+
+        Returns:
+        sample_weights: numpy array of shape (3 * len(configuration) * n_samples,) or None
+        """
+        robust_config = self.optimizer_config.get("robust_regression", None) or {}
+        weight_column = robust_config.get("sample_weights", None)
+        if weight_column is None:
+            return None
+        weight_columns = {
+            "lin": "fisher_information_force",
+            "rot": "fisher_information_rot",
+        }
+        weight_list = []
+        for m in configuration:
+            column = (
+                weight_columns[m]
+                if weight_column == "fisher_information"
+                else weight_column
+            )
+            if column not in self.data_df.columns:
+                raise ValueError("Sample weight column {0} not in data".format(column))
+            weight_list.append(np.tile(self.data_df[column].to_numpy(dtype=float), 3))
+        return np.concatenate(weight_list)
+
+    def estimate_model_with_prior(
+        self, configuration, prior_results, prior_statistics, prior_weight
+    ):
+        """
+        Solve the prior regularized least squares problem
+
+        min_c sum_logs (X * c - y)^T * (X * c - y) + w * (c - c_0)^T * P * (c - c_0)
+
+        from the normal equations of this log and the cached ones of previous logs. c_0
+        are the prior coefficients, P = diag(1 / crb^2) the inverse squared Cramer-Rao
+        bounds and w = prior_weight * mean measurement noise variance, which makes the
+        objective proportional to the negative log posterior.
+
+        With the RobustRegressor the rows of this log are reweighted by the robust loss,
+        the statistics of previous logs and the prior enter every iteration unweighted.
+        """
+        data_statistics = RegressionStatistics.from_data(self.X, self.y)
+        self.statistics = data_statistics
+        prior_gram = np.zeros_like(data_statistics.gram)
+        prior_moment = np.zeros_like(data_statistics.moment)
+        for file_path in prior_statistics:
+            log_statistics = RegressionStatistics.load(file_path, self.coef_name_list)
+            self.statistics += log_statistics
+            prior_gram += log_statistics.gram
+            prior_moment += log_statistics.moment
+
+        n_prior_coef = 0
+        if prior_results is not None:
+            with open(prior_results) as file:
+                prior_dict = yaml.load(file, Loader=yaml.FullLoader)
+            if "Cramer" not in prior_dict:
+                raise ValueError(
+                    "Prior results {0} contain no Cramer-Rao bounds".format(
+                        prior_results
+                    )
+                )
+            noise_covariances = self.get_measurement_noise_covariances()
+            noise_variance = np.mean(
+                [np.mean(np.diag(noise_covariances[m])) for m in configuration]
+            )
+            for i, coef in enumerate(self.coef_name_list):
+                bound = prior_dict["Cramer"].get(coef, 0.0)
+                # coefficients without a (valid) bound have no prior
+                if coef not in prior_dict["coefficients"] or not bound > 0.0:
+                    continue
+                precision = prior_weight * noise_variance / bound**2
+                prior_gram[i, i] += precision
+                prior_moment[i] += precision * prior_dict["coefficients"][coef]
+                n_prior_coef += 1
+
+        if isinstance(self.optimizer, optimizers.RobustRegressor):
+            self.estimate_robust_model(configuration, prior_gram, prior_moment)
+        else:
+            c_opt = self.optimizer.solve_gram(
+                data_statistics.gram + prior_gram,
+                data_statistics.moment + prior_moment,
+            )
+            self.optimizer.set_optimal_coefficients(c_opt, self.X, self.y)
+        self.prior_dict = {
+            "results": prior_results,
+            "statistics": list(prior_statistics),
+            "weight": prior_weight,
+            "n_prior_coefficients": n_prior_coef,
+            "n_samples_total": self.statistics.n_samples // (3 * len(configuration)),
+        }
+        logger.info("Prior", extra={"data": self.prior_dict})
+
+    def save_regression_statistics(self, result_path="model_results/"):
+        """
+        Save the regression statistics, accumulated over this log and the prior
+        statistics if any, for later estimations with prior_statistics.
+        """
+        if not hasattr(self, "statistics"):
+            self.statistics = RegressionStatistics.from_data(self.X, self.y)
+        timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+        file_path = os.path.join(
+            result_path, self.model_name + "_statistics_" + timestr + ".npz"
         )
-        print(
-            "==============================================================================="
+        self.statistics.save(file_path, self.coef_name_list)
+        logger.info(
+            "Regression statistics saved to: %s",
+            file_path,
+            extra={"file_path": file_path},
         )
+        return file_path
+
+    def cross_validate_model(self, n_folds=5):
+        """
+        k-fold cross validation on contiguous flight segments.
+
+        The regression matrices are assembled once and reduced to the sufficient statistics
+        (X^T X, X^T y, y^T y) of every fold and measurement axis. Each fold is then solved
+        from the statistics of the remaining folds and scored on its own statistics.
+        """
+        log_section(logger, "Cross Validation ({0} folds)".format(n_folds))
+        fold_vec, axis_list, fold_stats, total_stats = self.compute_fold_statistics(
+            n_folds
+        )
+
+        fold_results = []
+        for k in range(n_folds):
+            training_stats = total_stats - sum(
+                fold_stats[k], RegressionStatistics.zeros(len(self.coef_name_list))
+            )
+            c_fold = self.optimizer.solve_gram(
+                training_stats.gram, training_stats.moment
+            )
+            fold_result = {
+                "fold": k,
+                "number of samples": int(np.count_nonzero(fold_vec == k)),
+            }
+            for axis_index, axis in enumerate(axis_list):
+                fold_result[axis] = fold_stats[k][axis_index].compute_metrics(c_fold)
+            fold_results.append(fold_result)
+
+        aggregated_dict = {}
+        for axis in axis_list:
+            aggregated_dict[axis] = {}
+            for metric in ["R2", "RMSE"]:
+                values = np.array([result[axis][metric] for result in fold_results])
+                aggregated_dict[axis][metric + "_mean"] = float(np.nanmean(values))
+                aggregated_dict[axis][metric + "_std"] = float(np.nanstd(values))
+
+        self.cross_validation_dict = {
+            "n_folds": n_folds,
+            "folds": fold_results,
+            "aggregated": aggregated_dict,
+        }
+        logger.info("Cross validation metrics", extra={"data": aggregated_dict})
+        return self.cross_validation_dict
+
+    def compute_fold_statistics(self, n_folds):
+        """
+        Assemble the regression matrices and reduce them to the sufficient statistics of
+        every cross validation fold and measurement axis.
+
+        Returns:
+        fold_vec: fold index of every sample
+        axis_list: names of the measurement axes, e.g. force_x
+        fold_stats: fold_stats[k][i] are the statistics of fold k and axis axis_list[i]
+        total_stats: statistics of all folds and axes combined
+        """
         configuration = []
         if self.estimate_forces:
             configuration.append("lin")
@@ -524,10 +875,132 @@ class DynamicsModel:
             configuration
         )
         self.initialize_optimizer()
-        self.optimizer.estimate_parameters(self.X, self.y)
-        self.generate_optimization_results()
 
-        return
+        segment_ids = None
+        if "segment_id" in self.data_df.columns:
+            segment_ids = self.data_df["segment_id"].to_numpy()
+        fold_vec = compute_contiguous_folds(
+            self.data_df["timestamp"].to_numpy(), n_folds, segment_ids=segment_ids
+        )
+        measurement_names = {"lin": "force", "rot": "moment"}
+        axis_list = [
+            measurement_names[m] + "_" + j
+            for m in configuration
+            for j in ["x", "y", "z"]
+        ]
+
+        fold_stats = []
+        for k in range(n_folds):
+            fold_mask = fold_vec == k
+            axis_stats = []
+            for axis_index in range(len(axis_list)):
+                rows = slice(
+                    axis_index * self.n_samples, (axis_index + 1) * self.n_samples
+                )
+                axis_stats.append(
+                    RegressionStatistics.from_data(
+                        self.X[rows][fold_mask], self.y[rows][fold_mask]
+                    )
+                )
+            fold_stats.append(axis_stats)
+
+        total_stats = RegressionStatistics.zeros(len(self.coef_name_list))
+        for axis_stats in fold_stats:
+            for stats in axis_stats:
+                total_stats = total_stats + stats
+
+        return fold_vec, axis_list, fold_stats, total_stats
+
+    def compute_regularization_path(
+        self, n_folds=5, ridge_list=None, bound_scale_list=None
+    ):
+        """
+        Solve the model along a grid of ridge penalties and bound scalings and report the
+        coefficients and the cross validation error of every grid point.
+
+        The grids are read from optimizer_config/regularization_path (keys ridge and
+        bound_scale) unless given explicitly. Ridge penalties are relative to the mean
+        diagonal entry of X^T X, bound scalings multiply the parameter_bounds.
+        """
+        log_section(logger, "Regularization Path")
+        path_config = self.optimizer_config.get("regularization_path", None) or {}
+        if ridge_list is None:
+            ridge_list = path_config.get(
+                "ridge", [0.0, 1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1]
+            )
+        if bound_scale_list is None:
+            bound_scale_list = path_config.get("bound_scale", [1.0])
+
+        fold_vec, axis_list, fold_stats, total_stats = self.compute_fold_statistics(
+            n_folds
+        )
+        n_coef = len(self.coef_name_list)
+        grid_list, c_mat = self.optimizer.solve_regularization_path(
+            total_stats.gram, total_stats.moment, ridge_list, bound_scale_list
+        )
+
+        # pooled validation errors over all folds per grid point and axis
+        sse = np.zeros((len(grid_list), len(axis_list)))
+        sst = np.zeros((len(grid_list), len(axis_list)))
+        n_validation = np.zeros(len(axis_list))
+        for k in range(n_folds):
+            training_stats = total_stats - sum(
+                fold_stats[k], RegressionStatistics.zeros(n_coef)
+            )
+            _, c_fold_mat = self.optimizer.solve_regularization_path(
+                training_stats.gram,
+                training_stats.moment,
+                ridge_list,
+                bound_scale_list,
+            )
+            for axis_index, stats in enumerate(fold_stats[k]):
+                n_validation[axis_index] += stats.n_samples
+                if stats.n_samples == 0:
+                    continue
+                sst[:, axis_index] += (
+                    stats.y_sq_sum - stats.y_sum**2 / stats.n_samples
+                )
+                for grid_index in range(len(grid_list)):
+                    sse[grid_index, axis_index] += stats.sse(c_fold_mat[grid_index])
+
+        path_df = pd.DataFrame(grid_list, columns=["ridge", "bound_scale"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2_mat = np.where(sst > 0.0, 1.0 - sse / sst, np.nan)
+        for axis_index, axis in enumerate(axis_list):
+            path_df[axis + "_RMSE"] = np.sqrt(
+                sse[:, axis_index] / max(n_validation[axis_index], 1)
+            )
+            path_df[axis + "_R2"] = r2_mat[:, axis_index]
+        path_df["validation_R2"] = 1.0 - np.sum(sse, axis=1) / np.sum(sst, axis=1)
+        path_df[self.coef_name_list] = c_mat
+
+        self.regularization_path_df = path_df
+        best_index = int(np.nanargmax(path_df["validation_R2"].to_numpy()))
+        logger.debug(
+            "Regularization path:\n%s",
+            path_df[["ridge", "bound_scale", "validation_R2"]].to_string(),
+        )
+        logger.info(
+            "Best grid point: ridge = %s, bound_scale = %s",
+            *grid_list[best_index],
+            extra={
+                "ridge": grid_list[best_index][0],
+                "bound_scale": grid_list[best_index][1],
+            },
+        )
+        return path_df
+
+    def save_regularization_path_to_csv(self, result_path="model_results/"):
+        timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+        file_path = (
+            result_path + self.model_name + "_regularization_path_" + timestr + ".csv"
+        )
+        self.regularization_path_df.to_csv(file_path, index=False)
+        logger.info(
+            "Regularization path saved to: %s",
+            file_path,
+            extra={"file_path": file_path},
+        )
 
     def get_model_coeffs(self):
         metrics_dict = self.optimizer.compute_optimization_metrics()
@@ -545,18 +1018,9 @@ class DynamicsModel:
         return coef_dict
 
     def initialize_optimizer(self):
-        print(
-            "==============================================================================="
-        )
-        print(
-            "                            Initialize Optimizer                               "
-        )
-        print(
-            "                                "
-            + self.optimizer_config["optimizer_class"]
-        )
-        print(
-            "==============================================================================="
+        log_section(
+            logger,
+            "Initialize Optimizer: " + self.optimizer_config["optimizer_class"],
         )
 
         try:
@@ -571,52 +1035,31 @@ class DynamicsModel:
             )
             raise AttributeError(error_str)
 
-    def generate_prediction_results(self):
-        print(
-            "==============================================================================="
-        )
-        print(
-            "                            Prediction Results                                 "
-        )
-        print(
-            "==============================================================================="
-        )
-        metrics_dict = self.optimizer.compute_optimization_metrics()
-        coef_list = self.optimizer.get_optimization_parameters()
+    def generate_prediction_results(self, opt_coefs_dict):
+        log_section(logger, "Prediction Results")
+        measured_mat, pred_mat = self.wrench_mats
+        columns = np.flatnonzero(~np.isnan(measured_mat[0, :]))
+        # same stacking as the regression targets
+        y = measured_mat[:, columns].T.flatten()
+        y_pred = pred_mat[:, columns].T.flatten()
+        metrics_dict = {
+            "RMSE": rmse_between_numpy_arrays(y_pred, y),
+            "R2": r2_between_numpy_arrays(y_pred, y),
+        }
+        coef_list = [opt_coefs_dict[coef] for coef in self.coef_name_list]
         model_dict = {}
         model_dict.update(self.rotor_config_dict)
         if hasattr(self, "aerodynamics_dict"):
             model_dict.update(self.aerodynamics_dict)
         self.generate_model_dict(coef_list, metrics_dict, model_dict)
-        print(
-            "                           Optimal Coefficients                              "
-        )
-        print(
-            "-------------------------------------------------------------------------------"
-        )
-        print(yaml.dump(self.result_dict["coefficients"], default_flow_style=False))
-        print(
-            "-------------------------------------------------------------------------------"
+        logger.info(
+            "Optimal coefficients", extra={"data": self.result_dict["coefficients"]}
         )
-        print(
-            "                             Prediction Metrics                                "
-        )
-        print(
-            "-------------------------------------------------------------------------------"
-        )
-        print(yaml.dump(self.result_dict["metrics"], default_flow_style=False))
+        logger.info("Prediction metrics", extra={"data": self.result_dict["metrics"]})
         self.save_result_dict_to_yaml(file_name=self.model_name, results_only=True)
 
     def generate_optimization_results(self):
-        print(
-            "==============================================================================="
-        )
-        print(
-            "                           Optimization Results                                "
-        )
-        print(
-            "==============================================================================="
-        )
+        log_section(logger, "Optimization Results")
         metrics_dict = self.optimizer.compute_optimization_metrics()
         coef_list = self.optimizer.get_optimization_parameters()
         model_dict = {}
@@ -625,93 +1068,69 @@ class DynamicsModel:
         if hasattr(self, "aerodynamics_dict"):
             model_dict.update(self.aerodynamics_dict)
         self.generate_model_dict(coef_list, metrics_dict, model_dict)
-        print(
-            "                           Optimal Coefficients                              "
-        )
-        print(
-            "-------------------------------------------------------------------------------"
-        )
-        print(yaml.dump(self.result_dict["coefficients"], default_flow_style=False))
-        print(
-            "-------------------------------------------------------------------------------"
+        logger.info(
+            "Optimal coefficients", extra={"data": self.result_dict["coefficients"]}
         )
-        print(
-            "                            Optimization Metrics                               "
-        )
-        print(
-            "-------------------------------------------------------------------------------"
-        )
-        print(yaml.dump(self.result_dict["metrics"], default_flow_style=False))
+        logger.info("Optimization metrics", extra={"data": self.result_dict["metrics"]})
         self.save_result_dict_to_yaml(file_name=self.model_name)
 
-    def compute_residuals(self):
-        y_pred = self.optimizer.predict(self.X)
-        if self.estimate_forces:
-            _, y_forces, _ = self.assemble_regression_matrices(["lin"])
-            y_forces_measured = np.zeros(y_forces.shape)
-            y_forces_measured[0::3] = y_forces[0 : int(y_forces.shape[0] / 3)]
-            y_forces_measured[1::3] = y_forces[
-                int(y_forces.shape[0] / 3) : int(2 * y_forces.shape[0] / 3)
-            ]
-            y_forces_measured[2::3] = y_forces[
-                int(2 * y_forces.shape[0] / 3) : y_forces.shape[0]
-            ]
-
-            y_forces_pred = np.zeros(y_forces.shape)
-            y_forces_pred[0::3] = y_pred[0 : int(y_forces.shape[0] / 3)]
-            y_forces_pred[1::3] = y_pred[
-                int(y_forces.shape[0] / 3) : int(2 * y_forces.shape[0] / 3)
-            ]
-            y_forces_pred[2::3] = y_pred[
-                int(2 * y_forces.shape[0] / 3) : y_forces.shape[0]
-            ]
-
-            error_y_forces = y_forces_pred - y_forces_measured
-
-            stacked_error_y_forces = np.array(error_y_forces)
-            acc_mat = stacked_error_y_forces.reshape((-1, 3))
-            residual_force_df = pd.DataFrame(
-                acc_mat,
-                columns=["residual_force_x", "residual_force_y", "residual_force_z"],
-            )
-            self.data_df = pd.concat(
-                [self.data_df, residual_force_df], axis=1, join="inner"
-            ).reindex(self.data_df.index)
-
-        if self.estimate_moments:
-            _, y_moments, _ = self.assemble_regression_matrices(["rot"])
-
-            y_moments_measured = np.zeros(y_moments.shape)
-            y_moments_measured[0::3] = y_moments[0 : int(y_moments.shape[0] / 3)]
-            y_moments_measured[1::3] = y_moments[
-                int(y_moments.shape[0] / 3) : int(2 * y_moments.shape[0] / 3)
-            ]
-            y_moments_measured[2::3] = y_moments[
-                int(2 * y_moments.shape[0] / 3) : y_moments.shape[0]
-            ]
-
-            y_moments_pred = np.zeros(y_moments.shape)
-            y_moments_pred[0::3] = y_pred[
-                y_moments.shape[0] : int(4 * y_moments.shape[0] / 3)
-            ]
-            y_moments_pred[1::3] = y_pred[
-                int(4 * y_moments.shape[0] / 3) : int(5 * y_moments.shape[0] / 3)
-            ]
-            y_moments_pred[2::3] = y_pred[int(5 * y_moments.shape[0] / 3) :]
+    def compute_wrench_predictions(self):
+        """
+        Measured and predicted forces and moments, from evaluate_wrench after a prediction
+        or from the regression matrix and the optimizer after an estimation.
 
-            error_y_moments = y_moments_pred - y_moments_measured
+        Returns:
+        dict of "lin" and/or "rot": (measured, predicted), numpy arrays of shape (n, 3)
+        """
+        if self.X is None:
+            measured_mat, pred_mat = self.wrench_mats
+        else:
+            y_pred = self.optimizer.predict(self.X)
+            measured_mat = np.full((self.n_samples, 6), np.nan)
+            pred_mat = np.full((self.n_samples, 6), np.nan)
+            offset = 0
+            for measurement, estimate in [
+                ("lin", self.estimate_forces),
+                ("rot", self.estimate_moments),
+            ]:
+                if not estimate:
+                    continue
+                # the regression targets are stacked axis by axis
+                rows = slice(offset, offset + 3 * self.n_samples)
+                columns = WRENCH_COLUMNS[measurement]
+                measured_mat[:, columns] = self.y[rows].reshape((3, -1)).T
+                pred_mat[:, columns] = y_pred[rows].reshape((3, -1)).T
+                offset += 3 * self.n_samples
+        wrench_dict = {}
+        for measurement, estimate in [
+            ("lin", self.estimate_forces),
+            ("rot", self.estimate_moments),
+        ]:
+            if estimate:
+                columns = WRENCH_COLUMNS[measurement]
+                wrench_dict[measurement] = (
+                    measured_mat[:, columns],
+                    pred_mat[:, columns],
+                )
+        return wrench_dict
 
-            stacked_error_y_moments = np.array(error_y_moments)
-            mom_mat = stacked_error_y_moments.reshape((-1, 3))
-            residual_moment_df = pd.DataFrame(
-                mom_mat,
-                columns=["residual_moment_x", "residual_moment_y", "residual_moment_z"],
+    def compute_residuals(self):
+        wrench_dict = self.compute_wrench_predictions()
+        residual_names = {"lin": "residual_force", "rot": "residual_moment"}
+        for measurement, (measured_mat, pred_mat) in wrench_dict.items():
+            name = residual_names[measurement]
+            residual_df = pd.DataFrame(
+                pred_mat - measured_mat,
+                columns=[name + "_x", name + "_y", name + "_z"],
             )
             self.data_df = pd.concat(
-                [self.data_df, residual_moment_df], axis=1, join="inner"
+                [self.data_df, residual_df], axis=1, join="inner"
             ).reindex(self.data_df.index)
 
     def plot_model_predicitons(self):
+        import matplotlib.pyplot as plt
+        from .model_plots import model_plots, aerodynamics_plots, linear_model_plots
+
         def plot_scatter(
             ax, title, dataframe_x, dataframe_y, dataframe_z, color="blue"
         ):
@@ -729,7 +1148,7 @@ class DynamicsModel:
             ax.set_ylabel(dataframe_y)
             ax.set_zlabel(dataframe_z)
 
-        y_pred = self.optimizer.predict(self.X)
+        wrench_dict = self.compute_wrench_predictions()
 
         fig = plt.figure("Residual Visualization")
 
@@ -741,28 +1160,11 @@ class DynamicsModel:
         )
 
         if self.estimate_forces:
-            _, y_forces, _ = self.assemble_regression_matrices(["lin"])
-
-            y_forces_measured = np.zeros(y_forces.shape)
-            y_forces_measured[0::3] = y_forces[0 : int(y_forces.shape[0] / 3)]
-            y_forces_measured[1::3] = y_forces[
-                int(y_forces.shape[0] / 3) : int(2 * y_forces.shape[0] / 3)
-            ]
-            y_forces_measured[2::3] = y_forces[
-                int(2 * y_forces.shape[0] / 3) : y_forces.shape[0]
-            ]
-
-            y_forces_pred = np.zeros(y_forces.shape)
-            y_forces_pred[0::3] = y_pred[0 : int(y_forces.shape[0] / 3)]
-            y_forces_pred[1::3] = y_pred[
-                int(y_forces.shape[0] / 3) : int(2 * y_forces.shape[0] / 3)
-            ]
-            y_forces_pred[2::3] = y_pred[
-                int(2 * y_forces.shape[0] / 3) : y_forces.shape[0]
-            ]
-
+            y_forces_measured, y_forces_pred = wrench_dict["lin"]
             model_plots.plot_force_predictions(
-                y_forces_measured, y_forces_pred, self.data_df["timestamp"]
+                y_forces_measured.flatten(),
+                y_forces_pred.flatten(),
+                self.data_df["timestamp"],
             )
 
             ax1 = fig.add_subplot(2, 2, 1, projection="3d")
@@ -785,28 +1187,11 @@ class DynamicsModel:
             )
 
         if self.estimate_moments:
-            _, y_moments, _ = self.assemble_regression_matrices(["rot"])
-
-            y_moments_measured = np.zeros(y_moments.shape)
-            y_moments_measured[0::3] = y_moments[0 : int(y_moments.shape[0] / 3)]
-            y_moments_measured[1::3] = y_moments[
-                int(y_moments.shape[0] / 3) : int(2 * y_moments.shape[0] / 3)
-            ]
-            y_moments_measured[2::3] = y_moments[
-                int(2 * y_moments.shape[0] / 3) : y_moments.shape[0]
-            ]
-
-            y_moments_pred = np.zeros(y_moments.shape)
-            y_moments_pred[0::3] = y_pred[
-                y_moments.shape[0] : int(4 * y_moments.shape[0] / 3)
-            ]
-            y_moments_pred[1::3] = y_pred[
-                int(4 * y_moments.shape[0] / 3) : int(5 * y_moments.shape[0] / 3)
-            ]
-            y_moments_pred[2::3] = y_pred[int(5 * y_moments.shape[0] / 3) :]
-
+            y_moments_measured, y_moments_pred = wrench_dict["rot"]
             model_plots.plot_moment_predictions(
-                y_moments_measured, y_moments_pred, self.data_df["timestamp"]
+                y_moments_measured.flatten(),
+                y_moments_pred.flatten(),
+                self.data_df["timestamp"],
             )
 
             ax2 = fig.add_subplot(2, 2, 2, projection="3d")
@@ -831,22 +1216,210 @@ class DynamicsModel:
                 "blue",
             )
 
-        linear_model_plots.plot_covariance_mat(self.X, self.coef_name_list)
+        linear_model_plots.plot_correlation_mat(
+            self.compute_feature_correlation(), self.coef_name_list
+        )
 
         if hasattr(self, "aerodynamics_dict"):
-            coef_list = self.optimizer.get_optimization_parameters()
-            coef_dict = dict(zip(self.coef_name_list, coef_list))
             aerodynamics_plots.plot_liftdrag_curve(
-                self.data_df, coef_dict, self.aerodynamics_dict, self.fisher_metric
+                self.data_df,
+                self.result_dict["coefficients"],
+                self.aerodynamics_dict,
+                self.fisher_metric,
             )
         plt.tight_layout()
         plt.show()
         return
 
-    def compute_fisher_information(self):
+    def save_model_report(
+        self,
+        result_path="model_results/",
+        n_workers=None,
+        aoa_resolution_deg=0.1,
+        data_figure_specs=None,
+    ):
+        """
+        Render the diagnostic plots of plot_model_predicitons headless into
+        result_path/<model_name>_report_<time>/ with an index.html. Requires
+        compute_residuals to be called before.
+
+        Inputs:
+        n_workers: number of render processes, defaults to the number of cpus
+        aoa_resolution_deg: bin width of the measured angles of attack of the lift/drag curve
+        data_figure_specs: optional figure specs prepended to the report, e.g. from
+            DataHandler.get_report_figure_specs
+        """
+        from src.tools import report_renderer
+
+        timestamps = self.data_df["timestamp"].to_numpy() / 1000000
+        figure_specs = list(data_figure_specs or [])
+        figure_specs += [
+            report_renderer.time_series_spec(
+                "airspeed",
+                "Airspeed and angle of attack",
+                timestamps,
+                {
+                    "measured": self.data_df[
+                        ["V_air_body_x", "V_air_body_y", "V_air_body_z"]
+                    ].to_numpy()
+                },
+                ["V_air_body_x [m/s]", "V_air_body_y [m/s]", "V_air_body_z [m/s]"],
+            ),
+        ]
+        if "angle_of_attack" in self.data_df:
+            figure_specs.append(
+                report_renderer.time_series_spec(
+                    "angle_of_attack",
+                    "Angle of attack",
+                    timestamps,
+                    {"measured": self.data_df[["angle_of_attack"]].to_numpy()},
+                    ["angle_of_attack [rad]"],
+                )
+            )
+
+        wrench_dict = self.compute_wrench_predictions()
+        for measurement, name, unit in [
+            ("lin", "force", "N"),
+            ("rot", "moment", "Nm"),
+        ]:
+            if measurement not in wrench_dict:
+                continue
+            measured_mat, pred_mat = wrench_dict[measurement]
+            axis_labels = [name + "_" + axis + " [" + unit + "]" for axis in "xyz"]
+            figure_specs += [
+                report_renderer.time_series_spec(
+                    name + "_predictions",
+                    "Predictions of the " + name + "s",
+                    timestamps,
+                    {"measured": measured_mat, "predicted": pred_mat},
+                    axis_labels,
+                ),
+                report_renderer.scatter_3d_spec(
+                    "residual_" + name + "s",
+                    "Residual " + name + "s [" + unit + "]",
+                    pred_mat - measured_mat,
+                    ["residual_" + label for label in axis_labels],
+                ),
+                report_renderer.scatter_3d_spec(
+                    "measured_" + name + "s",
+                    "Measured " + name + "s [" + unit + "]",
+                    measured_mat,
+                    ["measured_" + label for label in axis_labels],
+                ),
+            ]
+
+        figure_specs.append(
+            report_renderer.matrix_spec(
+                "correlation_matrix",
+                "Correlation matrix of the regression features",
+                self.compute_feature_correlation(),
+                self.coef_name_list,
+            )
+        )
+
+        if hasattr(self, "aerodynamics_dict") and hasattr(self, "fisher_metric"):
+            coef_dict = self.result_dict["coefficients"]
+            # one sample per angle of attack bin looks the same as all samples
+            aoa_resolution = aoa_resolution_deg * math.pi / 180
+            aoa_binned = np.unique(
+                np.round(self.data_df["angle_of_attack"].to_numpy() / aoa_resolution)
+            )
+            figure_specs.append(
+                report_renderer.pyplot_function_spec(
+                    "liftdrag_curve",
+                    "Lift and drag curve",
+                    "src.models.model_plots.aerodynamics_plots",
+                    "plot_liftdrag_curve",
+                    pd.DataFrame({"angle_of_attack": aoa_binned * aoa_resolution}),
+                    coef_dict,
+                    self.aerodynamics_dict,
+                    self.fisher_metric,
+                )
+            )
+
+        timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+        output_dir = os.path.join(result_path, self.model_name + "_report_" + timestr)
+        summary_dict = {}
+        if hasattr(self, "result_dict"):
+            summary_dict["metrics"] = self.result_dict.get("metrics", {})
+            summary_dict["coefficients"] = self.result_dict.get("coefficients", {})
+        return report_renderer.render_report(
+            figure_specs,
+            output_dir,
+            title=self.model_name,
+            summary_dict=summary_dict,
+            n_workers=n_workers,
+        )
+
+    def get_measurement_noise_covariances(self):
         ## TODO: Parse accelerometer noise characteristics
         R_acc = np.diag([250 * 0.00186, 250 * 0.00186, 250 * 0.00186])
         R_gyro = np.diag([250 * 0.0003394, 250 * 0.0003394, 250 * 0.0003394])
+        return {"lin": R_acc, "rot": R_gyro}
+
+    def compute_window_information_factors(self, window_length, max_rank=3):
+        """
+        Low rank factors of the Fisher information matrices of consecutive windows of samples.
+
+        The information of a window is the sum of the per sample information matrices
+        J_i^T * R^-1 * J_i over all its samples, taken jointly over the force and moment
+        coefficients. Every window matrix is compressed to its max_rank dominant eigen
+        directions, I_w ~ F_w^T * F_w.
+
+        Returns:
+        factors: numpy array of shape (n_windows, max_rank, n_coef)
+        window_starts: index of the first sample of every window
+        """
+        noise_covariances = self.get_measurement_noise_covariances()
+        configuration = []
+        if self.estimate_forces:
+            configuration.append("lin")
+        if self.estimate_moments:
+            configuration.append("rot")
+        X, _, _ = self.assemble_regression_matrices(configuration)
+
+        # rows of the whitened jacobians R^-1/2 * J_i, shape (n_samples, n_rows, n_coef)
+        row_list = []
+        for measurement_index, measurement in enumerate(configuration):
+            noise_std = np.sqrt(np.diag(noise_covariances[measurement]))
+            for axis_index in range(3):
+                block_index = 3 * measurement_index + axis_index
+                row_list.append(
+                    X[block_index * self.n_samples : (block_index + 1) * self.n_samples]
+                    / noise_std[axis_index]
+                )
+        whitened_jacobians = np.stack(row_list, axis=1)
+
+        window_starts = np.arange(0, self.n_samples, window_length)
+        n_rows = whitened_jacobians.shape[1]
+        n_coef = whitened_jacobians.shape[2]
+        n_complete = self.n_samples // window_length
+        complete_windows = whitened_jacobians[: n_complete * window_length].reshape(
+            n_complete, window_length * n_rows, n_coef
+        )
+        window_information = np.einsum(
+            "wkp,wkq->wpq", complete_windows, complete_windows
+        )
+        if n_complete < window_starts.shape[0]:
+            remainder = whitened_jacobians[n_complete * window_length :].reshape(
+                -1, n_coef
+            )
+            window_information = np.concatenate(
+                (window_information, (remainder.T @ remainder)[np.newaxis])
+            )
+
+        eig_vals, eig_vecs = np.linalg.eigh(window_information)
+        rank = min(max_rank, n_coef)
+        eig_vals = np.clip(eig_vals[:, -rank:], 0.0, None)
+        factors = np.sqrt(eig_vals)[:, :, np.newaxis] * np.transpose(
+            eig_vecs[:, :, -rank:], (0, 2, 1)
+        )
+        return factors, window_starts
+
+    def compute_fisher_information(self):
+        noise_covariances = self.get_measurement_noise_covariances()
+        R_acc = noise_covariances["lin"]
+        R_gyro = noise_covariances["rot"]
         ## TODO: Compensate for bandlimited signals
         fudge_factor = 5.0
 
@@ -918,9 +1491,9 @@ class DynamicsModel:
 
             forces_dict = coef_force
             metric_dict = dict(zip(forces_dict, cramer_rao_bounds_f.tolist()))
-            print("Cramer-Rao Bounds for force parameters:")
-            for key, value in metric_dict.items():
-                print(key, "\t", value)
+            logger.debug(
+                "Cramer-Rao bounds for force parameters", extra={"data": metric_dict}
+            )
 
             self.cramer_rao_bounds_f = cramer_rao_bounds_f
             self.fisher_metric.update(metric_dict)
@@ -992,9 +1565,9 @@ class DynamicsModel:
             moments_dict = coef_moment
 
             metric_dict = dict(zip(moments_dict, cramer_rao_bounds_m.tolist()))
-            print("Cramer-Rao Bounds for moment parameters:")
-            for key, value in metric_dict.items():
-                print(key, "\t", value)
+            logger.debug(
+                "Cramer-Rao bounds for moment parameters", extra={"data": metric_dict}
+            )
 
             self.cramer_rao_bounds_m = cramer_rao_bounds_m
             self.fisher_metric.update(metric_dict)
@@ -1,2 +1,4 @@
+from .extractor_model import ExtractorModel
 from .fixedwing_extractor_model import FixedWingExtractorModel
 from .singularityfree_extractor_model import SingularityFreeExtractorModel
+from .parameter_sweep import sweep_px4_params, save_sweep_results
@@ -0,0 +1,703 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Common PX4 parameter extraction for fixed wing aerodynamic models. The flight envelope
+(glide, level flight and steady climb polars) is solved on vectorized grids from the
+coefficient functions of the aerodynamic model.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.models.model_config import ModelConfig
+from src.tools.logging_tools import log_section
+from src.tools.math_tools import newton_solve
+
+import logging
+import numpy as np
+import time
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# sink and climb rates of the gliding and climbing flight states and the trims of the
+# same states, physical states have positive rates
+VERTICAL_RATE_PARAMS = {
+    "FW_T_SINK_MIN": "TRIM_PITCH_MIN_SINK",
+    "FW_T_SINK_MAX": "TRIM_PITCH_MAX_SINK",
+    "FW_T_CLIMB_MAX": "TRIM_PITCH_MAX_CLIMB",
+}
+
+
+class ExtractorModel:
+    def __init__(
+        self, config, model_config_file, coefficients, model_name, required_coefficients
+    ):
+        """
+        Initialize the extractor model.
+        The configuration dictionary should at least contain specifications for minimum and maximum airspeed for the aircraft (strutural and stall limits).
+        Optionally, a criuse flight speed can be specified. Otherwise, the maximum range airspeed is used as cruise speed.
+
+        The aerodynamic model is defined by the vectorized functions cL, cD and
+        zero_moment_trim of the subclass, all PX4 parameters are computed from these.
+
+        :param config: configuration dictionary
+        :param model_config_file: path to model configuration file
+        :param coefficients: dictionary with identified aerodynamic coefficients
+        :param model_name: name of the extractor used for the result file
+        :param required_coefficients: list of the coefficients used by the aerodynamic model
+        """
+        log_section(logger, "PX4 Parameter Extraction")
+
+        # logging level of the extraction results, DEBUG keeps parameter sweeps quiet
+        self.log_level = logging.INFO
+
+        self.model_name = model_name
+        self.config = config
+        self.model_config = ModelConfig(model_config_file)
+        self.aero_params = coefficients
+
+        self.gravity = 9.81
+        self.rho = 1.225
+
+        self.mass = self.model_config.model_config["mass"]
+        self.area = self.model_config.model_config["aerodynamics"]["area"]
+        self.chord = self.model_config.model_config["aerodynamics"]["chord"]
+        self.span = self.area / self.chord
+
+        self.px4_params = {}
+        self.invalid_params = []
+        self.glide_polar_cache = {}
+
+        # check that all required aerodynamic coefficients are given
+        for coeff in required_coefficients:
+            if not coeff in self.aero_params:
+                raise ValueError(
+                    "Coefficient {} not found in identified coefficient dictionary".format(
+                        coeff
+                    )
+                )
+
+    def set_operating_point(self, mass=None, rho=None, vcruise=None):
+        """
+        Change the mass, air density or cruise speed of the extraction. The cached polars and
+        the extracted parameters are reset.
+
+        :param mass: mass of the aircraft
+        :param rho: air density
+        :param vcruise: cruise speed
+        """
+        if mass is not None:
+            self.mass = mass
+        if rho is not None:
+            self.rho = rho
+        if vcruise is not None:
+            self.config = dict(self.config, vcruise=vcruise)
+        self.glide_polar_cache = {}
+        self.px4_params = {}
+        self.invalid_params = []
+
+    def get_px4_params(self):
+        """
+        Getter function for the extarcted px4 parameters
+
+        :return: dictionary with extracted px4 parameters
+        """
+        return self.px4_params
+
+    def save_px4_params_to_yaml(self, output_folder):
+        """
+        Save the extracted px4 parameters to a yaml file
+
+        :param output_folder: path to the output file
+        """
+        timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+        file_path = (
+            output_folder + self.model_name + "_px4_params" + "_" + timestr + ".yaml"
+        )
+
+        with open(file_path, "w") as outfile:
+            yaml.dump(self.px4_params, outfile, default_flow_style=False)
+
+        return
+
+    def compute_px4_params(self):
+        """
+        Main function to compute the px4 parameters
+        To see which parameters are computed, check the README of the repository
+        """
+        logger.log(
+            self.log_level,
+            "Starting parameter extraction with the following configuration parameters",
+            extra={
+                "data": {
+                    "Minimum Airspeed": self.config["vmin"],
+                    "Maximum Airspeed": self.config["vmax"],
+                    "Cruise speed": self.config["vcruise"]
+                    if "vcruise" in self.config
+                    else "speed for maximum range",
+                }
+            },
+        )
+
+        self.px4_params["FW_AIRSPD_MIN"] = self.config["vmin"]
+        self.px4_params["FW_AIRSPD_MAX"] = self.config["vmax"]
+
+        (
+            self.px4_params["TRIM_PITCH_MAX_RANGE"],
+            self.px4_params["FW_AIRSPD_MAX_RANGE"],
+        ) = self.get_max_range_params()
+        self.px4_params["FW_AIRSPD_TRIM"] = (
+            self.config["vcruise"]
+            if "vcruise" in self.config
+            else self.px4_params["FW_AIRSPD_MAX_RANGE"]
+        )
+
+        (
+            self.px4_params["TRIM_PITCH_MIN_SINK"],
+            self.px4_params["FW_AIRSPD_MIN_SINK"],
+            self.px4_params["FW_T_SINK_MIN"],
+        ) = self.get_min_sink_params()
+
+        (
+            self.px4_params["FW_THR_TRIM"],
+            self.px4_params["FW_PSP_OFF"],
+            self.px4_params["TRIM_PITCH"],
+        ) = self.get_cruise_params(self.px4_params["FW_AIRSPD_TRIM"])
+
+        (
+            self.px4_params["FW_DTRIM_P_VMIN"],
+            self.px4_params["FW_THR_VMIN"],
+        ) = self.get_min_vel_params(self.config["vmin"], self.px4_params["TRIM_PITCH"])
+
+        (
+            self.px4_params["TRIM_PITCH_MAX_SINK"],
+            self.px4_params["FW_T_SINK_MAX"],
+            self.px4_params["FW_DTRIM_P_VMAX"],
+            self.px4_params["FW_THR_VMAX"],
+        ) = self.get_max_vel_params(self.config["vmax"], self.px4_params["TRIM_PITCH"])
+
+        (
+            self.px4_params["FW_T_CLIMB_MAX"],
+            self.px4_params["TRIM_PITCH_MAX_CLIMB"],
+        ) = self.get_max_climb_params(self.px4_params["FW_AIRSPD_MIN_SINK"])
+
+        self.invalid_params = self.validate_px4_params()
+
+        log_section(logger, "END PX4 Parameter Extraction", self.log_level)
+
+        return
+
+    def validate_px4_params(self):
+        """
+        Reject parameters of flight states that were not found or are not physical: non finite
+        values (e.g. the throttle of a model without thrust or a state whose iterations did
+        not converge) and non positive sink or climb rates together with the trim of the
+        same flight state are replaced by nan.
+
+        :return: list of the rejected parameter names
+        """
+        invalid_params = [
+            name for name, value in self.px4_params.items() if not np.isfinite(value)
+        ]
+        for rate_param, trim_param in VERTICAL_RATE_PARAMS.items():
+            if self.px4_params[rate_param] <= 0.0:
+                invalid_params += [rate_param, trim_param]
+        invalid_params = list(dict.fromkeys(invalid_params))
+        if invalid_params:
+            logger.warning(
+                "No physical flight state found, parameters set to nan: %s",
+                invalid_params,
+            )
+        for name in invalid_params:
+            self.px4_params[name] = float("nan")
+        return invalid_params
+
+    def cL(self, alpha, delta_e):
+        """
+        This function computes the lift coefficient, vectorized over numpy arrays.
+
+        :param alpha: angle of attack
+        :param delta_e: elevator deflection
+        :return: lift coefficient
+        """
+        raise NotImplementedError()
+
+    def cD(self, alpha):
+        """
+        This function computes the drag coefficient, vectorized over numpy arrays.
+
+        :param alpha: angle of attack
+        :return: drag coefficient
+        """
+        raise NotImplementedError()
+
+    def lift(self, alpha, delta_e, velocity):
+        """
+        This function computes the lift force.
+
+        :param alpha: angle of attack
+        :param delta_e: elevator deflection
+        :return: lift force
+        """
+        return 0.5 * self.rho * self.area * (velocity**2) * self.cL(alpha, delta_e)
+
+    def drag(self, alpha, velocity):
+        """
+        This function computes the drag force.
+
+        :param alpha: angle of attack
+        :return: drag force
+        """
+        return 0.5 * self.rho * self.area * (velocity**2) * self.cD(alpha)
+
+    def thrust(self, throttle):
+        """
+        This function computes the thrust force.
+
+        :param throttle: throttle setting
+        :return: thrust force
+        """
+        return self.aero_params["puller_ct"] * throttle
+
+    def zero_moment_trim(self, alpha, throttle, velocity):
+        """
+        This function computes the elevator trim for zero resulting pitching moment,
+        vectorized over numpy arrays.
+
+        :param alpha: angle of attack
+        :param throttle: throttle setting
+        :param velocity: flight speed
+        :return: elevator trim
+        """
+        raise NotImplementedError()
+
+    def get_max_range_params(self):
+        """
+        This function computes the elevator trim and flight speed for maximum range (gliding flight)
+        Condition for max range: max cL/cD = max L/D
+
+        :return: elevator trim and flight speed
+        """
+        log_section(logger, "Extraction of Maximum Range Parameters", self.log_level)
+        logger.debug("Computing maximum range parameters (level flight)")
+
+        glide_polar = self.get_cached_glide_polar((-20.0, 20.0))
+
+        idx = np.argmax(np.nan_to_num(glide_polar["lift_drag_ratio"], nan=-np.inf))
+        elevator_trim = glide_polar["elevator_trim"][idx]
+        airspeed = glide_polar["airspeed"][idx]
+
+        logger.log(
+            self.log_level,
+            "Maximum range parameters computed successfully",
+            extra={
+                "data": {
+                    "Elevator trim": elevator_trim,
+                    "Speed for maximum range": airspeed,
+                }
+            },
+        )
+
+        return float(elevator_trim), float(airspeed)
+
+    def get_min_sink_params(self):
+        """
+        This function computes the elevator trim, flight speed and sink rate for the minimum sink rate flight state (gliding flight)
+        Condition for min sink rate: max cL^3 / cD^2
+
+        :return: elevator trim, flight speed and sink rate
+        """
+        log_section(
+            logger, "Extraction of Minimum Sink Rate Parameters", self.log_level
+        )
+        logger.debug("Computing minimum sink rate parameters (gliding flight)")
+
+        glide_polar = self.get_cached_glide_polar((-30.0, 30.0))
+
+        cl = glide_polar["lift_drag_ratio"] * self.cD(glide_polar["alpha"])
+        ratio = (cl**3) / (self.cD(glide_polar["alpha"]) ** 2)
+        idx = np.argmax(np.nan_to_num(ratio, nan=-np.inf))
+        airspeed = glide_polar["airspeed"][idx]
+        elevator_trim = glide_polar["elevator_trim"][idx]
+        min_sink_rate = glide_polar["sink_rate"][idx]
+
+        logger.log(
+            self.log_level,
+            "Min sink parameters computed successfully",
+            extra={
+                "data": {
+                    "Elevator trim (gliding flight)": elevator_trim,
+                    "Speed for minimum sink rate (gliding flight)": airspeed,
+                    "Minimum sink sink rate (gliding flight)": min_sink_rate,
+                }
+            },
+        )
+
+        return float(elevator_trim), float(airspeed), float(min_sink_rate)
+
+    def get_cruise_params(self, airspeed: float):
+        """
+        This function computes the elevator trim and throttle setting for level flight
+        The velocity (airspeed) is given as an input
+
+        :param airspeed: flight speed
+        :return: elevator trim, throttle setting and level flight pitch (= angle of attack)
+        """
+        log_section(logger, "Extraction of Cruise Parameters", self.log_level)
+        logger.debug("Starting cruise flight parameters computation (level flight)")
+
+        (
+            throttle_setting,
+            pitch_level_flight,
+            elevator_trim,
+        ) = self.get_level_flight_params(airspeed)
+
+        logger.log(
+            self.log_level,
+            "Cruise flight parameters computed successfully",
+            extra={
+                "data": {
+                    "Cruise level flight pitch": pitch_level_flight,
+                    "Throttle setting": throttle_setting,
+                    "Cruise level flight trim": elevator_trim,
+                }
+            },
+        )
+
+        return float(throttle_setting), float(pitch_level_flight), float(elevator_trim)
+
+    def get_min_vel_params(self, vmin: float, level_trim: float):
+        """
+        This function computes the elevator trim and flight speed for minimum velocity (user-provided).
+
+        :param vmin: minimum velocity
+        :return: differential elevator trim (to cruise trim) and throttle setting at minimum flight speed
+        """
+        log_section(logger, "Extraction of Minimum Velocity Parameters", self.log_level)
+        logger.debug("Starting minimum velocity parameters computation (level flight)")
+
+        throttle_setting, _, elevator_trim = self.get_level_flight_params(vmin)
+        diff_trim = elevator_trim - level_trim
+
+        logger.log(
+            self.log_level,
+            "Minimum velocity parameters at %s m/s computed successfully",
+            vmin,
+            extra={
+                "data": {
+                    "Differential elevator trim": diff_trim,
+                    "Throttle setting": throttle_setting,
+                }
+            },
+        )
+
+        return float(diff_trim), float(throttle_setting)
+
+    def get_max_vel_params(self, vmax: float, level_trim: float):
+        """
+        This function computes the elevator trim and maximum sink rate for maximum velocity
+
+        :param vmax: maximum velocity (user input)
+        :return: differential elevator trim (to cruise trim), throttle setting for Vmax at level flight and maximum sink rate
+        """
+        log_section(logger, "Extraction of Maximum Velocity Parameters", self.log_level)
+        logger.debug("Starting maximum velocity parameters computation (level flight)")
+
+        throttle_setting, _, elevator_trim = self.get_level_flight_params(vmax)
+        diff_trim = elevator_trim - level_trim
+
+        # compute max sink rate with motor off
+        max_sink_state = self.get_steady_flight_polar(vmax, 0.0)
+        alpha = max_sink_state["alpha"][0]
+        max_sink_rate = max_sink_state["sink_rate"][0]
+        max_sink_trim = max_sink_state["elevator_trim"][0]
+
+        logger.log(
+            self.log_level,
+            "Maximum velocity parameters at %s m/s computed successfully",
+            vmax,
+            extra={
+                "data": {
+                    "Differential elevator trim": diff_trim,
+                    "Max velocity level flight throttle setting": throttle_setting,
+                    "Max sink rate at zero throttle": max_sink_rate,
+                    "Angle of Attack": alpha,
+                }
+            },
+        )
+
+        return (
+            float(max_sink_trim),
+            float(max_sink_rate),
+            float(diff_trim),
+            float(throttle_setting),
+        )
+
+    def get_max_climb_params(self, airspeed):
+        """
+        This function computes the elevator trim and maximum climb rate for a given airspeed
+        Caution: The provided flight speed is not necessarily the one at which the maximum climb
+            rate is achieved, but the min sink speed according to the PX4 parameter defintion
+
+        :param airspeed: flight speed
+        :return: elevator trim and maximum climb rate
+        """
+        log_section(
+            logger, "Extraction of Maximum Climb Rate Parameters", self.log_level
+        )
+        logger.debug("Starting maximum climb rate parameters computation")
+
+        max_climb_state = self.get_steady_flight_polar(airspeed, 1.0)
+        alpha = max_climb_state["alpha"][0]
+        elevator_trim = max_climb_state["elevator_trim"][0]
+        max_climb_rate = -max_climb_state["sink_rate"][0]
+
+        logger.log(
+            self.log_level,
+            "Maximum climb rate parameters computed successfully",
+            extra={
+                "data": {
+                    "Angle of attack": alpha,
+                    "Elevator trim": elevator_trim,
+                    "Speed for maximum climb rate": airspeed,
+                    "Maximum climb rate": max_climb_rate,
+                }
+            },
+        )
+
+        return float(max_climb_rate), float(elevator_trim)
+
+    # auxilary function to compute the level flight parameters with missing angle of attack (but known velocity)
+    def get_level_flight_params(self, airspeed):
+        """
+        (Auxilary Function)
+        This function computes the throttle setting, pitch angle and elevator trim for steady level flight at a given airspeed
+
+        :param airspeed: flight speed
+        :return: throttle setting, pitch angle and elevator trim
+        """
+        level_flight_polar = self.get_level_flight_polar(airspeed)
+        return (
+            level_flight_polar["throttle"][0],
+            level_flight_polar["alpha"][0],
+            level_flight_polar["elevator_trim"][0],
+        )
+
+    def get_initial_alpha(self, airspeeds):
+        """
+        (Auxilary Function)
+        Initial guess of the envelope solvers: the angle of attack of the gliding flight state
+        at the same flight speed, interpolated from the cached glide polar. Only the attached
+        flow branch (positive lift up to the minimum gliding speed) is considered.
+
+        :param airspeeds: numpy array of flight speeds
+        :return: numpy array of angles of attack
+        """
+        glide_polar = self.get_cached_glide_polar((-30.0, 30.0))
+        attached = (glide_polar["lift_drag_ratio"] > 0) & np.isfinite(
+            glide_polar["airspeed"]
+        )
+        if not np.any(attached):
+            return np.zeros(airspeeds.shape)
+        idx_min_speed = np.argmin(np.where(attached, glide_polar["airspeed"], np.inf))
+        attached &= glide_polar["alpha"] <= glide_polar["alpha"][idx_min_speed]
+        branch_alphas = glide_polar["alpha"][attached]
+        branch_airspeeds = glide_polar["airspeed"][attached]
+        idx = np.argmin(
+            np.abs(branch_airspeeds[:, np.newaxis] - airspeeds[np.newaxis, :]), axis=0
+        )
+        return branch_alphas[idx]
+
+    def get_cached_glide_polar(self, alpha_range_deg, n_alpha=500):
+        """
+        (Auxilary Function)
+        Glide polar on an equally spaced grid of angles of attack, computed once per grid.
+
+        :param alpha_range_deg: minimum and maximum angle of attack in degrees
+        :param n_alpha: number of grid points
+        :return: dictionary of numpy arrays, see get_glide_polar
+        """
+        key = (float(alpha_range_deg[0]), float(alpha_range_deg[1]), n_alpha)
+        if key not in self.glide_polar_cache:
+            self.glide_polar_cache[key] = self.get_glide_polar(
+                np.linspace(key[0] * np.pi / 180, key[1] * np.pi / 180, n_alpha)
+            )
+        return self.glide_polar_cache[key]
+
+    def get_glide_polar(self, alphas, max_iter=20, tol=1e-10):
+        """
+        (Auxilary Function)
+        This function computes the gliding flight states (zero thrust) for a grid of angles of
+        attack. For a given zero moment trim the equations of motion have the closed form
+        solution
+            gamma = -arctan(cD / cL), airspeed = sqrt(2 * m * g / (rho * S * sqrt(cL^2 + cD^2)))
+        which is iterated as long as the trim changes with the airspeed. Aerodynamic models
+        whose lift does not depend on the airspeed through the trim converge in one iteration.
+
+        :param alphas: numpy array of angles of attack
+        :return: dictionary of numpy arrays with the angle of attack, elevator trim, flight
+            speed, flight path angle, lift to drag ratio and sink rate, nan where the
+            iterations did not converge or the lift or drag is not positive
+        """
+        alphas = np.atleast_1d(np.asarray(alphas, dtype=float))
+
+        def lift_drag_coefficients(airspeeds):
+            trims = self.zero_moment_trim(alphas, 0.0, airspeeds)
+            return trims, self.cL(alphas, trims), self.cD(alphas)
+
+        airspeeds = np.full(alphas.shape, 10.0)
+        for _ in range(max_iter):
+            _, cl, cd = lift_drag_coefficients(airspeeds)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                next_airspeeds = np.sqrt(
+                    (2 * self.mass * self.gravity)
+                    / (self.rho * self.area * np.hypot(cl, cd))
+                )
+            converged = ~(np.abs(next_airspeeds - airspeeds) > tol * airspeeds)
+            airspeeds = next_airspeeds
+            if np.all(converged):
+                break
+
+        trims, cl, cd = lift_drag_coefficients(airspeeds)
+        gammas = -np.arctan2(cd, cl)
+        # gliding requires positive lift and drag, other states are not physical
+        valid = converged & (cl > 0) & (cd > 0)
+        return {
+            "alpha": alphas,
+            "elevator_trim": np.where(valid, trims, np.nan),
+            "airspeed": np.where(valid, airspeeds, np.nan),
+            "flight_path_angle": np.where(valid, gammas, np.nan),
+            "lift_drag_ratio": np.where(valid, cl / cd, np.nan),
+            "sink_rate": np.where(valid, airspeeds * np.abs(np.sin(gammas)), np.nan),
+        }
+
+    def get_steady_flight_polar(self, airspeeds, throttle, alpha_init=None):
+        """
+        (Auxilary Function)
+        This function computes the steady (climbing or descending) flight states for a grid of
+        flight speeds at a fixed throttle setting. The angle of attack is found by vectorized
+        Newton iterations on the force balance
+            (T cos(alpha) - D)^2 + (L + T sin(alpha))^2 = (m * g)^2
+        the flight path angle follows from the direction of the resulting force.
+
+        :param airspeeds: numpy array of flight speeds
+        :param throttle: throttle setting
+        :param alpha_init: optional initial angles of attack, e.g. the solution at the
+            neighbouring flight speeds or of a similar airframe
+        :return: dictionary of numpy arrays with the flight speed, angle of attack, elevator
+            trim, flight path angle and sink rate, nan where the iterations did not converge
+        """
+        airspeeds = np.atleast_1d(np.asarray(airspeeds, dtype=float))
+        thrust = self.thrust(throttle)
+
+        def force_components(alpha):
+            trim = self.zero_moment_trim(alpha, throttle, airspeeds)
+            return (
+                thrust * np.cos(alpha) - self.drag(alpha, airspeeds),
+                self.lift(alpha, trim, airspeeds) + thrust * np.sin(alpha),
+            )
+
+        def residual(alpha):
+            return np.hypot(*force_components(alpha)) - self.mass * self.gravity
+
+        if alpha_init is None:
+            alpha_init = self.get_initial_alpha(airspeeds)
+        alphas, converged = newton_solve(residual, alpha_init)
+        if not np.all(converged):
+            logger.warning(
+                "Steady flight state at throttle %s did not converge for airspeeds %s",
+                throttle,
+                airspeeds[~converged],
+            )
+            alphas = np.where(converged, alphas, np.nan)
+        gammas = np.arctan2(*force_components(alphas))
+        return {
+            "airspeed": airspeeds,
+            "alpha": alphas,
+            "elevator_trim": self.zero_moment_trim(alphas, throttle, airspeeds),
+            "flight_path_angle": gammas,
+            "sink_rate": -airspeeds * np.sin(gammas),
+        }
+
+    def get_level_flight_polar(self, airspeeds, alpha_init=None):
+        """
+        (Auxilary Function)
+        This function computes the throttle setting, angle of attack (= pitch angle) and
+        elevator trim of steady level flight for a grid of flight speeds with vectorized Newton
+        iterations.
+
+        :param airspeeds: numpy array of flight speeds
+        :param alpha_init: optional initial angles of attack, e.g. the solution at the
+            neighbouring flight speeds or of a similar airframe
+        :return: dictionary of numpy arrays with the flight speed, angle of attack, throttle
+            setting and elevator trim, nan where the iterations did not converge
+        """
+        airspeeds = np.atleast_1d(np.asarray(airspeeds, dtype=float))
+
+        def throttle(alpha):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return self.drag(alpha, airspeeds) / (
+                    self.aero_params["puller_ct"] * np.cos(alpha)
+                )
+
+        def residual(alpha):
+            throttle_setting = throttle(alpha)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return (
+                    self.lift(
+                        alpha,
+                        self.zero_moment_trim(alpha, throttle_setting, airspeeds),
+                        airspeeds,
+                    )
+                    + self.thrust(throttle_setting) * np.sin(alpha)
+                    - self.gravity * self.mass
+                )
+
+        if alpha_init is None:
+            alpha_init = self.get_initial_alpha(airspeeds)
+        alphas, converged = newton_solve(residual, alpha_init)
+        if not np.all(converged):
+            logger.warning(
+                "Level flight state did not converge for airspeeds %s",
+                airspeeds[~converged],
+            )
+            alphas = np.where(converged, alphas, np.nan)
+        throttle_settings = throttle(alphas)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            elevator_trims = self.zero_moment_trim(alphas, throttle_settings, airspeeds)
+        return {
+            "airspeed": airspeeds,
+            "alpha": alphas,
+            "throttle": throttle_settings,
+            "elevator_trim": elevator_trims,
+        }
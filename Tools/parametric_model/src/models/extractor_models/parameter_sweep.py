@@ -0,0 +1,214 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Evaluation of an extractor model over a Cartesian grid of operating points (mass, air density
+and cruise speed), e.g. to generate PX4 trim tables across payloads and density altitudes.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools.logging_tools import log_section
+
+import concurrent.futures
+import copy
+import itertools
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+import yaml
+
+logger = logging.getLogger(__name__)
+
+OPERATING_POINT_COLUMNS = ["mass", "rho", "vcruise"]
+# valid is False if a parameter of the grid point was rejected by the extractor (no
+# converged or physical flight state), the rejected names are ";" separated
+VALIDITY_COLUMNS = ["valid", "invalid_params"]
+SWEEP_FILE_FORMATS = ["csv", "parquet"]
+
+
+def compute_operating_points(extractor, operating_points):
+    """
+    Extract the PX4 parameters at every operating point with one extractor.
+
+    :param extractor: extractor model, a copy is modified
+    :param operating_points: list of (mass, rho, vcruise) tuples, vcruise can be None
+    :return: list of dictionaries with the operating point, the PX4 parameters and their
+        validity
+    """
+    extractor = copy.deepcopy(extractor)
+    extractor.log_level = logging.DEBUG
+    rows = []
+    for mass, rho, vcruise in operating_points:
+        extractor.set_operating_point(mass=mass, rho=rho, vcruise=vcruise)
+        extractor.compute_px4_params()
+        row = {
+            "mass": extractor.mass,
+            "rho": extractor.rho,
+            "vcruise": extractor.px4_params["FW_AIRSPD_TRIM"],
+        }
+        row.update(extractor.get_px4_params())
+        row["valid"] = not extractor.invalid_params
+        row["invalid_params"] = ";".join(extractor.invalid_params)
+        rows.append(row)
+    return rows
+
+
+def sweep_px4_params(
+    extractor, masses=None, densities=None, cruise_speeds=None, n_workers=1
+):
+    """
+    Extract the PX4 parameters on the Cartesian grid of masses, air densities and cruise
+    speeds. The grid points are split into one contiguous chunk per worker process.
+
+    :param extractor: extractor model, e.g. FixedWingExtractorModel
+    :param masses: list of masses, defaults to the mass of the model config
+    :param densities: list of air densities, defaults to the density of the extractor
+    :param cruise_speeds: list of cruise speeds, defaults to the extractor config (vcruise or
+        the speed for maximum range)
+    :param n_workers: number of worker processes, 1 computes in the calling process
+    :return: pandas DataFrame with one row per grid point, see VALIDITY_COLUMNS for the
+        rejected parameters
+    """
+    operating_points = list(
+        itertools.product(
+            masses if masses else [extractor.mass],
+            densities if densities else [extractor.rho],
+            cruise_speeds if cruise_speeds else [None],
+        )
+    )
+    log_section(logger, "PX4 Parameter Sweep")
+    logger.info(
+        "Extracting the PX4 parameters at %d operating points", len(operating_points)
+    )
+    start_time = time.perf_counter()
+
+    n_workers = max(min(n_workers, len(operating_points)), 1)
+    if n_workers == 1:
+        rows = compute_operating_points(extractor, operating_points)
+    else:
+        chunks = [
+            list(chunk)
+            for chunk in np.array_split(np.arange(len(operating_points)), n_workers)
+        ]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(
+                    compute_operating_points,
+                    extractor,
+                    [operating_points[i] for i in chunk],
+                )
+                for chunk in chunks
+            ]
+            rows = [row for future in futures for row in future.result()]
+
+    sweep_df = pd.DataFrame(rows)
+    if not sweep_df["valid"].all():
+        logger.warning(
+            "%d of %d operating points have rejected parameters (set to nan)",
+            (~sweep_df["valid"]).sum(),
+            len(rows),
+        )
+    logger.info(
+        "PX4 parameter sweep finished",
+        extra={
+            "data": {
+                "operating points": len(rows),
+                "workers": n_workers,
+                "elapsed_s": time.perf_counter() - start_time,
+            }
+        },
+    )
+    return sweep_df
+
+
+def save_sweep_results(
+    sweep_df, output_folder, model_name, file_format="csv", save_point_yamls=True
+):
+    """
+    Save the sweep table and optionally one PX4 parameter yaml file per valid grid point into
+    output_folder/<model_name>_px4_sweep_<time>/. Grid points with rejected parameters are
+    only kept in the table.
+
+    :param sweep_df: pandas DataFrame returned by sweep_px4_params
+    :param file_format: csv | parquet (requires pyarrow or fastparquet)
+    :return: path of the sweep folder
+    """
+    if file_format not in SWEEP_FILE_FORMATS:
+        raise ValueError(
+            "Unknown sweep file format {0}, use one of {1}".format(
+                file_format, SWEEP_FILE_FORMATS
+            )
+        )
+    timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+    sweep_folder = os.path.join(output_folder, model_name + "_px4_sweep_" + timestr)
+    os.makedirs(sweep_folder, exist_ok=True)
+
+    table_path = os.path.join(sweep_folder, "px4_params." + file_format)
+    if file_format == "csv":
+        sweep_df.to_csv(table_path, index=False)
+    else:
+        sweep_df.to_parquet(table_path, index=False)
+
+    if save_point_yamls:
+        param_columns = [
+            c
+            for c in sweep_df.columns
+            if c not in OPERATING_POINT_COLUMNS + VALIDITY_COLUMNS
+        ]
+        for row in sweep_df.to_dict("records"):
+            if not row["valid"]:
+                logger.warning(
+                    "No PX4 parameter file saved for mass %g, rho %g, vcruise %g, "
+                    "rejected parameters: %s",
+                    row["mass"],
+                    row["rho"],
+                    row["vcruise"],
+                    row["invalid_params"],
+                )
+                continue
+            file_name = "px4_params_m{0:g}_rho{1:g}_v{2:g}.yaml".format(
+                row["mass"], row["rho"], row["vcruise"]
+            )
+            with open(os.path.join(sweep_folder, file_name), "w") as outfile:
+                yaml.dump(
+                    {column: float(row[column]) for column in param_columns},
+                    outfile,
+                    default_flow_style=False,
+                )
+
+    logger.info(
+        "PX4 parameter sweep saved to: %s", table_path, extra={"file_path": table_path}
+    )
+    return sweep_folder
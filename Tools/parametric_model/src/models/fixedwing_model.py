@@ -42,7 +42,6 @@ import numpy as np
 from . import aerodynamic_models
 from .dynamics_model import DynamicsModel
 from .model_config import ModelConfig
-from matplotlib import pyplot as plt
 from scipy.spatial.transform import Rotation
 
 
@@ -79,6 +78,10 @@ class FixedWingModel(DynamicsModel):
             )
             raise AttributeError(error_str)
 
+    def get_required_columns(self):
+        # elevator input of the aerodynamics model
+        return super(FixedWingModel, self).get_required_columns() + ["elevator"]
+
     def prepare_force_regression_matrices(self):
         accel_mat = self.data_df[["acc_b_x", "acc_b_y", "acc_b_z"]].to_numpy()
         force_mat = accel_mat * self.mass
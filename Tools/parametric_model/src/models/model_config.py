@@ -38,8 +38,11 @@ __license__ = "BSD 3"
 
 import os
 import yaml
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 class ModelConfig:
     def __init__(self, config_file_name):
@@ -56,8 +59,10 @@ class ModelConfig:
                 assert type(config_dict) is dict
 
         except:
-            print("Could not load yaml config file. Does the specified file exist?")
-            print(log_file_path)
+            logger.error(
+                "Could not load yaml config file %s. Does the specified file exist?",
+                log_file_path,
+            )
             exit(1)
 
         self.model_name = config_dict["model_name"]
@@ -74,7 +79,7 @@ class ModelConfig:
         self.extractor_class = config_dict["extractor_class"]
         self.extractor_config = config_dict["extractor_config"]
 
-        print("Initializing of configuration successful. ")
+        logger.debug("Initializing of configuration successful.")
 
         return
 
@@ -125,8 +130,8 @@ class ModelConfig:
         ), "required_ulog_topics does not contain a dict of topic types"
         for topic_type in data_dict["required_ulog_topics"]:
             topic_type_dict = data_dict["required_ulog_topics"][topic_type]
-            assert "ulog_name" in topic_type_dict, print(
-                topic_type, " does not contain an entry for ulog_name"
+            assert "ulog_name" in topic_type_dict, (
+                topic_type + " does not contain an entry for ulog_name"
             )
         return
 
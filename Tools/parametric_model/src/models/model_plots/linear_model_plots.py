@@ -46,7 +46,11 @@ import matplotlib.pyplot as plt
 def plot_covariance_mat(X, coef_name_list):
     X = np.array(X)
     df = pd.DataFrame(X, columns=coef_name_list)
-    corrMatrix = df.corr()
+    plot_correlation_mat(df.corr(), coef_name_list)
+
+
+def plot_correlation_mat(corr_mat, coef_name_list):
+    corrMatrix = pd.DataFrame(corr_mat, index=coef_name_list, columns=coef_name_list)
     fig, ax = plt.subplots(1)
     ax = sns.heatmap(corrMatrix, annot=False)
     ax.set_title("Coefficient covariance")
@@ -97,7 +97,6 @@ def plot_rotor_trust_3d(rotor_coef_dict, rotor):
     #         (1, v_air_par_vec.shape[0])) * f_trust_zero_airspeed - v_air_par_vec * rotor.air_density * rotor.prop_diameter**3 * \
     #         u_vec[i]**2 * rotor_coef_dict["rot_thrust_lin"]
 
-    print(f_thrust_mat.shape)
     ax = plt.axes(projection="3d")
     ax.plot_surface(
         u_vec,
@@ -54,14 +54,12 @@ __author__ = "Manuel Yves Galliker"
 __maintainer__ = "Manuel Yves Galliker"
 __license__ = "BSD 3"
 
-from sklearn.linear_model import LinearRegression
 from .dynamics_model import DynamicsModel
 from .rotor_models import RotorModel
 from .aerodynamic_models import FuselageDragModel
 from .model_config import ModelConfig
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import math
 
 
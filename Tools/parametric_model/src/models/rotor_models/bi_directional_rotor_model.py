@@ -39,9 +39,11 @@ __license__ = "BSD 3"
 import numpy as np
 import pandas as pd
 import math
-from progress.bar import Bar
+import logging
 from . import ChangingAxisRotorModel
 
+logger = logging.getLogger(__name__)
+
 
 class BiDirectionalRotorModel(ChangingAxisRotorModel):
     def __init__(
@@ -52,19 +54,23 @@ class BiDirectionalRotorModel(ChangingAxisRotorModel):
         air_density=1.225,
         angular_vel_mat=None,
     ):
-        print(rotor_config_dict)
+        logger.debug("Rotor configuration: %s", rotor_config_dict)
         self.n_timestamps = actuator_input_vec.shape[0]
         self.rotor_axis = np.array(rotor_config_dict["rotor_axis"]).reshape(3, 1)
         self.compute_rotor_axis_mat(actuator_input_vec)
-        super(BiDirectionalRotorModel, self).__init__(
+        # the rotor axis depends on the actuator input, RotorModel is initialized directly
+        super(ChangingAxisRotorModel, self).__init__(
             rotor_config_dict,
             np.absolute(actuator_input_vec),
             v_airspeed_mat,
             air_density=1.225,
             angular_vel_mat=None,
+            rotor_axis_mat=self.rotor_axis_mat,
         )
 
     def compute_rotor_axis_mat(self, actuator_input_vec):
         self.rotor_axis_mat = np.zeros((self.n_timestamps, 3))
         for i in range(self.n_timestamps):
-            self.rotor_axis_mat[i, :] = self.rotor_axis * np.sign(actuator_input_vec[i])
+            self.rotor_axis_mat[i, :] = self.rotor_axis.flatten() * np.sign(
+                actuator_input_vec[i]
+            )
@@ -40,7 +40,6 @@ from . import RotorModel
 import numpy as np
 import pandas as pd
 import math
-from progress.bar import Bar
 from . import RotorModel
 
 """
@@ -37,6 +37,9 @@ __maintainer__ = "Julius Schlapbach"
 __license__ = "BSD 3"
 
 import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class LinearRotorModel:
@@ -50,7 +53,7 @@ class LinearRotorModel:
         self.throttle = actuator_input_vec
 
     def compute_actuator_force_matrix(self):
-        print("Computing force features for rotor")
+        logger.debug("Computing force features for rotor")
         coef_dict = {
             "ct": {"lin": {"x": "ct_x", "y": "ct_y", "z": "ct_z"}},
         }
@@ -62,7 +65,7 @@ class LinearRotorModel:
         return X_forces, coef_dict, col_names
 
     def compute_actuator_moment_matrix(self):
-        print("Computing moment features for rotor")
+        logger.debug("Computing moment features for rotor")
 
         coef_dict = {
             "cmt": {"rot": {"x": "cmt_x", "y": "cmt_y", "z": "cmt_z"}},
@@ -39,9 +39,11 @@ __license__ = "BSD 3"
 import numpy as np
 import pandas as pd
 import math
-from progress.bar import Bar
+import logging
 import copy
 
+logger = logging.getLogger(__name__)
+
 
 class RotorModel:
     def __init__(
@@ -88,48 +90,31 @@ class RotorModel:
         # adjust airspeed with angular acceleration is angular_vel_mat is passed as argument
 
         if angular_vel_mat is not None:
-            self.local_airspeed_mat = np.zeros(v_airspeed_mat.shape)
             assert (
                 v_airspeed_mat.shape == angular_vel_mat.shape
             ), "RotorModel: v_airspeed_mat and angular_vel_mat differ in size."
-            for i in range(self.n_timestamps):
-                self.local_airspeed_mat[i, :] = v_airspeed_mat[i, :] + np.cross(
-                    angular_vel_mat[i, :], self.rotor_position.flatten()
-                )
+            self.local_airspeed_mat = v_airspeed_mat + np.cross(
+                angular_vel_mat, self.rotor_position.flatten()
+            )
 
         else:
             self.local_airspeed_mat = v_airspeed_mat
 
-        self.v_airspeed_parallel_to_rotor_axis = np.zeros(v_airspeed_mat.shape)
-        self.v_air_parallel_abs = np.zeros(v_airspeed_mat.shape[0])
-        self.v_airspeed_perpendicular_to_rotor_axis = np.zeros(v_airspeed_mat.shape)
-
         # if the rotor axis changes direction and rotor_axis_mat is specified
         if rotor_axis_mat is not None:
-            for i in range(self.n_timestamps):
-                v_local_airspeed = self.local_airspeed_mat[i, :]
-                self.v_airspeed_parallel_to_rotor_axis[i, :] = (
-                    np.vdot(rotor_axis_mat[i, :], v_local_airspeed)
-                    * rotor_axis_mat[i, :]
-                ).flatten()
-                self.v_air_parallel_abs[i] = np.linalg.norm(
-                    self.v_airspeed_parallel_to_rotor_axis[i, :]
-                )
-                self.v_airspeed_perpendicular_to_rotor_axis[i, :] = (
-                    v_local_airspeed - self.v_airspeed_parallel_to_rotor_axis[i, :]
-                )
+            rotor_axis_mat = np.asarray(rotor_axis_mat).reshape((-1, 3))
         else:
-            for i in range(self.n_timestamps):
-                v_local_airspeed = self.local_airspeed_mat[i, :]
-                self.v_airspeed_parallel_to_rotor_axis[i, :] = (
-                    np.vdot(self.rotor_axis, v_local_airspeed) * self.rotor_axis
-                ).flatten()
-                self.v_air_parallel_abs[i] = np.linalg.norm(
-                    self.v_airspeed_parallel_to_rotor_axis[i, :]
-                )
-                self.v_airspeed_perpendicular_to_rotor_axis[i, :] = (
-                    v_local_airspeed - self.v_airspeed_parallel_to_rotor_axis[i, :]
-                )
+            rotor_axis_mat = self.rotor_axis.reshape((1, 3))
+        self.v_airspeed_parallel_to_rotor_axis = (
+            np.sum(rotor_axis_mat * self.local_airspeed_mat, axis=1, keepdims=True)
+            * rotor_axis_mat
+        )
+        self.v_air_parallel_abs = np.linalg.norm(
+            self.v_airspeed_parallel_to_rotor_axis, axis=1
+        )
+        self.v_airspeed_perpendicular_to_rotor_axis = (
+            self.local_airspeed_mat - self.v_airspeed_parallel_to_rotor_axis
+        )
 
     def compute_actuator_force_features(self, index, rotor_axis=None):
         """compute thrust model using a 2nd degree model of the normalized actuator outputs
@@ -231,7 +216,7 @@ class RotorModel:
         return X_moments
 
     def compute_actuator_force_matrix(self):
-        print("Computing force features for rotor:", self.rotor_name)
+        logger.debug("Computing force features for rotor: %s", self.rotor_name)
         c = self.air_density * self.prop_diameter**3
         X_drag = -(
             np.array(self.v_airspeed_perpendicular_to_rotor_axis).T
@@ -302,9 +287,12 @@ class RotorModel:
         return self.X_forces, coef_dict, col_names
 
     def compute_actuator_moment_matrix(self):
-        print("Computing moment features for rotor:", self.rotor_name)
+        logger.debug("Computing moment features for rotor: %s", self.rotor_name)
         if hasattr(self, "rotor_axis_mat"):
-            leaver_moment_vec = 0
+            # the leaver arm changes with the rotor axis of every timestamp
+            leaver_moment_vec = np.cross(
+                self.rotor_position.flatten(), self.rotor_axis_mat
+            ).T
         else:
             leaver_moment_vec = np.cross(
                 self.rotor_position.flatten(), self.rotor_axis.flatten()
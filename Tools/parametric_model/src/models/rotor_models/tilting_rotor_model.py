@@ -40,7 +40,6 @@ from . import ChangingAxisRotorModel
 import numpy as np
 import pandas as pd
 import math
-from progress.bar import Bar
 from . import RotorModel
 from scipy.spatial.transform import Rotation
 
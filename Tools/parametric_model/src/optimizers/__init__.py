@@ -1,3 +1,4 @@
 from .optimizer_base_template import OptimizerBaseTemplate
 from .linear_regressor import LinearRegressor
 from .qp_optimizer import QPOptimizer
+from .robust_regressor import RobustRegressor
@@ -37,15 +37,19 @@ __maintainer__ = "Manuel Yves Galliker"
 __license__ = "BSD 3"
 
 from src.optimizers import OptimizerBaseTemplate
-from sklearn.linear_model import LinearRegression
 from src.tools import math_tools
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class LinearRegressor(OptimizerBaseTemplate):
     def __init__(self, optimizer_config, param_name_list):
         super(LinearRegressor, self).__init__(optimizer_config, param_name_list)
-        print("Define and solve problem:")
-        print("min_c (X * c -y)^T * (X * c -y)")
+        logger.info("Define and solve problem: min_c (X * c -y)^T * (X * c -y)")
+        # sklearn is slow to import, only load it when the optimizer is used
+        from sklearn.linear_model import LinearRegression
+
         self.reg = LinearRegression(fit_intercept=False)
 
     def estimate_parameters(self, X, y):
@@ -81,6 +81,49 @@ class OptimizerBaseTemplate(ABC):
                 )
         return
 
+    def solve_gram(self, gram, moment):
+        """
+        Solve the least squares problem min_c (X * c -y)^T * (X * c -y) given only
+        its normal equations X^T X * c = X^T y. Optimizers with constraints on the
+        coefficients override this method.
+
+        Inputs:
+        gram: X^T X, numpy array of shape (n, n)
+        moment: X^T y, numpy array of shape (n,)
+        """
+        c_opt, _, _, _ = np.linalg.lstsq(gram, moment, rcond=None)
+        return c_opt
+
+    def solve_regularization_path(
+        self, gram, moment, ridge_list, bound_scale_list=(1.0,)
+    ):
+        """
+        Solve the ridge regularized problem
+
+        min_c (X * c -y)^T * (X * c -y) + ridge * mean(diag(X^T X)) * c^T * c
+
+        for every grid point of ridge_list x bound_scale_list. The Gram matrix is
+        factorized once and reused for the whole path. Without coefficient bounds the
+        bound scaling has no effect.
+
+        Returns:
+        grid_list: list of (ridge, bound_scale) tuples
+        c_mat: numpy array of shape (len(grid_list), n) with the coefficients per grid point
+        """
+        eig_vals, eig_vecs = np.linalg.eigh(gram)
+        ridge_scale = np.trace(gram) / gram.shape[0]
+        projected_moment = eig_vecs.T @ moment
+        grid_list = []
+        c_list = []
+        for ridge in ridge_list:
+            c_ridge = ridge_solution(
+                eig_vals, eig_vecs, projected_moment, ridge * ridge_scale
+            )
+            for bound_scale in bound_scale_list:
+                grid_list.append((ridge, bound_scale))
+                c_list.append(c_ridge)
+        return grid_list, np.array(c_list)
+
     @abstractmethod
     def estimate_parameters(self) -> None:
         pass
@@ -100,3 +143,17 @@ class OptimizerBaseTemplate(ABC):
     @abstractmethod
     def compute_optimization_metrics(self) -> Dict:
         pass
+
+
+def ridge_solution(eig_vals, eig_vecs, projected_moment, ridge):
+    """
+    Closed form solution of (X^T X + ridge * I) * c = X^T y given the eigen decomposition
+    X^T X = V * diag(w) * V^T and the projected moment V^T * X^T y. Directions with a
+    vanishing eigenvalue are dropped (minimum norm solution).
+    """
+    shifted_eig_vals = eig_vals + ridge
+    tolerance = np.finfo(float).eps * max(np.max(np.abs(eig_vals)), 1.0) * len(eig_vals)
+    inverse = np.zeros_like(shifted_eig_vals)
+    valid = shifted_eig_vals > tolerance
+    inverse[valid] = 1.0 / shifted_eig_vals[valid]
+    return eig_vecs @ (inverse * projected_moment)
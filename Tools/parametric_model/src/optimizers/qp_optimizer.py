@@ -37,22 +37,27 @@ __maintainer__ = "Manuel Yves Galliker"
 __license__ = "BSD 3"
 
 from src.optimizers import OptimizerBaseTemplate
-import cvxpy
+from src.optimizers.optimizer_base_template import ridge_solution
 import numpy as np
 import pandas as pd
 import warnings
+import logging
 from src.tools import math_tools
-from sklearn.metrics import r2_score
+
+logger = logging.getLogger(__name__)
 
 
 class QPOptimizer(OptimizerBaseTemplate):
     def __init__(self, optimizer_config, param_name_list, verbose=False):
         super(QPOptimizer, self).__init__(optimizer_config, param_name_list)
-        print("Define and solve problem:")
-        print("min_c (X * c -y)^T * (X * c -y)")
-        print(" s.t. G * c <= h")
-        print("Initialized with the following coefficients: ")
-        print(param_name_list)
+        logger.info(
+            "Define and solve problem: min_c (X * c -y)^T * (X * c -y) s.t. G * c <= h"
+        )
+        logger.debug(
+            "Initialized with the following coefficients: %s",
+            param_name_list,
+            extra={"coefficients": list(param_name_list)},
+        )
         self.verbose = verbose
         self.n = len(param_name_list)
         self.param_name_list = param_name_list
@@ -83,10 +88,9 @@ class QPOptimizer(OptimizerBaseTemplate):
             try:
                 current_bnd_tuple = param_bounds[current_param]
             except IndexError:
-                print(
-                    "Can not find bounds for parameter "
-                    + current_param
-                    + " in config file."
+                logger.error(
+                    "Can not find bounds for parameter %s in config file.",
+                    current_param,
                 )
             if current_bnd_tuple[0] == current_bnd_tuple[1]:
                 self.fixed_coef_index_list.append(i)
@@ -106,27 +110,26 @@ class QPOptimizer(OptimizerBaseTemplate):
             reversed_index = self.n_fixed_coef - i - 1
             self.G = np.delete(self.G, self.fixed_coef_index_list[reversed_index], 1)
 
-        print("Fixed Coefficients: Value")
-        for fixed_coef in self.fixed_coef_list:
-            print(fixed_coef + ": ", param_bounds[fixed_coef][0])
-        print(
-            "-------------------------------------------------------------------------------"
+        logger.debug(
+            "Fixed coefficients",
+            extra={
+                "data": {
+                    fixed_coef: param_bounds[fixed_coef][0]
+                    for fixed_coef in self.fixed_coef_list
+                }
+            },
+        )
+        logger.debug(
+            "Bounded coefficients (min value, max value)",
+            extra={
+                "data": {
+                    opt_coef: list(param_bounds[opt_coef])
+                    for opt_coef in self.optimization_coef_list
+                }
+            },
         )
-        print("Bounded Coefficients: (Min Value, Max Value)")
-        for opt_coef in self.optimization_coef_list:
-            print(opt_coef + ": ", param_bounds[opt_coef])
         if self.verbose:
-            print(
-                "-------------------------------------------------------------------------------"
-            )
-            print(
-                "                           Constraints matrices                                "
-            )
-            print(
-                "-------------------------------------------------------------------------------"
-            )
-            print(self.G)
-            print(self.h)
+            logger.info("Constraints matrices:\nG =\n%s\nh =\n%s", self.G, self.h)
 
     def index_row(self, i):
         index_row = np.zeros(self.n)
@@ -138,10 +141,6 @@ class QPOptimizer(OptimizerBaseTemplate):
         for i in range(self.n_fixed_coef):
             reversed_index = self.n_fixed_coef - i - 1
             coef_index = self.fixed_coef_index_list[reversed_index]
-            print(self.fixed_coef_index_list)
-            print(coef_index)
-            print(self.n)
-            print(X.shape)
             y = (
                 y
                 - (
@@ -152,7 +151,6 @@ class QPOptimizer(OptimizerBaseTemplate):
         return X, y
 
     def insert_fixed_coefs(self, c_opt):
-        print(c_opt)
         c_opt = list(c_opt)
         for i in range(len(self.fixed_coef_index_list)):
             c_opt.insert(self.fixed_coef_index_list[i], self.fixed_coef_value_list[i])
@@ -171,6 +169,8 @@ class QPOptimizer(OptimizerBaseTemplate):
         self.check_features()
         self.X_reduced, self.y_reduced = self.remove_fixed_coef_features(X, y)
         self.y = y
+        import cvxpy
+
         c = cvxpy.Variable(self.n_opt_coef)
         cost = cvxpy.sum_squares(self.X_reduced @ c - self.y_reduced)
         self.prob = cvxpy.Problem(cvxpy.Minimize(cost), [self.G @ c <= self.h])
@@ -178,6 +178,110 @@ class QPOptimizer(OptimizerBaseTemplate):
         self.c_opt = np.array(self.insert_fixed_coefs(c.value)).reshape((self.n, 1))
         self.estimation_completed = True
 
+    def solve_gram(self, gram, moment):
+        """
+        Solve the bound constrained problem from its normal equations only.
+
+        min_c c^T * X^T X * c - 2 * (X^T y)^T * c
+        s.t. G * c <= h
+        """
+        if "parameter_bounds" not in self.config:
+            return super(QPOptimizer, self).solve_gram(gram, moment)
+        _, c_mat = self.solve_regularization_path(gram, moment, [0.0], [1.0])
+        if np.any(np.isnan(c_mat[0, :])):
+            raise RuntimeError("Bound constrained least squares problem not solved")
+        return c_mat[0, :]
+
+    def reduce_normal_equations(self, gram, moment):
+        """
+        Remove the fixed coefficients from the normal equations. Their contribution is
+        moved to the right hand side the same way as remove_fixed_coef_features does
+        for the full regression matrix.
+        """
+        free_index_list = [
+            i for i in range(self.n) if i not in self.fixed_coef_index_list
+        ]
+        c_fixed = np.array(self.fixed_coef_value_list, dtype=float)
+        gram_reduced = gram[np.ix_(free_index_list, free_index_list)]
+        moment_reduced = moment[free_index_list] - (
+            gram[np.ix_(free_index_list, self.fixed_coef_index_list)] @ c_fixed
+        )
+        return gram_reduced, moment_reduced
+
+    def solve_regularization_path(
+        self, gram, moment, ridge_list, bound_scale_list=(1.0,)
+    ):
+        """
+        Solve the bound constrained ridge problem along a grid of ridge penalties and
+        bound scalings.
+
+        min_c c^T * (X^T X + ridge * mean(diag(X^T X)) * I) * c - 2 * (X^T y)^T * c
+        s.t. G * c <= bound_scale * h
+
+        The Gram matrix is factorized once and the parametrized problem is compiled once,
+        every grid point is then warm started from the previous solution. If the
+        closed form ridge solution already satisfies the scaled bounds it is used
+        directly and the QP is skipped. Fixed coefficients are not affected by the bound
+        scaling. Grid points whose QP is not solved (e.g. infeasible scaled bounds) get a
+        row of nan and a warning.
+
+        Returns:
+        grid_list: list of (ridge, bound_scale) tuples
+        c_mat: numpy array of shape (len(grid_list), n) with the coefficients per grid point
+        """
+        if "parameter_bounds" not in self.config:
+            return super(QPOptimizer, self).solve_regularization_path(
+                gram, moment, ridge_list, bound_scale_list
+            )
+
+        gram_reduced, moment_reduced = self.reduce_normal_equations(gram, moment)
+        eig_vals, eig_vecs = np.linalg.eigh(gram_reduced)
+        eig_vals = np.clip(eig_vals, 0.0, None)
+        ridge_scale = np.trace(gram_reduced) / max(self.n_opt_coef, 1)
+        projected_moment = eig_vecs.T @ moment_reduced
+
+        # Factorize X^T X = R^T R to keep the problem in the sum of squares form
+        R = np.sqrt(eig_vals)[:, np.newaxis] * eig_vecs.T
+        import cvxpy
+
+        c = cvxpy.Variable(self.n_opt_coef)
+        ridge_param = cvxpy.Parameter(nonneg=True)
+        h_param = cvxpy.Parameter(self.h.shape[0])
+        cost = (
+            cvxpy.sum_squares(R @ c)
+            - 2 * moment_reduced @ c
+            + ridge_param * cvxpy.sum_squares(c)
+        )
+        prob = cvxpy.Problem(cvxpy.Minimize(cost), [self.G @ c <= h_param])
+
+        grid_list = []
+        c_list = []
+        for ridge in ridge_list:
+            c_ridge = ridge_solution(
+                eig_vals, eig_vecs, projected_moment, ridge * ridge_scale
+            )
+            for bound_scale in bound_scale_list:
+                h_scaled = bound_scale * self.h
+                grid_list.append((ridge, bound_scale))
+                if np.all(self.G @ c_ridge <= h_scaled + 1e-12 * np.abs(h_scaled)):
+                    c_list.append(self.insert_fixed_coefs(c_ridge))
+                    continue
+                ridge_param.value = ridge * ridge_scale
+                h_param.value = h_scaled
+                prob.solve(warm_start=True, verbose=self.verbose)
+                if prob.status in cvxpy.settings.SOLUTION_PRESENT:
+                    c_list.append(self.insert_fixed_coefs(c.value))
+                else:
+                    warnings.warn(
+                        "QP not solved for ridge {0} and bound scale {1} (status: "
+                        "{2}), the coefficients are nan".format(
+                            ridge, bound_scale, prob.status
+                        ),
+                        RuntimeWarning,
+                    )
+                    c_list.append(np.full(self.n, np.nan))
+        return grid_list, np.array(c_list, dtype=float)
+
     def set_optimal_coefficients(self, c_opt, X, y):
         self.X = X
         self.y = y
@@ -186,7 +290,7 @@ class QPOptimizer(OptimizerBaseTemplate):
 
     def get_optimization_parameters(self):
         self.check_estimation_completed()
-        return list(self.c_opt)
+        return list(self.c_opt.flatten())
 
     def predict(self, X_pred):
         self.check_estimation_completed()
@@ -198,7 +302,7 @@ class QPOptimizer(OptimizerBaseTemplate):
         y_pred = self.predict(self.X)
         metrics_dict = {
             "RMSE": math_tools.rmse_between_numpy_arrays(y_pred, self.y),
-            "R2": float(r2_score(self.y, y_pred)),
+            "R2": math_tools.r2_between_numpy_arrays(y_pred, self.y),
         }
         if self.verbose:
             metrics_dict["Dual Variables"] = (
@@ -0,0 +1,284 @@
+"""
+ *
+ * Copyright (c) 2021 Manuel Yves Galliker
+ *               2021 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Robust linear regression by iteratively reweighted least squares (IRLS).
+"""
+
+__author__ = "Manuel Yves Galliker"
+__maintainer__ = "Manuel Yves Galliker"
+__license__ = "BSD 3"
+
+from src.optimizers import OptimizerBaseTemplate, QPOptimizer
+from src.optimizers.optimizer_base_template import ridge_solution
+from src.tools import math_tools
+import numpy as np
+import warnings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# tuning constants for 95% efficiency at Gaussian noise
+DEFAULT_THRESHOLDS = {"huber": 1.345, "tukey": 4.685, "squared": np.inf}
+# consistent estimate of the standard deviation from the median absolute deviation
+MAD_SCALE = 1.4826
+
+
+def huber_weights(u):
+    abs_u = np.abs(u)
+    return np.where(abs_u <= 1.0, 1.0, 1.0 / np.maximum(abs_u, 1.0))
+
+
+def tukey_weights(u):
+    return np.where(np.abs(u) < 1.0, (1.0 - u**2) ** 2, 0.0)
+
+
+def squared_weights(u):
+    return np.ones_like(u)
+
+
+LOSS_WEIGHTS = {
+    "huber": huber_weights,
+    "tukey": tukey_weights,
+    "squared": squared_weights,
+}
+
+
+def warn_least_squares_loss():
+    warnings.warn(
+        "RobustRegressor solves normal equations without the regression rows, the "
+        "robust loss and the sample weights are not applied",
+        RuntimeWarning,
+    )
+
+
+class RobustRegressor(QPOptimizer):
+    """
+    Minimize sum_i s_i * rho((X_i * c - y_i) / (k * sigma_g(i))) subject to the parameter
+    bounds of the QPOptimizer (optional for this optimizer), where s_i are optional sample
+    weights, rho the Huber or Tukey loss with threshold k and sigma_g the residual scale
+    of the measurement axis of sample i, estimated by the median absolute deviation.
+
+    Every IRLS iteration solves a weighted least squares problem from its normal
+    equations (X^T W X + A) * c = X^T W y + b, where the optional terms A and b hold a
+    prior (e.g. a Gaussian prior or the normal equations of previous logs) that is not
+    reweighted. The bounded problem is compiled once with the factor of the Gram matrix
+    as parameter and warm started in every iteration, it is only solved if the
+    unconstrained solution violates the bounds.
+
+    The robust loss needs the regression rows, solve_gram and solve_regularization_path
+    only get the normal equations and fall back to the least squares loss with a warning.
+
+    Config (optimizer_config/robust_regression, all optional):
+    loss: "huber" (default), "tukey" or "squared" (weighted least squares)
+    threshold: k in units of the residual scale
+    max_iterations: maximum number of reweighting iterations (default 50)
+    tolerance: relative change of the coefficients for convergence (default 1e-6)
+    """
+
+    def __init__(self, optimizer_config, param_name_list, verbose=False):
+        with warnings.catch_warnings():
+            # bounds are optional for the robust regression
+            warnings.simplefilter("ignore")
+            super(RobustRegressor, self).__init__(
+                optimizer_config, param_name_list, verbose=verbose
+            )
+        robust_config = self.config.get("robust_regression", None) or {}
+        self.loss = robust_config.get("loss", "huber")
+        assert self.loss in LOSS_WEIGHTS, "Unknown loss: {0}, valid losses: {1}".format(
+            self.loss, list(LOSS_WEIGHTS)
+        )
+        self.threshold = float(
+            robust_config.get("threshold", DEFAULT_THRESHOLDS[self.loss])
+        )
+        self.max_iterations = int(robust_config.get("max_iterations", 50))
+        self.tolerance = float(robust_config.get("tolerance", 1e-6))
+        self.prob = None
+        logger.info(
+            "Iteratively reweighted least squares with %s loss (threshold %.3f)",
+            self.loss,
+            self.threshold,
+        )
+
+    def estimate_parameters(
+        self,
+        X,
+        y,
+        sample_weights=None,
+        group_ids=None,
+        prior_gram=None,
+        prior_moment=None,
+    ):
+        """
+        Inputs:
+        X: regression matrix of shape (n, p)
+        y: measurements of shape (n,)
+        sample_weights: optional non negative weights of shape (n,), e.g. from the Fisher
+            information or the quality of a flight segment
+        group_ids: optional group index of shape (n,), the residual scale is estimated
+            per group (e.g. per measurement axis, since forces and moments have
+            different units)
+        prior_gram: optional term of shape (p, p) added to the Gram matrix X^T W X
+        prior_moment: optional term of shape (p,) added to the moment vector X^T W y
+        """
+        self.X = X
+        self.y = np.asarray(y, dtype=float).flatten()
+        self.check_features()
+        n_rows = self.y.shape[0]
+        self.sample_weights = (
+            np.ones(n_rows)
+            if sample_weights is None
+            else np.asarray(sample_weights, dtype=float).flatten()
+        )
+        assert self.sample_weights.shape[0] == n_rows, "One weight per sample required"
+        assert np.all(self.sample_weights >= 0.0), "Sample weights must not be negative"
+        group_ids = np.zeros(n_rows, dtype=int) if group_ids is None else group_ids
+        self.prior_gram = (
+            np.zeros((self.n, self.n)) if prior_gram is None else np.asarray(prior_gram)
+        )
+        self.prior_moment = (
+            np.zeros(self.n) if prior_moment is None else np.asarray(prior_moment)
+        )
+        group_masks = [group_ids == group for group in np.unique(group_ids)]
+
+        weights = self.sample_weights
+        c_opt = self.solve_weighted(weights)
+        self.n_iterations = 0
+        self.converged = self.loss == "squared"
+        while not self.converged and self.n_iterations < self.max_iterations:
+            u = self.compute_scaled_residuals(c_opt, group_masks)
+            weights = self.sample_weights * LOSS_WEIGHTS[self.loss](u)
+            c_new = self.solve_weighted(weights)
+            self.n_iterations += 1
+            self.converged = np.linalg.norm(c_new - c_opt) <= self.tolerance * (
+                np.linalg.norm(c_opt) + self.tolerance
+            )
+            c_opt = c_new
+        if not self.converged:
+            warnings.warn(
+                "Robust regression did not converge within {0} iterations".format(
+                    self.max_iterations
+                ),
+                RuntimeWarning,
+            )
+
+        self.weights = weights
+        self.downweighted_ratio = float(
+            np.mean(np.abs(self.compute_scaled_residuals(c_opt, group_masks)) > 1.0)
+        )
+        self.c_opt = c_opt.reshape((self.n, 1))
+        self.estimation_completed = True
+
+    def compute_scaled_residuals(self, c, group_masks):
+        """Residuals in units of threshold * residual scale of their group."""
+        residuals = self.X @ c - self.y
+        u = np.zeros_like(residuals)
+        for mask in group_masks:
+            mask_residuals = residuals[mask & (self.sample_weights > 0.0)]
+            if mask_residuals.shape[0] == 0:
+                continue
+            scale = MAD_SCALE * np.median(
+                np.abs(mask_residuals - np.median(mask_residuals))
+            )
+            # exact fit of the group, nothing to reweight
+            if scale > 0.0:
+                u[mask] = residuals[mask] / (self.threshold * scale)
+        return u
+
+    def solve_weighted(self, weights):
+        """Solve the bounded weighted least squares problem with weights W."""
+        gram = self.X.T @ (weights[:, np.newaxis] * self.X) + self.prior_gram
+        moment = self.X.T @ (weights * self.y) + self.prior_moment
+        if "parameter_bounds" not in self.config:
+            return OptimizerBaseTemplate.solve_gram(self, gram, moment)
+
+        gram_reduced, moment_reduced = self.reduce_normal_equations(gram, moment)
+        eig_vals, eig_vecs = np.linalg.eigh(gram_reduced)
+        eig_vals = np.clip(eig_vals, 0.0, None)
+        c_reduced = ridge_solution(eig_vals, eig_vecs, eig_vecs.T @ moment_reduced, 0.0)
+        if not np.all(self.G @ c_reduced <= self.h + 1e-12 * np.abs(self.h)):
+            import cvxpy
+
+            if self.prob is None:
+                self.compile_problem()
+            # X^T W X = R^T R keeps the problem in the sum of squares form
+            self.R_param.value = np.sqrt(eig_vals)[:, np.newaxis] * eig_vecs.T
+            self.moment_param.value = moment_reduced
+            self.prob.solve(warm_start=True, verbose=self.verbose)
+            if self.prob.status not in cvxpy.settings.SOLUTION_PRESENT:
+                raise RuntimeError(
+                    "Bounded weighted least squares problem not solved (status: "
+                    "{0})".format(self.prob.status)
+                )
+            c_reduced = self.c_var.value
+        return np.array(self.insert_fixed_coefs(c_reduced), dtype=float)
+
+    def solve_gram(self, gram, moment):
+        warn_least_squares_loss()
+        if "parameter_bounds" not in self.config:
+            return OptimizerBaseTemplate.solve_gram(self, gram, moment)
+        _, c_mat = QPOptimizer.solve_regularization_path(
+            self, gram, moment, [0.0], [1.0]
+        )
+        return c_mat[0, :]
+
+    def solve_regularization_path(
+        self, gram, moment, ridge_list, bound_scale_list=(1.0,)
+    ):
+        warn_least_squares_loss()
+        return super(RobustRegressor, self).solve_regularization_path(
+            gram, moment, ridge_list, bound_scale_list
+        )
+
+    def compile_problem(self):
+        import cvxpy
+
+        self.c_var = cvxpy.Variable(self.n_opt_coef)
+        self.R_param = cvxpy.Parameter((self.n_opt_coef, self.n_opt_coef))
+        self.moment_param = cvxpy.Parameter(self.n_opt_coef)
+        cost = (
+            cvxpy.sum_squares(self.R_param @ self.c_var)
+            - 2 * self.moment_param @ self.c_var
+        )
+        self.prob = cvxpy.Problem(cvxpy.Minimize(cost), [self.G @ self.c_var <= self.h])
+
+    def compute_optimization_metrics(self):
+        self.check_estimation_completed()
+        y_pred = self.predict(self.X)
+        metrics_dict = {
+            "RMSE": math_tools.rmse_between_numpy_arrays(y_pred, self.y),
+            "R2": math_tools.r2_between_numpy_arrays(y_pred, self.y),
+        }
+        if hasattr(self, "n_iterations"):
+            metrics_dict["IRLS Iterations"] = self.n_iterations
+            metrics_dict["Downweighted Ratio"] = self.downweighted_ratio
+        return metrics_dict
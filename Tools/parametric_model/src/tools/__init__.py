@@ -5,3 +5,18 @@ from . import math_tools
 from .data_handler import DataHandler
 from .string_to_bool import string_to_bool
 from .automatic_data_selector import AutomaticDataSelector
+from . import regression_statistics
+from .regression_statistics import RegressionStatistics
+from . import signal_conditioning
+from . import flight_data_container
+from . import parameter_pack
+from . import model_registry
+from .model_registry import ModelRegistry
+from .d_optimal_data_selector import DOptimalDataSelector
+from . import stage_profiler
+from .stage_profiler import profile_stage
+from .synthetic_data_generator import SyntheticDataGenerator
+from . import logging_tools
+from .logging_tools import configure_logging
+from .forward_simulator import ForwardSimulator
+from . import rollout_metrics
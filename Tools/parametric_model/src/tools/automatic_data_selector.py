@@ -1,5 +1,3 @@
-import os
-
 """
  *
  * Copyright (c) 2021 Manuel Yves Galliker
@@ -33,29 +31,185 @@ import os
  * POSSIBILITY OF SUCH DAMAGE.
  *
 
-The model class contains properties shared between all models and shgall simplyfy automated checks and the later
-export to a sitl gazebo model by providing a unified interface for all models. """
+Automatic selection of the most informative parts of a flight log. The log is split into
+contiguous windows which are scored by the Fisher information columns computed by
+DynamicsModel.compute_fisher_information. """
 
 __author__ = "Manuel Yves Galliker, Julius Schlapbach"
 __maintainer__ = "Manuel Yves Galliker"
 __license__ = "BSD 3"
 
+import math
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
 
 class AutomaticDataSelector:
-    def __init__(self, data_df):
-        self.data_df = data_df
+    def __init__(
+        self,
+        data_df=None,
+        window_length=250,
+        sample_budget=None,
+        score_columns=None,
+    ):
+        """
+        Inputs:
+        data_df: dataframe containing the fisher information columns, can be omitted if the
+            data is passed in chunks through add_chunk
+        window_length: number of consecutive samples per selectable window
+        sample_budget: maximum number of selected samples. If known upfront, only the best
+            windows are kept in memory while chunks are streamed in.
+        score_columns: columns summed up to the information score of a sample. By default
+            fisher_information_force and fisher_information_rot are used, or the per
+            coefficient *_fim columns if the former are not informative (singular FIM).
+        """
+        self.window_length = int(window_length)
+        self.sample_budget = sample_budget
+        self.score_columns = score_columns
+        self.score_scale = None
+
+        self.window_df_list = []
+        self.window_scores = np.zeros(0)
+        self.total_score = 0.0
+        self.n_samples = 0
+        self.remainder_df = None
+
+        if data_df is not None:
+            self.add_chunk(data_df)
 
-    def select_dataframes(self, ratio=10):
-        idx = self.data_df.sort_values(by=["fisher_information_force"]).index[
-            0 : self.data_df.shape[0] * 10 // 100
+    def detect_score_columns(self, data_df):
+        score_columns = [
+            col
+            for col in ["fisher_information_force", "fisher_information_rot"]
+            if col in data_df.columns and np.nanmax(data_df[col].to_numpy()) > 0.0
         ]
-        idx = idx.append(
-            self.data_df.sort_values(by=["fisher_information_rot"]).index[
-                0 : self.data_df.shape[0] * 10 // 100
-            ]
+        if len(score_columns) == 0:
+            score_columns = [col for col in data_df.columns if col.endswith("_fim")]
+        assert (
+            len(score_columns) > 0
+        ), "No fisher information found in dataframe, compute the fisher information first."
+        return score_columns
+
+    def compute_sample_scores(self, data_df):
+        if self.score_columns is None:
+            self.score_columns = self.detect_score_columns(data_df)
+        score_mat = np.nan_to_num(data_df[self.score_columns].to_numpy(dtype=float))
+        if self.score_scale is None:
+            # columns are weighted equally, the scaling is fixed by the first chunk
+            self.score_scale = np.mean(np.abs(score_mat), axis=0)
+            self.score_scale[self.score_scale == 0.0] = 1.0
+        return np.sum(score_mat / self.score_scale, axis=1)
+
+    def add_chunk(self, chunk_df):
+        """
+        Score all complete windows of a chunk of consecutive samples. Samples that do not
+        fill a complete window are kept and prepended to the next chunk.
+        """
+        if self.remainder_df is not None:
+            chunk_df = pd.concat([self.remainder_df, chunk_df], ignore_index=True)
+        sample_scores = self.compute_sample_scores(chunk_df)
+        n_windows = chunk_df.shape[0] // self.window_length
+        n_complete = n_windows * self.window_length
+        scores = sample_scores[:n_complete].reshape(n_windows, -1).sum(axis=1)
+        self.append_windows(
+            [
+                chunk_df.iloc[i * self.window_length : (i + 1) * self.window_length]
+                for i in range(n_windows)
+            ],
+            scores,
+        )
+        self.remainder_df = chunk_df.iloc[n_complete:]
+
+    def flush(self):
+        """Score the remaining samples as a last, shorter window."""
+        if self.remainder_df is not None and self.remainder_df.shape[0] > 0:
+            scores = np.array([np.sum(self.compute_sample_scores(self.remainder_df))])
+            self.append_windows([self.remainder_df], scores)
+        self.remainder_df = None
+
+    def append_windows(self, window_df_list, scores):
+        self.window_df_list.extend(window_df_list)
+        self.window_scores = np.concatenate((self.window_scores, scores))
+        self.total_score += float(np.sum(scores))
+        self.n_samples += sum(window_df.shape[0] for window_df in window_df_list)
+
+        if self.sample_budget is not None:
+            # window_df_list stays in chronological order, only the best windows are kept
+            n_keep = self.n_windows_for_budget(self.sample_budget)
+            if len(self.window_df_list) > n_keep:
+                keep_index = self.top_k_windows(n_keep)
+                self.window_df_list = [self.window_df_list[i] for i in keep_index]
+                self.window_scores = self.window_scores[keep_index]
+
+    def n_windows_for_budget(self, sample_budget):
+        return max(int(sample_budget) // self.window_length, 1)
+
+    def top_k_windows(self, k):
+        """Indices of the k highest scoring windows in chronological order."""
+        if k >= self.window_scores.shape[0]:
+            return np.arange(self.window_scores.shape[0])
+        top_index = np.argpartition(-self.window_scores, k - 1)[:k]
+        return np.sort(top_index)
+
+    def select_dataframes(self, ratio=10, sample_budget=None, target_information=None):
+        """
+        Select the most informative windows.
+
+        Inputs:
+        ratio: percentage of the log to be selected, used if neither sample_budget nor
+            target_information are specified
+        sample_budget: maximum number of selected samples
+        target_information: fraction (0, 1] of the total information score of the log
+            the selected windows need to contain
+
+        Returns:
+        data_df: dataframe of the selected windows in chronological order
+        """
+        self.flush()
+        n_windows = self.window_scores.shape[0]
+        assert n_windows > 0, "No data available for automatic data selection"
+
+        if sample_budget is None:
+            sample_budget = self.sample_budget
+        if target_information is not None:
+            assert (
+                0.0 < target_information <= 1.0
+            ), "target_information needs to be in (0, 1]"
+            sorted_scores = -np.sort(-self.window_scores)
+            k = int(
+                np.searchsorted(
+                    np.cumsum(sorted_scores), target_information * self.total_score
+                )
+                + 1
+            )
+            if sample_budget is not None:
+                k = min(k, self.n_windows_for_budget(sample_budget))
+        elif sample_budget is not None:
+            k = self.n_windows_for_budget(sample_budget)
+        else:
+            k = math.ceil(self.n_samples * ratio / 100 / self.window_length)
+        k = min(max(k, 1), n_windows)
+
+        selected_index = self.top_k_windows(k)
+        self.information_ratio = float(
+            np.sum(self.window_scores[selected_index]) / max(self.total_score, 1e-12)
+        )
+        data_df = pd.concat(
+            [self.window_df_list[i] for i in selected_index], ignore_index=True
+        )
+        logger.info(
+            "Selected %d windows with %d of %d samples containing %.1f%% of the information.",
+            k,
+            data_df.shape[0],
+            self.n_samples,
+            100 * self.information_ratio,
+            extra={
+                "n_windows": k,
+                "n_samples": data_df.shape[0],
+                "information_ratio": self.information_ratio,
+            },
         )
-        idx = idx.unique()
-        idx = idx.sort_values()
-        self.data_df = self.data_df.loc[idx]
-        self.data_df.reset_index(drop=True)
-        return self.data_df
+        return data_df
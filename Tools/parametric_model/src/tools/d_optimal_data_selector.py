@@ -0,0 +1,178 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Greedy D-optimal selection of flight log windows. Windows are added one at a time such that
+the log determinant of the accumulated Fisher information matrix grows the most. Every
+window information matrix is given as a low rank factor I_w = F_w^T * F_w, so the gain of a
+candidate follows from the matrix determinant lemma
+
+logdet(A + F^T F) - logdet(A) = logdet(I + (L^-1 F^T)^T (L^-1 F^T)),  A = L L^T
+
+and costs two triangular solves on the Cholesky factor L of the current information matrix.
+Accepting a window updates L with one rank-one update per factor row. Since the gains
+can only shrink as windows are added (submodularity), candidates are evaluated lazily.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import heapq
+import logging
+import math
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_triangular
+
+logger = logging.getLogger(__name__)
+
+
+def cholesky_rank_one_update(L, x):
+    """
+    Update the lower triangular Cholesky factor L of A in place to the factor of A + x x^T.
+    """
+    x = np.array(x, dtype=float)
+    for k in range(L.shape[0]):
+        r = math.hypot(L[k, k], x[k])
+        c = r / L[k, k]
+        s = x[k] / L[k, k]
+        L[k, k] = r
+        L[k + 1 :, k] = (L[k + 1 :, k] + s * x[k + 1 :]) / c
+        x[k + 1 :] = c * x[k + 1 :] - s * L[k + 1 :, k]
+    return L
+
+
+class DOptimalDataSelector:
+    def __init__(self, data_df, factors, window_starts, prior_weight=1e-6):
+        """
+        Inputs:
+        data_df: dataframe of the log
+        factors: numpy array of shape (n_windows, rank, n_coef) with the information factors
+            of the windows, see DynamicsModel.compute_window_information_factors
+        window_starts: index of the first sample of every window
+        prior_weight: weight of the identity matrix the selection starts from, relative to
+            the mean diagonal entry of the information matrix of the full log
+        """
+        self.data_df = data_df
+        self.factors = np.asarray(factors, dtype=float)
+        self.window_starts = np.asarray(window_starts)
+        self.window_ends = np.append(self.window_starts[1:], data_df.shape[0])
+        self.n_windows, _, self.n_coef = self.factors.shape
+
+        full_information_diag = np.einsum("wrp,wrp->p", self.factors, self.factors)
+        self.prior = prior_weight * max(np.mean(full_information_diag), 1e-12)
+        self.full_logdet = float(
+            np.sum(np.log(self.prior + self.full_information_eigvals()))
+        )
+
+    def full_information_eigvals(self):
+        flat_factors = self.factors.reshape(-1, self.n_coef)
+        return np.clip(np.linalg.eigvalsh(flat_factors.T @ flat_factors), 0.0, None)
+
+    def compute_gain(self, L, window_index):
+        Z = solve_triangular(L, self.factors[window_index].T, lower=True)
+        _, logdet = np.linalg.slogdet(np.eye(Z.shape[1]) + Z.T @ Z)
+        return logdet
+
+    def select_windows(self, n_max_windows, min_gain=0.0):
+        """
+        Lazy greedy maximization of the log determinant of the accumulated information.
+
+        Returns:
+        selected_index: indices of the selected windows in order of selection
+        logdet: log determinant of the accumulated information after every selection
+        """
+        L = math.sqrt(self.prior) * np.eye(self.n_coef)
+        current_logdet = self.n_coef * math.log(self.prior)
+
+        # max heap of (negative) upper bounds on the gain of every candidate
+        heap = [(-self.compute_gain(L, i), i, 0) for i in range(self.n_windows)]
+        heapq.heapify(heap)
+        selected_index = []
+        logdet_list = []
+        while heap and len(selected_index) < n_max_windows:
+            neg_gain, window_index, n_evaluated = heapq.heappop(heap)
+            if n_evaluated < len(selected_index):
+                # stale bound, re-evaluate against the current information matrix
+                gain = self.compute_gain(L, window_index)
+                heapq.heappush(heap, (-gain, window_index, len(selected_index)))
+                continue
+            if -neg_gain <= min_gain:
+                break
+            for factor_row in self.factors[window_index]:
+                cholesky_rank_one_update(L, factor_row)
+            current_logdet -= neg_gain
+            selected_index.append(window_index)
+            logdet_list.append(current_logdet)
+        return selected_index, logdet_list
+
+    def select_dataframes(self, ratio=10, sample_budget=None, min_gain=0.0):
+        """
+        Select the windows that maximize the determinant of the Fisher information.
+
+        Inputs:
+        ratio: percentage of the log to be selected, used if sample_budget is not specified
+        sample_budget: maximum number of selected samples
+        min_gain: stop as soon as the best window increases the log determinant by less
+
+        Returns:
+        data_df: dataframe of the selected windows in chronological order
+        """
+        window_length = int(np.max(self.window_ends - self.window_starts))
+        if sample_budget is None:
+            sample_budget = self.data_df.shape[0] * ratio / 100
+        n_max_windows = max(int(math.ceil(sample_budget / window_length)), 1)
+
+        selected_index, logdet_list = self.select_windows(n_max_windows, min_gain)
+        assert len(selected_index) > 0, "No informative window found"
+        self.selected_index = np.sort(selected_index)
+        # geometric mean of the eigenvalue ratios to the information of the full log
+        self.d_efficiency = math.exp((logdet_list[-1] - self.full_logdet) / self.n_coef)
+        data_df = pd.concat(
+            [
+                self.data_df.iloc[self.window_starts[i] : self.window_ends[i]]
+                for i in self.selected_index
+            ],
+            ignore_index=True,
+        )
+        logger.info(
+            "Selected %d windows with %d of %d samples, D-efficiency %.3f.",
+            len(selected_index),
+            data_df.shape[0],
+            self.data_df.shape[0],
+            self.d_efficiency,
+            extra={
+                "n_windows": len(selected_index),
+                "n_samples": data_df.shape[0],
+                "d_efficiency": self.d_efficiency,
+            },
+        )
+        return data_df
@@ -38,18 +38,22 @@ __author__ = "Manuel Yves Galliker, Julius Schlapbach"
 __maintainer__ = "Manuel Yves Galliker"
 __license__ = "BSD 3"
 
-from progress.bar import Bar
 import pandas as pd
+import logging
 import math
 import time
 import yaml
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 from src.models.model_config import ModelConfig
 from src.tools.ulog_tools import load_ulog, pandas_from_topic
 from src.tools.dataframe_tools import compute_flight_time, resample_dataframe_list
+from src.tools import signal_conditioning, flight_data_container
 from src.tools.quat_utils import quaternion_to_rotation_matrix
+from src.tools.stage_profiler import profile_stage
+from src.tools.logging_tools import ProgressReporter, log_section
+
+logger = logging.getLogger(__name__)
 
 
 class DataHandler(object):
@@ -59,16 +63,15 @@ class DataHandler(object):
         "sub_plt2_data": ["u0", "u1", "u2", "u3"],
     }
 
-    def __init__(self, config_file, selection_var="none"):
-        print(
-            "==============================================================================="
-        )
-        print(
-            "                              Data Processing                                  "
-        )
-        print(
-            "==============================================================================="
-        )
+    def __init__(self, config_file, selection_var="none", required_columns=None):
+        """
+        Inputs:
+        config_file: path of the model config
+        selection_var: optional setpoint variable used for data selection (topic_name/variable_name)
+        required_columns: dataframe columns needed by the model (see DynamicsModel.get_required_columns),
+            only the topics providing them are loaded. Defaults to all topics of the config.
+        """
+        log_section(logger, "Data Processing")
         self.config = ModelConfig(config_file)
         config_dict = self.config.dynamics_model_config
 
@@ -79,8 +82,14 @@ class DataHandler(object):
         self.estimate_angular_acceleration = config_dict[
             "estimate_angular_acceleration"
         ]
-        print("Resample frequency: ", self.resample_freq, "Hz")
+        # optional differentiation settings, see signal_conditioning.differentiate
+        self.angular_acceleration_filter = (
+            config_dict.get("angular_acceleration_filter", None) or {}
+        )
+        logger.info("Resample frequency: %s Hz", self.resample_freq)
         self.req_topics_dict = config_dict["data"]["required_ulog_topics"]
+        # optional flight segmentation settings: min_duration [s], trim [s]
+        self.flight_time_config = config_dict.get("flight_time", None) or {}
 
         if selection_var != "none":
             split = selection_var.split("/")
@@ -117,10 +126,9 @@ class DataHandler(object):
                     "dataframe_name": ["timestamp", variable_name],
                 }
 
-            print(
-                "Augmented required topics list with setpoint variable:",
+            logger.debug(
+                "Augmented required topics list with setpoint variable: %s from topic %s",
                 variable_name,
-                "from topic",
                 topic_name,
             )
 
@@ -129,61 +137,138 @@ class DataHandler(object):
         self.estimate_forces = config_dict["estimate_forces"]
         self.estimate_moments = config_dict["estimate_moments"]
 
+        if required_columns is None:
+            required_columns = self.req_dataframe_topic_list
+        required_columns = list(required_columns)
+        if selection_var != "none":
+            required_columns.append(selection_var.split("/")[1])
+        self.required_columns = list(dict.fromkeys(required_columns))
+        self.topic_plan = self.compute_topic_plan()
+
         # used to generate a dict with the resulting coefficients later on.
         self.coef_name_list = []
         self.result_dict = {}
 
+    def compute_topic_plan(self):
+        """
+        Map every topic type providing a required column to the (ulog_name, dataframe_name)
+        pairs that need to be loaded. Columns derived after resampling are not loaded.
+        """
+        derived_columns = ["timestamp"]
+        if self.estimate_angular_acceleration:
+            derived_columns += ["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"]
+
+        topic_plan = {}
+        for topic_type, topic_dict in self.req_topics_dict.items():
+            dataframe_names = topic_dict.get("dataframe_name", topic_dict["ulog_name"])
+            assert len(dataframe_names) == len(topic_dict["ulog_name"]), (
+                "could not rename topics of type",
+                topic_type,
+                "due to rename list not having an entry for every topic.",
+            )
+            column_pairs = [
+                (ulog_name, dataframe_name)
+                for ulog_name, dataframe_name in zip(
+                    topic_dict["ulog_name"], dataframe_names
+                )
+                if dataframe_name in self.required_columns
+                and dataframe_name not in derived_columns
+            ]
+            if len(column_pairs) > 0:
+                topic_plan[topic_type] = [("timestamp", "timestamp")] + column_pairs
+        return topic_plan
+
     def loadLogs(self, rel_data_path):
         self.rel_data_path = rel_data_path
+        self.data_df = pd.DataFrame()
+        self.log_file_list = []
         if os.path.isdir(rel_data_path):
-            self.data_df = pd.DataFrame()
             for filename in os.listdir(rel_data_path):
-                self.loadLogFile(os.path.join(rel_data_path, filename))
+                if self.loadLogFile(os.path.join(rel_data_path, filename)):
+                    self.log_file_list.append(os.path.join(rel_data_path, filename))
 
         else:
             if not self.loadLogFile(rel_data_path):
-                raise TypeError("File extension needs to be either csv or ulg")
+                raise TypeError("File extension needs to be either csv, ulg or ddf")
+            self.log_file_list.append(rel_data_path)
 
     def loadLogFile(self, rel_data_path):
         if rel_data_path.endswith(".csv"):
-            print("Loading CSV file: ", rel_data_path)
-            self.data_df = pd.read_csv(rel_data_path, index_col=0)
-            print("Loading topics: ", self.req_dataframe_topic_list)
-            for req_topic in self.req_dataframe_topic_list:
-                assert req_topic in self.data_df, "missing topic in loaded csv: " + str(
+            logger.info("Loading CSV file: %s", rel_data_path)
+            # only parse the index and the required columns
+            with profile_stage("csv_parse"):
+                csv_columns = pd.read_csv(rel_data_path, nrows=0).columns
+                csv_df = pd.read_csv(
+                    rel_data_path,
+                    index_col=0,
+                    usecols=[csv_columns[0]]
+                    + [col for col in csv_columns[1:] if col in self.required_columns],
+                )
+            logger.debug("Loading topics: %s", self.required_columns)
+            for req_topic in self.required_columns:
+                assert req_topic in csv_df, "missing topic in loaded csv: " + str(
                     req_topic
                 )
+            self.append_dataframe(csv_df)
+            return True
+
+        elif rel_data_path.endswith(flight_data_container.FILE_EXTENSION):
+            logger.info("Loading flight data container: %s", rel_data_path)
+            header, _ = flight_data_container.read_flight_data_header(rel_data_path)
+            if header["sample_rate"] != self.resample_freq:
+                logger.warning(
+                    "Flight data was resampled at %s Hz instead of %s Hz",
+                    header["sample_rate"],
+                    self.resample_freq,
+                )
+            with profile_stage("container_load"):
+                container_df = flight_data_container.load_flight_data(
+                    rel_data_path, self.required_columns
+                )
+            for req_topic in self.required_columns:
+                assert (
+                    req_topic in container_df
+                ), "missing topic in loaded flight data: " + str(req_topic)
+            self.append_dataframe(container_df)
             return True
 
         elif rel_data_path.endswith(".ulg"):
-            print("Loading uLog file: ", rel_data_path)
-            ulog = load_ulog(rel_data_path)
-            print("Loading topics:")
-            for req_topic in self.req_topics_dict:
-                print(req_topic)
+            logger.info("Loading uLog file: %s", rel_data_path)
+            # only parse the planned topics and the landed state
+            with profile_stage("ulog_parse"):
+                ulog = load_ulog(
+                    rel_data_path,
+                    list(self.topic_plan.keys()) + ["vehicle_land_detected"],
+                )
+            logger.debug("Loading topics: %s", list(self.topic_plan))
             self.check_ulog_for_req_topics(ulog)
 
             # compute flight time based on the landed topic
-            landed_df = pandas_from_topic(ulog, ["vehicle_land_detected"])
-            fts = compute_flight_time(landed_df)
+            with profile_stage("flight_time_detection"):
+                landed_df = pandas_from_topic(ulog, ["vehicle_land_detected"])
+                fts = compute_flight_time(
+                    landed_df,
+                    min_duration=self.flight_time_config.get("min_duration", 0.0),
+                    trim=self.flight_time_config.get("trim", 0.0),
+                )
 
-            if len(fts) == 1:
-                self.data_df = self.compute_resampled_dataframe(ulog, fts[0])
-            else:
-                for ft in fts:
-                    # check if the dataframe already exists and if so, append to it
-                    if getattr(self, "data_df", None) is None:
-                        self.data_df = self.compute_resampled_dataframe(ulog, ft)
-                    else:
-                        self.data_df.append(self.compute_resampled_dataframe(ulog, ft))
+            # all flight segments are resampled and concatenated
+            self.append_dataframe(self.compute_resampled_dataframe(ulog, fts))
 
             return True
 
         else:
             return False
 
+    def append_dataframe(self, data_df):
+        # logs of a directory are concatenated
+        if self.data_df.empty:
+            self.data_df = data_df
+        else:
+            self.data_df = pd.concat([self.data_df, data_df], ignore_index=True)
+
     def check_ulog_for_req_topics(self, ulog):
-        for topic_type in self.req_topics_dict.keys():
+        for topic_type in self.topic_plan.keys():
             try:
                 topic_dict = self.req_topics_dict[topic_type]
                 if "id" in topic_dict.keys():
@@ -192,116 +277,100 @@ class DataHandler(object):
                 else:
                     topic_type_data = ulog.get_dataset(topic_type)
             except:
-                print("Missing topic type: ", topic_type)
+                logger.error("Missing topic type: %s", topic_type)
                 exit(1)
             topic_type_data = topic_type_data.data
-            ulog_topic_list = self.req_topics_dict[topic_type]["ulog_name"]
-            for topic_index in range(len(ulog_topic_list)):
-                try:
-                    topic = ulog_topic_list[topic_index]
-                    topic_data = topic_type_data[topic]
-                except:
-                    print("Missing topic: ", topic_type, ulog_topic_list[topic_index])
+            for ulog_name, _ in self.topic_plan[topic_type]:
+                if ulog_name not in topic_type_data:
+                    logger.error("Missing topic: %s %s", topic_type, ulog_name)
                     exit(1)
         return
 
     def compute_resampled_dataframe(self, ulog, fts):
-        print("Starting data resampling of topic types: ", self.req_topics_dict.keys())
+        logger.debug(
+            "Starting data resampling of topic types: %s", list(self.topic_plan)
+        )
         # setup object to crop dataframes for flight data
         df_list = []
-        topic_type_bar = Bar("Resampling", max=len(self.req_topics_dict.keys()))
+        topic_progress = ProgressReporter(
+            "Topic extraction", len(self.topic_plan), logger, level=logging.DEBUG
+        )
 
         # getting data
-        for topic_type in self.req_topics_dict.keys():
-            topic_dict = self.req_topics_dict[topic_type]
+        with profile_stage("topic_extraction"):
+            for topic_type, column_pairs in self.topic_plan.items():
+                topic_dict = self.req_topics_dict[topic_type]
 
-            if "id" in topic_dict.keys():
-                id = topic_dict["id"]
-                curr_df = pandas_from_topic(ulog, [topic_type], id)
-            else:
-                curr_df = pandas_from_topic(ulog, [topic_type])
-
-            curr_df = curr_df[topic_dict["ulog_name"]]
-            if "dataframe_name" in topic_dict.keys():
-                assert len(topic_dict["dataframe_name"]) == len(
-                    topic_dict["ulog_name"]
-                ), (
-                    "could not rename topics of type",
-                    topic_type,
-                    "due to rename list not having an entry for every topic.",
-                )
-                curr_df.columns = topic_dict["dataframe_name"]
-            topic_type_bar.next()
-            if (
-                topic_type == "vehicle_angular_velocity"
-                and self.estimate_angular_acceleration
-            ):
-                ang_vel_mat = curr_df[
-                    ["ang_vel_x", "ang_vel_y", "ang_vel_z"]
-                ].to_numpy()
-                time_in_secods_np = curr_df[["timestamp"]].to_numpy() / 1000000
-                time_in_secods_np = time_in_secods_np.flatten()
-                ang_acc_np = np.gradient(ang_vel_mat, time_in_secods_np, axis=0)
-                topic_type_bar.next()
-                curr_df[["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"]] = ang_acc_np
-
-            df_list.append(curr_df)
-
-        topic_type_bar.finish()
+                if "id" in topic_dict.keys():
+                    id = topic_dict["id"]
+                    curr_df = pandas_from_topic(ulog, [topic_type], id)
+                else:
+                    curr_df = pandas_from_topic(ulog, [topic_type])
+
+                curr_df = curr_df[[ulog_name for ulog_name, _ in column_pairs]]
+                curr_df.columns = [dataframe_name for _, dataframe_name in column_pairs]
+                topic_progress.next()
+                df_list.append(curr_df)
+
+        topic_progress.finish()
 
         # Check if actuator topics are empty
         if not fts:
-            print("could not select flight time due to missing actuator topic")
+            logger.error("Could not select flight time, no flight segment detected")
             exit(1)
 
-        if isinstance(fts, list):
-            resampled_df = []
-            for ft in fts:
-                new_resampled_df = resample_dataframe_list(
-                    df_list, ft, self.resample_freq
-                )
-                resampled_df.append(new_resampled_df)
-            resampled_df = pd.concat(resampled_df, ignore_index=True)
-        else:
-            resampled_df = resample_dataframe_list(df_list, fts, self.resample_freq)
-
-        if self.estimate_angular_acceleration:
-            ang_vel_mat = resampled_df[
-                ["ang_vel_x", "ang_vel_y", "ang_vel_z"]
-            ].to_numpy()
-            for i in range(3):
-                ang_vel_mat[:, i] = (
-                    np.convolve(ang_vel_mat[:, i], np.ones(33), mode="same") / 33
-                )
+        if not isinstance(fts, list):
+            fts = [fts]
+        # flight segments are conditioned individually to not filter across their boundaries
+        resampled_df_list = []
+        for ft in fts:
+            with profile_stage("resampling"):
+                segment_df = resample_dataframe_list(df_list, ft, self.resample_freq)
+            with profile_stage("signal_conditioning"):
+                resampled_df_list.append(self.condition_signals(segment_df))
+        resampled_df = pd.concat(resampled_df_list, ignore_index=True)
 
-            # Alternate forward differentiation version
-            # ang_vel_mat_1 = np.roll(ang_vel_mat, -1, axis=0)
-            # diff_angular_acc_mat = (
-            #     ang_vel_mat_1 - ang_vel_mat) * self.resample_freq
-            # resampled_df[["ang_acc_b_x", "ang_acc_b_y",
-            #               "ang_acc_b_z"]] = diff_angular_acc_mat
+        return resampled_df.dropna()
 
-            time_in_secods_np = resampled_df[["timestamp"]].to_numpy() / 1000000
-            time_in_secods_np = time_in_secods_np.flatten()
-            ang_acc_np = np.gradient(ang_vel_mat, time_in_secods_np, axis=0)
-            topic_type_bar.next()
-            resampled_df[["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"]] = ang_acc_np
+    def condition_signals(self, resampled_df):
+        """
+        Zero phase low pass filtering of all topics with a cutoff_freq entry in the config and
+        estimation of the angular acceleration from the angular velocity.
+        """
+        for topic_type, column_pairs in self.topic_plan.items():
+            topic_dict = self.req_topics_dict[topic_type]
+            if "cutoff_freq" not in topic_dict:
+                continue
+            topic_columns = [
+                dataframe_name
+                for _, dataframe_name in column_pairs
+                if dataframe_name != "timestamp"
+            ]
+            resampled_df[topic_columns] = signal_conditioning.lowpass_filter(
+                resampled_df[topic_columns].to_numpy(),
+                topic_dict["cutoff_freq"],
+                self.resample_freq,
+                topic_dict.get("filter_order", 4),
+            )
 
-        return resampled_df.dropna()
+        if (
+            self.estimate_angular_acceleration
+            and "ang_acc_b_x" in self.required_columns
+        ):
+            resampled_df[
+                ["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"]
+            ] = signal_conditioning.differentiate(
+                resampled_df[["ang_vel_x", "ang_vel_y", "ang_vel_z"]].to_numpy(),
+                self.resample_freq,
+                **self.angular_acceleration_filter,
+            )
+        return resampled_df
 
     def visually_select_data(self, plot_config_dict=None):
-        print(
-            "==============================================================================="
-        )
-        print(
-            "                           Data Selection Enabled                              "
-        )
-        print(
-            "==============================================================================="
-        )
+        log_section(logger, "Data Selection Enabled")
         from visual_dataframe_selector.data_selector import select_visual_data
 
-        print("Number of data samples before cropping: ", self.data_df.shape[0])
+        logger.info("Number of data samples before cropping: %d", self.data_df.shape[0])
         self.data_df = select_visual_data(
             self.data_df, self.visual_dataframe_selector_config_dict
         )
@@ -309,6 +378,37 @@ class DataHandler(object):
     def get_dataframes(self):
         return self.data_df
 
+    def get_report_figure_specs(self):
+        """Figure specs of the visualize_data plots for report_renderer.render_report."""
+        from src.tools import report_renderer
+
+        figure_specs = []
+        for name, title, columns in [
+            ("local_velocity", "Local Velocity", ["vx", "vy", "vz"]),
+            (
+                "body_acceleration",
+                "Body Acceleration",
+                ["acc_b_x", "acc_b_y", "acc_b_z"],
+            ),
+            (
+                "body_angular_velocity",
+                "Body Angular Velocity",
+                ["ang_vel_x", "ang_vel_y", "ang_vel_z"],
+            ),
+            (
+                "body_angular_acceleration",
+                "Body Angular Acceleration",
+                ["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"],
+            ),
+        ]:
+            if all(column in self.data_df for column in columns):
+                figure_specs.append(
+                    report_renderer.scatter_3d_spec(
+                        name, title, self.data_df[columns].to_numpy(), columns
+                    )
+                )
+        return figure_specs
+
     def visualize_data(self):
         def plot_scatter(
             ax, title, dataframe_x, dataframe_y, dataframe_z, color="blue"
@@ -327,6 +427,8 @@ class DataHandler(object):
             ax.set_ylabel(dataframe_y)
             ax.set_zlabel(dataframe_z)
 
+        import matplotlib.pyplot as plt
+
         num_plots = 2
         fig = plt.figure("Data Visualization")
         ax1 = fig.add_subplot(num_plots, 2, 1, projection="3d")
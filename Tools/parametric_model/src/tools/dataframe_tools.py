@@ -36,82 +36,115 @@ __author__ = "Manuel Yves Galliker, Julius Schlapbach"
 __maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
 __license__ = "BSD 3"
 
+import logging
 import numpy as np
 import pandas as pd
 from src.tools.ulog_tools import pandas_from_topic
 from src.tools.quat_utils import slerp
-from matplotlib import pyplot as plt
 
+logger = logging.getLogger(__name__)
 
-def compute_flight_time(data_df):
+
+def compute_flight_time(data_df, min_duration=0.0, trim=0.0):
     """
     The flight time will be determined based on the 'landed' topic of the ulog to only consider actual flight during identification.
 
-    Depending on the number of sections where the landed topic is 1, the following cases are distinguished:
-    - No groups with landed = 1: No flight detected. Start and end time of the flight will be returned as zero
-    - One group with landed = 1: The start and end time of the entire flight log will be returned
-    - Even number of groups with landed = 1: An array with start and end time of each detected flight segment will be returned. If multiple flight segments were detected, a warning is issued.
-    - Odd number of groups with landed = 1: An array with start and end time of each detected flight segment will be returned. If multiple flight segments were detected, a warning is issued.
-    """
-    print("\nComputing flight time...")
-    landed_groups = data_df.groupby(
-        (data_df["landed"].shift() != data_df["landed"]).cumsum()
-    )
-    num_of_groups = landed_groups.ngroups
+    The landed state is run length encoded and every interval with landed = 0 is returned as a
+    flight segment. If no airborne interval is detected an empty list is returned. If multiple
+    flight segments were detected, a warning is issued.
 
-    # single group detected - flight either started and ended outside of log of aircraft did not fly at all
-    if num_of_groups == 1:
-        if landed_groups.get_group(1)["landed"].iloc[0] == 1:
-            print("No flight detected. Please check the landed state.")
-            return [{"t_start": 0, "t_end": 0}]
-        else:
-            pass
-
-    # multiple groups detected - flight started and/or ended within the flight log duration
-    else:
-        if num_of_groups % 2 == 1 and num_of_groups > 3:
-            print(
-                "WARNING: More than one flight detected. The start and end times of the individual segments will be returned."
-            )
-        if num_of_groups % 2 == 0 and num_of_groups > 2:
-            print(
-                "WARNING: More than one flight detected. The start and end times of the individual segments will be returned."
-            )
-
-        # find flight segments with landed topic = 0 and add the corresponding start and end times to the flight_times array
-        flight_times = []
-        start_index = -1
-        if landed_groups.get_group(1)["landed"].iloc[0] == 1:
-            start_index = 2
-        else:
-            start_index = 1
+    Inputs:
+    data_df: dataframe with the columns timestamp [us] and landed
+    min_duration: airborne intervals shorter than this are discarded [s]
+    trim: time removed after every takeoff and before every landing [s]
 
-        for i in range(start_index, num_of_groups + 1, 2):
-            flight_segment = landed_groups.get_group(i)[["timestamp", "landed"]]
-            flight_times.append(
-                {
-                    "t_start": flight_segment.iloc[0, 0],
-                    "t_end": flight_segment.iloc[-1, 0],
-                }
-            )
+    Returns:
+    flight_times: list of dicts with the start and end time (t_start, t_end) of every flight segment [us]
+    """
+    logger.debug("Computing flight time")
+    timestamps = data_df["timestamp"].to_numpy()
+    airborne = data_df["landed"].to_numpy() == 0
+
+    # indices of the first and last sample of every airborne interval
+    edges = np.diff(airborne.astype(np.int8))
+    start_indices = np.flatnonzero(edges == 1) + 1
+    end_indices = np.flatnonzero(edges == -1)
+    if airborne.shape[0] > 0 and airborne[0]:
+        start_indices = np.insert(start_indices, 0, 0)
+    if airborne.shape[0] > 0 and airborne[-1]:
+        end_indices = np.append(end_indices, airborne.shape[0] - 1)
+
+    t_start = timestamps[start_indices] + trim * 1e6
+    t_end = timestamps[end_indices] - trim * 1e6
+    valid = (t_end - t_start) >= max(min_duration * 1e6, 0.0)
+    valid &= t_end > t_start
+
+    if not np.any(valid):
+        logger.warning("No flight detected. Please check the landed state.")
+        return []
+
+    if np.count_nonzero(valid) > 1:
+        logger.warning(
+            "More than one flight detected. The start and end times of the individual segments will be returned."
+        )
+
+    logger.debug("Flight time computation completed successfully.")
+    return [
+        {"t_start": t_s, "t_end": t_e}
+        for t_s, t_e in zip(t_start[valid].tolist(), t_end[valid].tolist())
+    ]
+
+
+def compute_zero_crossings(values):
+    """
+    Indices i at which the sign of values changes between sample i and i + 1. Zero is
+    treated as positive.
+    """
+    values = np.asarray(values)
+    return np.flatnonzero(np.diff(np.sign(values + (values == 0))))
 
-        return flight_times
 
-    print("Flight time computation completed successfully.")
-    return [{"t_start": act_df.iloc[0, 0], "t_end": act_df.iloc[-1, 0]}]
+def extract_segments(data_df, segment_starts, segment_ends, min_length=0, padding=0):
+    """
+    Extract the segments [start, end) from data_df in a single indexing operation.
+
+    Inputs:
+    data_df: dataframe to extract the segments from
+    segment_starts: numpy array with the first index of every segment
+    segment_ends: numpy array with the index after the last sample of every segment
+    min_length: segments with less samples are dropped [samples]
+    padding: number of samples added before and after every segment, overlapping padded
+        segments are not duplicated
+
+    Returns:
+    segment_df: dataframe of all extracted samples with an additional segment_id column
+        numbering the segments consecutively
+    """
+    n_samples = data_df.shape[0]
+    segment_starts = np.asarray(segment_starts, dtype=int)
+    segment_ends = np.asarray(segment_ends, dtype=int)
+    assert (
+        segment_starts.shape == segment_ends.shape
+    ), "Every segment needs a start and an end index"
 
+    valid = (segment_ends - segment_starts) >= max(min_length, 1)
+    segment_starts = np.clip(segment_starts[valid] - padding, 0, n_samples)
+    segment_ends = np.clip(segment_ends[valid] + padding, 0, n_samples)
 
-def moving_average(x, w=7):
-    return np.convolve(x, np.ones(w), "valid") / w
+    # mark segment starts with +1 and ends with -1, covered samples have a positive sum
+    coverage = np.zeros(n_samples + 1, dtype=int)
+    np.add.at(coverage, segment_starts, 1)
+    np.add.at(coverage, segment_ends, -1)
+    index = np.flatnonzero(np.cumsum(coverage[:-1]) > 0)
 
+    # samples covered by overlapping segments belong to the later one
+    order = np.argsort(segment_starts, kind="stable")
+    segment_id = np.searchsorted(segment_starts[order], index, side="right") - 1
+    _, segment_id = np.unique(segment_id, return_inverse=True)
 
-def filter_df(data_df, w=11):
-    data_np = data_df.to_numpy()
-    column_list = data_df.columns
-    new_df = pd.DataFrame()
-    for i in range(data_np.shape[1]):
-        new_df[column_list[i]] = moving_average(data_np[:, i])
-    return new_df
+    segment_df = data_df.iloc[index].reset_index(drop=True)
+    segment_df["segment_id"] = segment_id
+    return segment_df
 
 
 def resample_dataframe_list(
@@ -139,14 +172,8 @@ def resample_dataframe_list(
     assert f_des > 0, "Desired frequency must be greater than 0"
     T_des = 1000000.0 / f_des
 
-    n_samples = int((t_end - t_start) / T_des)
     res_df = pd.DataFrame()
     new_t_list = np.arange(t_start, t_end, T_des)
-    for df in df_list:
-        df = filter_df(df)
-        df_end = df["timestamp"].iloc[[-1]].to_numpy()
-        if df_end < t_end:
-            t_end = int(df_end)
 
     for df in df_list:
         # use slerp interpolation for quaternions
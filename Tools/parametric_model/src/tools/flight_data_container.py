@@ -0,0 +1,150 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Binary container for resampled flight data (.ddf).
+
+Layout:
+- 8 byte magic string
+- header length as little endian uint64
+- JSON header with the column names, number of samples, sample rate and the sha256 hash
+  of the source log, padded such that the data starts at a multiple of 64 bytes
+- little endian float64 data in column major order, one contiguous array per column
+
+The data is memory mapped on loading, so opening a file does not depend on its size and
+the pages are shared between all processes reading the same file.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+import pandas as pd
+
+FILE_EXTENSION = ".ddf"
+MAGIC = b"DDDFLOG1"
+DATA_ALIGNMENT = 64
+
+
+def compute_file_hash(file_path, chunk_size=1 << 20):
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def save_flight_data(file_path, data_df, sample_rate=None, source_path=None):
+    """
+    Write all columns of data_df to a flight data container.
+
+    Inputs:
+    file_path: path of the container file
+    data_df: dataframe with numeric columns
+    sample_rate: sample rate of the resampled data [Hz]
+    source_path: path of the log the data was generated from, stored together with its hash
+    """
+    columns = [str(col) for col in data_df.columns]
+    data = np.ascontiguousarray(data_df.to_numpy(dtype="<f8").T)
+    header = {
+        "version": 1,
+        "columns": columns,
+        "n_samples": int(data.shape[1]),
+        "dtype": "<f8",
+        "sample_rate": sample_rate,
+        "source": None if source_path is None else os.path.basename(source_path),
+        "source_sha256": (
+            None
+            if source_path is None or os.path.isdir(source_path)
+            else compute_file_hash(source_path)
+        ),
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_end = len(MAGIC) + 8 + len(header_bytes)
+    header_bytes += b" " * (-header_end % DATA_ALIGNMENT)
+
+    with open(file_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<Q", len(header_bytes)))
+        file.write(header_bytes)
+        data.tofile(file)
+
+
+def read_flight_data_header(file_path):
+    """
+    Returns:
+    header: dict of the JSON header
+    data_offset: byte offset of the data
+    """
+    with open(file_path, "rb") as file:
+        magic = file.read(len(MAGIC))
+        if magic != MAGIC:
+            raise TypeError("Not a flight data container: " + str(file_path))
+        (header_length,) = struct.unpack("<Q", file.read(8))
+        header = json.loads(file.read(header_length).decode("utf-8"))
+    return header, len(MAGIC) + 8 + header_length
+
+
+def load_flight_data(file_path, columns=None, mmap_mode="c"):
+    """
+    Memory map a flight data container.
+
+    Inputs:
+    file_path: path of the container file
+    columns: columns to load, defaults to all columns. Missing columns are skipped.
+    mmap_mode: "r" for read only access, "c" (copy on write) if the dataframe will be modified
+
+    Returns:
+    data_df: dataframe whose columns are views into the memory mapped file
+    """
+    header, data_offset = read_flight_data_header(file_path)
+    if columns is None:
+        columns = header["columns"]
+    column_index = {col: i for i, col in enumerate(header["columns"])}
+    if header["n_samples"] == 0:
+        return pd.DataFrame(columns=[col for col in columns if col in column_index])
+
+    data = np.memmap(
+        file_path,
+        dtype=header["dtype"],
+        mode=mmap_mode,
+        offset=data_offset,
+        shape=(len(header["columns"]), header["n_samples"]),
+    )
+    # one block per column, no copy of the mapped data
+    return pd.DataFrame(
+        {col: data[column_index[col]] for col in columns if col in column_index},
+        copy=False,
+    )
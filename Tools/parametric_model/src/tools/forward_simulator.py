@@ -0,0 +1,226 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Forward simulation of identified models. The wrench (body forces and moments) of a batch of
+flight states is computed with the feature code of the model and the identified coefficients
+(X * c), the rigid body dynamics are integrated with a fixed step fourth order Runge-Kutta
+scheme for all initial conditions and input traces of the batch at once.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import numpy as np
+import pandas as pd
+import yaml
+from src.models.model_config import ModelConfig
+from src.tools import parameter_pack
+from src.tools.logging_tools import quiet_logging
+from src.tools.quat_utils import quaternion_to_rotation_matrix
+
+GRAVITY = 9.81
+
+# position and velocity in NED world frame, attitude FRD body to NED, body angular velocity
+STATE_COLUMNS = [
+    "x",
+    "y",
+    "z",
+    "vx",
+    "vy",
+    "vz",
+    "q0",
+    "q1",
+    "q2",
+    "q3",
+    "ang_vel_x",
+    "ang_vel_y",
+    "ang_vel_z",
+]
+MEASUREMENT_COLUMNS = [
+    "acc_b_x",
+    "acc_b_y",
+    "acc_b_z",
+    "ang_acc_b_x",
+    "ang_acc_b_y",
+    "ang_acc_b_z",
+]
+
+
+def quaternion_derivative(q_mat, ang_vel_mat):
+    """Time derivative 0.5 * q x (0, w) of the quaternions q_mat (n, 4) for body rates (n, 3)."""
+    q0, q1, q2, q3 = q_mat.T
+    wx, wy, wz = ang_vel_mat.T
+    return 0.5 * np.column_stack(
+        (
+            -q1 * wx - q2 * wy - q3 * wz,
+            q0 * wx + q2 * wz - q3 * wy,
+            q0 * wy - q1 * wz + q3 * wx,
+            q0 * wz + q1 * wy - q2 * wx,
+        )
+    )
+
+
+class ForwardSimulator:
+    def __init__(self, config_file, coefficients, gyroscopic_moments=False):
+        """
+        Inputs:
+        config_file: model config, defines the model and its features
+        coefficients: dict of coefficient names and values or path of a model results yaml
+            file or parameter pack (as written by the model estimation)
+        gyroscopic_moments: add -w x (I w) to the angular acceleration. The identification
+            uses I * dw/dt as moment measurement, which contains the gyroscopic moments
+            already, set True only for coefficients of a physical (e.g. Gazebo) model.
+        """
+        import src.models as models
+
+        if isinstance(coefficients, str) and coefficients.endswith(
+            parameter_pack.FILE_EXTENSION
+        ):
+            coefficients = parameter_pack.load_result_dict(coefficients)["coefficients"]
+        elif isinstance(coefficients, str):
+            with open(coefficients) as file:
+                coefficients = yaml.load(file, Loader=yaml.FullLoader)["coefficients"]
+        self.coefficients = dict(coefficients)
+        self.config = ModelConfig(config_file)
+        self.gyroscopic_moments = gyroscopic_moments
+
+        # the inputs of the simulation are normalized, as after the actuator normalization
+        self.model = getattr(models, self.config.model_class)(
+            config_file, normalization=False
+        )
+        self.mass = self.model.mass
+        self.moment_of_inertia = self.model.moment_of_inertia
+        self.inv_moment_of_inertia = np.linalg.inv(self.moment_of_inertia)
+        self.input_columns = [
+            col
+            for col in self.model.get_required_columns()
+            if col not in STATE_COLUMNS + MEASUREMENT_COLUMNS + ["timestamp"]
+        ]
+
+    def compute_wrench(self, state_mat, input_mat):
+        """
+        Inputs:
+        state_mat: numpy array of shape (n, 13) with the states of STATE_COLUMNS
+        input_mat: numpy array of shape (n, len(input_columns)), normalized inputs
+
+        Returns:
+        force_mat, moment_mat: numpy arrays of shape (n, 3) in FRD body frame
+        """
+        data_df = pd.DataFrame(state_mat[:, 3:], columns=STATE_COLUMNS[3:])
+        data_df[self.input_columns] = input_mat
+        data_df[MEASUREMENT_COLUMNS + ["timestamp"]] = 0.0
+        with quiet_logging("src.models"):
+            self.model.set_data_df(data_df)
+            _, wrench_mat = self.model.evaluate_wrench(self.coefficients)
+        # forces or moments which are not estimated are zero
+        wrench_mat = np.nan_to_num(wrench_mat)
+        return wrench_mat[:, 0:3], wrench_mat[:, 3:6]
+
+    def compute_state_derivative(self, state_mat, input_mat):
+        force_mat, moment_mat = self.compute_wrench(state_mat, input_mat)
+        q_mat = state_mat[:, 6:10]
+        ang_vel_mat = state_mat[:, 10:13]
+        R_body_to_world = np.moveaxis(quaternion_to_rotation_matrix(q_mat.T), -1, 0)
+        acc_mat = np.einsum("nij,nj->ni", R_body_to_world, force_mat) / self.mass
+        acc_mat[:, 2] += GRAVITY
+        if self.gyroscopic_moments:
+            moment_mat = moment_mat - np.cross(
+                ang_vel_mat, ang_vel_mat @ self.moment_of_inertia.T
+            )
+        ang_acc_mat = moment_mat @ self.inv_moment_of_inertia.T
+        return np.hstack(
+            (
+                state_mat[:, 3:6],
+                acc_mat,
+                quaternion_derivative(q_mat, ang_vel_mat),
+                ang_acc_mat,
+            )
+        )
+
+    def step(self, state_mat, input_mat, dt):
+        """One Runge-Kutta step of length dt, the inputs are held constant."""
+        k1 = self.compute_state_derivative(state_mat, input_mat)
+        k2 = self.compute_state_derivative(state_mat + 0.5 * dt * k1, input_mat)
+        k3 = self.compute_state_derivative(state_mat + 0.5 * dt * k2, input_mat)
+        k4 = self.compute_state_derivative(state_mat + dt * k3, input_mat)
+        next_state_mat = state_mat + dt / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
+        next_state_mat[:, 6:10] /= np.linalg.norm(
+            next_state_mat[:, 6:10], axis=1, keepdims=True
+        )
+        return next_state_mat
+
+    def simulate(self, initial_states, input_traces, dt):
+        """
+        Integrate a batch of trajectories.
+
+        Inputs:
+        initial_states: numpy array of shape (n, 13) (or (13,)) with the states of
+            STATE_COLUMNS
+        input_traces: numpy array of shape (n, k, len(input_columns)) (or (k, ...)) with the
+            normalized inputs of the k steps
+        dt: step size [s]
+
+        Returns:
+        state_traces: numpy array of shape (n, k + 1, 13), starting with the initial states
+        """
+        state_mat = np.atleast_2d(np.asarray(initial_states, dtype=float))
+        input_traces = np.asarray(input_traces, dtype=float)
+        if input_traces.ndim == 2:
+            input_traces = input_traces[np.newaxis, :, :]
+        n_steps = input_traces.shape[1]
+        state_traces = np.zeros((state_mat.shape[0], n_steps + 1, len(STATE_COLUMNS)))
+        state_traces[:, 0, :] = state_mat
+        for k in range(n_steps):
+            state_mat = self.step(state_mat, input_traces[:, k, :], dt)
+            state_traces[:, k + 1, :] = state_mat
+        return state_traces
+
+    def get_states(self, data_df):
+        """States of STATE_COLUMNS from a dataframe, missing positions are set to zero."""
+        state_mat = np.zeros((data_df.shape[0], len(STATE_COLUMNS)))
+        for i, col in enumerate(STATE_COLUMNS):
+            if col in data_df:
+                state_mat[:, i] = data_df[col].to_numpy()
+        return state_mat
+
+    def get_inputs(self, data_df, normalization=True):
+        """
+        Inputs of input_columns from a dataframe as loaded by the DataHandler.
+
+        Inputs:
+        normalization: normalize the actuator outputs like the model estimation does
+        """
+        if normalization:
+            self.model.data_df = data_df[self.input_columns].copy()
+            self.model.normalize_actuators()
+            data_df = self.model.data_df
+        return data_df[self.input_columns].to_numpy(dtype=float)
@@ -0,0 +1,250 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Logging of the identification pipeline.
+
+All modules log through the standard logging module with one logger per module, so that
+nothing is printed unless an application configures logging. The command line tools call
+configure_logging, which supports a human readable text format (the default) and a json
+format with one machine parseable record per line:
+
+    configure_logging(level="WARNING")  # quiet, only warnings and errors
+    configure_logging(level="INFO", log_format="json")
+
+Structured data is passed with the extra argument of the logging calls and is included
+as separate fields in the json records. Larger results like the identified coefficients are
+passed as the data field, which the text format renders as yaml below the message:
+
+    logger.info("Optimal coefficients", extra={"data": coef_dict})
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import contextlib
+import datetime
+import json
+import logging
+import math
+import sys
+import time
+import yaml
+
+PACKAGE_LOGGER = "src"
+LOG_FORMATS = ["text", "json"]
+LINE_WIDTH = 79
+
+# attributes of every log record, everything else was passed with the extra argument
+_RECORD_ATTRIBUTES = set(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None)).keys()
+) | {"message", "asctime", "taskName"}
+
+
+def get_record_fields(record):
+    """Structured fields passed with the extra argument of a logging call."""
+    return {
+        key: value
+        for key, value in vars(record).items()
+        if key not in _RECORD_ATTRIBUTES
+    }
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Human readable output close to the former console output of the tools. Records with a
+    section field are rendered as a banner, warnings and errors are prefixed with the level
+    and a data field is appended as yaml.
+    """
+
+    def format(self, record):
+        message = record.getMessage()
+        section = getattr(record, "section", None)
+        if section is not None:
+            message = "\n".join(
+                [
+                    "=" * LINE_WIDTH,
+                    section.center(LINE_WIDTH).rstrip(),
+                    "=" * LINE_WIDTH,
+                ]
+            )
+        elif record.levelno >= logging.WARNING:
+            message = record.levelname + ": " + message
+        if hasattr(record, "data"):
+            # round trip through json to convert numpy types to plain python types
+            data = json.loads(json.dumps(record.data, default=_to_json))
+            message = (
+                message + ":\n" + yaml.dump(data, default_flow_style=False).rstrip()
+            )
+        if record.exc_info:
+            message = message + "\n" + self.formatException(record.exc_info)
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """One json object per record and line, including all fields passed as extra."""
+
+    def format(self, record):
+        log_dict = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        log_dict.update(get_record_fields(record))
+        if record.exc_info:
+            log_dict["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_dict, default=_to_json)
+
+
+def _to_json(value):
+    # numpy scalars and arrays, paths etc.
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def configure_logging(
+    level="INFO", log_format="text", stream=None, logger_names=("__main__",)
+):
+    """
+    Configure the output of the package loggers and of the calling script.
+
+    Inputs:
+    level: logging level name or number, e.g. "WARNING" for throughput sensitive runs
+    log_format: "text" or "json"
+    stream: output stream, defaults to stdout
+    logger_names: additional loggers (e.g. of the calling script) to configure
+
+    Python warnings (e.g. numerical warnings of numpy and scipy) are routed through the
+    py.warnings logger to keep the json output parseable.
+    """
+    assert (
+        log_format in LOG_FORMATS
+    ), "Unknown log format: {0}, valid formats: {1}".format(log_format, LOG_FORMATS)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    assert isinstance(level, int), "Unknown log level"
+
+    handler = logging.StreamHandler(sys.stdout if stream is None else stream)
+    handler.setFormatter(TextFormatter() if log_format == "text" else JsonFormatter())
+    logging.captureWarnings(True)
+    for logger_name in (PACKAGE_LOGGER, "py.warnings") + tuple(logger_names):
+        logger = logging.getLogger(logger_name)
+        for old_handler in list(logger.handlers):
+            logger.removeHandler(old_handler)
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = False
+    return handler
+
+
+@contextlib.contextmanager
+def quiet_logging(logger_name=PACKAGE_LOGGER, level=logging.WARNING):
+    """
+    Only pass records of at least level from logger_name (and its children) within the
+    context, e.g. to keep repeated calls of pipeline code in an inner loop quiet.
+    """
+    logger = logging.getLogger(logger_name)
+    previous_level = logger.level
+    logger.setLevel(max(level, logger.getEffectiveLevel()))
+    try:
+        yield
+    finally:
+        logger.setLevel(previous_level)
+
+
+def log_section(logger, title, level=logging.INFO):
+    """Start a new section of the output, rendered as a banner in the text format."""
+    logger.log(level, title, extra={"section": title})
+
+
+class ProgressReporter:
+    """
+    Progress reporting for loops over many items. In contrast to a progress bar the progress
+    is only logged at n_reports chunk boundaries, next() is a plain counter update otherwise.
+
+        progress = ProgressReporter("Feature computation", n_samples, logger)
+        for i in range(n_samples):
+            ...
+            progress.next()
+        progress.finish()
+    """
+
+    def __init__(self, task, total, logger, n_reports=10, level=logging.INFO):
+        self.task = task
+        self.total = total
+        self.logger = logger
+        self.level = level
+        self.count = 0
+        self.chunk_size = max(int(math.ceil(total / max(n_reports, 1))), 1)
+        self.next_report = self.chunk_size
+        self.start_time = time.perf_counter()
+
+    def next(self, n=1):
+        self.count += n
+        if self.count >= self.next_report:
+            self.next_report += self.chunk_size
+            # the last chunk is reported by finish()
+            if self.count < self.total and self.logger.isEnabledFor(self.level):
+                self._log_progress()
+
+    def _log_progress(self):
+        self.logger.log(
+            self.level,
+            "%s: %d/%d",
+            self.task,
+            self.count,
+            self.total,
+            extra={
+                "task": self.task,
+                "progress": self.count,
+                "total": self.total,
+                "elapsed_s": round(time.perf_counter() - self.start_time, 4),
+            },
+        )
+
+    def finish(self):
+        elapsed = time.perf_counter() - self.start_time
+        self.logger.log(
+            self.level,
+            "%s completed in %.3f s",
+            self.task,
+            elapsed,
+            extra={
+                "task": self.task,
+                "progress": self.count,
+                "total": self.total,
+                "elapsed_s": round(elapsed, 4),
+            },
+        )
@@ -38,7 +38,6 @@ __license__ = "BSD 3"
 
 import math
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 def cropped_sym_sigmoid(x, x_offset=0, scale_fac=30):
@@ -61,6 +60,8 @@ def sym_sigmoid(x, x_offset=0, scale_fac=30):
 
 
 def plot_sym_sigmoid(scale_fac, x_offset=0.35, x_range=90):
+    import matplotlib.pyplot as plt
+
     N = x_range * 2 + 1
     x = np.linspace(-x_range, x_range, N)
     x_rad = x * math.pi / 180.0
@@ -79,6 +80,48 @@ def rmse_between_numpy_arrays(np_array1, np_array2):
     return math.sqrt(mse)
 
 
+def r2_between_numpy_arrays(y_pred, y):
+    """Coefficient of determination of the prediction y_pred of y (as sklearn.metrics.r2_score)."""
+    y_pred = np.asarray(y_pred, dtype=float).flatten()
+    y = np.asarray(y, dtype=float).flatten()
+    sse = np.sum(np.square(y - y_pred))
+    sst = np.sum(np.square(y - np.mean(y)))
+    if sst == 0.0:
+        return 1.0 if sse == 0.0 else 0.0
+    return float(1.0 - sse / sst)
+
+
+def newton_solve(residual, x_init, tol=1e-10, max_iter=50, max_step=0.2, fd_step=1e-7):
+    """
+    Solve the independent scalar equations residual(x)[i] = 0 for all i at once with Newton
+    iterations. The derivative is computed by central differences, so residual only needs to
+    be evaluated elementwise on numpy arrays.
+
+    Inputs:
+    residual: function mapping a numpy array of shape (n,) to the residuals of shape (n,)
+    x_init: initial guess, numpy array of shape (n,), e.g. the solution of a neighbouring
+        problem (warm start)
+    max_step: largest step per iteration, damps the iterations far from the solution
+
+    Returns:
+    x: numpy array of shape (n,), the last iterate where the residual is not finite
+    converged: boolean numpy array of shape (n,)
+    """
+    x = np.array(x_init, dtype=float).flatten()
+    converged = np.zeros(x.shape[0], dtype=bool)
+    for _ in range(max_iter):
+        f = residual(x)
+        df = (residual(x + fd_step) - residual(x - fd_step)) / (2 * fd_step)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.clip(f / df, -max_step, max_step)
+        valid = np.isfinite(step)
+        x[valid] -= step[valid]
+        converged = valid & (np.abs(np.where(valid, step, np.inf)) < tol)
+        if np.all(converged | ~valid):
+            break
+    return x, converged
+
+
 if __name__ == "__main__":
     # run this script to find suitable values for the scale_factor of the symmetric sigmoid function
     plot_sym_sigmoid(30, x_range=180)
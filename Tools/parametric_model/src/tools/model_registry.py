@@ -0,0 +1,372 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+
+SQLite index of the model results in a results directory. Every results yaml written by
+DynamicsModel.save_result_dict_to_yaml is registered together with the hashes of the config
+and of the flight logs, the metrics, the Fisher information statistics and the coefficients,
+such that runs can be selected and compared without parsing the yaml files.
+
+Tables:
+- runs: one row per results file (model name, kind, creation time, config hash, number of
+  samples, R2, RMSE and the complete metrics and FIM statistics as json)
+- logs: sha256 hashes and paths of the flight logs of a run
+- coefficients: coefficient values and Cramer-Rao bounds of a run
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import glob
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+import yaml
+from .flight_data_container import compute_file_hash
+
+REGISTRY_FILE = "model_registry.sqlite"
+TIME_FORMAT = "%Y-%m-%d-%H-%M-%S"
+ORDER_COLUMNS = ["r2", "rmse", "created", "n_samples", "id"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    file_path TEXT UNIQUE NOT NULL,
+    model_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    created TEXT NOT NULL,
+    config_hash TEXT,
+    n_samples INTEGER,
+    r2 REAL,
+    rmse REAL,
+    metrics TEXT,
+    fim TEXT
+);
+CREATE TABLE IF NOT EXISTS logs (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    log_hash TEXT NOT NULL,
+    log_file TEXT
+);
+CREATE TABLE IF NOT EXISTS coefficients (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    cramer_rao_bound REAL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS runs_model_r2 ON runs(model_name, r2);
+CREATE INDEX IF NOT EXISTS runs_config ON runs(config_hash);
+CREATE INDEX IF NOT EXISTS logs_hash ON logs(log_hash);
+"""
+
+
+def compute_config_hash(config_dict):
+    """sha256 hash of a config dict, independent of the key order."""
+    config_str = json.dumps(config_dict, sort_keys=True, default=str)
+    return hashlib.sha256(config_str.encode()).hexdigest()
+
+
+def parse_results_file_name(file_path):
+    """
+    Split the name of a results file written by save_result_dict_to_yaml into the model
+    name and the creation time. Falls back to the modification time of the file if the
+    name carries no timestamp.
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    model_name, _, timestr = stem.rpartition("_")
+    try:
+        created = time.strptime(timestr, TIME_FORMAT)
+    except ValueError:
+        return stem, time.strftime(
+            TIME_FORMAT, time.localtime(os.path.getmtime(file_path))
+        )
+    return model_name, time.strftime(TIME_FORMAT, created)
+
+
+def _float_or_none(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+class ModelRegistry:
+    def __init__(self, db_path):
+        """
+        Inputs:
+        db_path: path of the sqlite database, created if it does not exist
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path, timeout=30.0)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def register(
+        self,
+        file_path,
+        result_dict,
+        model_name=None,
+        created=None,
+        config_hash=None,
+        log_files=(),
+        log_hashes=None,
+    ):
+        """
+        Add a results file to the registry, replaces an existing entry of the same file.
+
+        Inputs:
+        file_path: path of the results yaml file
+        result_dict: content of the results file, i.e. the result dict of the model,
+            optionally merged with the Fisher metrics (Cramer and FIM sections)
+        model_name, created: default to the values encoded in the file name
+        config_hash: hash of the model config, see compute_config_hash
+        log_files: paths of the flight logs the model was identified on
+        log_hashes: sha256 hashes of the log files, computed from the files if not given
+
+        Returns:
+        run_id: id of the run in the registry
+        """
+        parsed_name, parsed_created = parse_results_file_name(file_path)
+        model_name = parsed_name if model_name is None else model_name
+        created = parsed_created if created is None else created
+        if log_hashes is None:
+            log_hashes = [compute_file_hash(log_file) for log_file in log_files]
+        log_files = list(log_files) + [None] * (len(log_hashes) - len(log_files))
+        metrics = result_dict.get("metrics", {}) or {}
+        cramer_dict = result_dict.get("Cramer", {}) or {}
+
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM runs WHERE file_path = ?", (os.path.abspath(file_path),)
+            )
+            cursor = self.connection.execute(
+                "INSERT INTO runs (file_path, model_name, kind, created, config_hash, "
+                "n_samples, r2, rmse, metrics, fim) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.abspath(file_path),
+                    model_name,
+                    "estimation" if "Cramer" in result_dict else "prediction",
+                    created,
+                    config_hash,
+                    result_dict.get("number of samples"),
+                    _float_or_none(metrics.get("R2")),
+                    _float_or_none(metrics.get("RMSE")),
+                    json.dumps(metrics, default=str),
+                    json.dumps(result_dict.get("FIM", {}), default=str),
+                ),
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO logs (run_id, log_hash, log_file) VALUES (?, ?, ?)",
+                [
+                    (run_id, log_hash, log_file)
+                    for log_hash, log_file in zip(log_hashes, log_files)
+                ],
+            )
+            self.connection.executemany(
+                "INSERT INTO coefficients (run_id, name, value, cramer_rao_bound) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        name,
+                        _float_or_none(value),
+                        _float_or_none(cramer_dict.get(name)),
+                    )
+                    for name, value in result_dict.get("coefficients", {}).items()
+                ],
+            )
+        return run_id
+
+    def index_directory(self, result_path):
+        """
+        Register all results yaml files of a directory that are not in the registry yet,
+        e.g. results written before the registry existed. Config and log hashes of these
+        runs are unknown.
+
+        Returns:
+        n_registered: number of newly registered files
+        """
+        known_files = {
+            row["file_path"]
+            for row in self.connection.execute("SELECT file_path FROM runs")
+        }
+        n_registered = 0
+        for file_path in sorted(glob.glob(os.path.join(result_path, "*.yaml"))):
+            if os.path.abspath(file_path) in known_files:
+                continue
+            with open(file_path) as file:
+                result_dict = yaml.load(file, Loader=yaml.FullLoader)
+            if not isinstance(result_dict, dict) or "coefficients" not in result_dict:
+                continue
+            self.register(file_path, result_dict)
+            n_registered += 1
+        return n_registered
+
+    def remove_missing(self):
+        """Remove the runs whose results file has been deleted, returns their number."""
+        missing_ids = [
+            (row["id"],)
+            for row in self.connection.execute("SELECT id, file_path FROM runs")
+            if not os.path.isfile(row["file_path"])
+        ]
+        with self.connection:
+            self.connection.executemany("DELETE FROM runs WHERE id = ?", missing_ids)
+        return len(missing_ids)
+
+    def query(
+        self,
+        model_name=None,
+        kind=None,
+        config_hash=None,
+        log_hash=None,
+        min_r2=None,
+        order_by="r2",
+        descending=True,
+        limit=None,
+    ):
+        """
+        Select runs of the registry, by default sorted from best to worst R2. Hashes match
+        by prefix.
+
+        Returns:
+        run_list: list of dicts with the columns of the runs table
+        """
+        assert order_by in ORDER_COLUMNS, "Unknown order column: {0}".format(order_by)
+        conditions = []
+        parameters = []
+        if model_name is not None:
+            conditions.append("model_name = ?")
+            parameters.append(model_name)
+        if kind is not None:
+            conditions.append("kind = ?")
+            parameters.append(kind)
+        if config_hash is not None:
+            conditions.append("config_hash LIKE ?")
+            parameters.append(config_hash + "%")
+        if log_hash is not None:
+            conditions.append("id IN (SELECT run_id FROM logs WHERE log_hash LIKE ?)")
+            parameters.append(log_hash + "%")
+        if min_r2 is not None:
+            conditions.append("r2 >= ?")
+            parameters.append(min_r2)
+        sql = "SELECT * FROM runs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        # runs without the metric are listed last
+        sql += " ORDER BY {0} IS NULL, {0} {1}, id".format(
+            order_by, "DESC" if descending else "ASC"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(int(limit))
+        return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def get_run(self, run):
+        """
+        Look up a run by id or results file path, including its logs and coefficients.
+        Raises a KeyError if the run is not registered.
+        """
+        if isinstance(run, int) or str(run).isdigit():
+            row = self.connection.execute(
+                "SELECT * FROM runs WHERE id = ?", (int(run),)
+            ).fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT * FROM runs WHERE file_path = ?", (os.path.abspath(run),)
+            ).fetchone()
+        if row is None:
+            raise KeyError(
+                "Run {0} is not in the registry {1}".format(run, self.db_path)
+            )
+        run_dict = dict(row)
+        run_dict["metrics"] = json.loads(run_dict["metrics"])
+        run_dict["fim"] = json.loads(run_dict["fim"])
+        run_dict["logs"] = [
+            dict(log_row)
+            for log_row in self.connection.execute(
+                "SELECT log_hash, log_file FROM logs WHERE run_id = ?", (row["id"],)
+            )
+        ]
+        run_dict["coefficients"] = {}
+        run_dict["cramer_rao_bounds"] = {}
+        for coef_row in self.connection.execute(
+            "SELECT name, value, cramer_rao_bound FROM coefficients WHERE run_id = ?",
+            (row["id"],),
+        ):
+            run_dict["coefficients"][coef_row["name"]] = coef_row["value"]
+            run_dict["cramer_rao_bounds"][coef_row["name"]] = coef_row[
+                "cramer_rao_bound"
+            ]
+        return run_dict
+
+    def diff(self, run_a, run_b):
+        """
+        Compare the coefficients of two runs.
+
+        Returns:
+        diff_list: one dict per coefficient of either run with the values a and b (None if
+            the run lacks the coefficient), the difference b - a and the difference in units
+            of the combined Cramer-Rao bounds (z, None if a bound is unknown)
+        """
+        run_a = self.get_run(run_a)
+        run_b = self.get_run(run_b)
+        names = list(run_a["coefficients"]) + [
+            name for name in run_b["coefficients"] if name not in run_a["coefficients"]
+        ]
+        diff_list = []
+        for name in names:
+            a = run_a["coefficients"].get(name)
+            b = run_b["coefficients"].get(name)
+            delta = b - a if a is not None and b is not None else None
+            bound_a = run_a["cramer_rao_bounds"].get(name)
+            bound_b = run_b["cramer_rao_bounds"].get(name)
+            z = None
+            if delta is not None and bound_a is not None and bound_b is not None:
+                bound = math.hypot(bound_a, bound_b)
+                z = delta / bound if bound > 0.0 else None
+            diff_list.append({"name": name, "a": a, "b": b, "delta": delta, "z": z})
+        return diff_list
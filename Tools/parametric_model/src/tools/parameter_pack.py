@@ -0,0 +1,308 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Binary parameter pack (.ddp) of an identified model, e.g. for the Gazebo plugin.
+
+Layout:
+- 8 byte magic string
+- header length as little endian uint64
+- JSON header, padded such that the data starts at a multiple of 64 bytes, with
+    - version: format version, readers reject newer versions
+    - model_name, model_class: identification of the model
+    - coefficient_names: name table of the coefficient array
+    - rotor_groups: list of rotor groups (name, rotor types, descriptions, input and tilt
+      actuator columns of the rotors), in the order of the rotor geometry block
+    - rotor_fields: columns of the rotor geometry block
+    - model: remaining scalar model settings (e.g. wing area) and metrics
+- little endian float64 coefficient array in the order of the name table
+- little endian float64 rotor geometry block, one row of rotor_fields per rotor, nan if a
+  field is not defined for a rotor
+
+Rotor settings without a field are rejected when a pack is written. The arrays are memory
+mapped on loading.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import json
+import math
+import numbers
+import struct
+import numpy as np
+
+FILE_EXTENSION = ".ddp"
+MAGIC = b"DDDPARM1"
+VERSION = 2
+DATA_ALIGNMENT = 64
+# rotor settings saved in the rotor geometry block, vectors as one field per component
+ROTOR_VECTOR_KEYS = ["position", "rotor_axis", "tilt_axis"]
+ROTOR_SCALAR_KEYS = ["turning_direction", "max_tilt_angle_deg", "diameter"]
+ROTOR_FIELDS = [
+    "position_x",
+    "position_y",
+    "position_z",
+    "rotor_axis_x",
+    "rotor_axis_y",
+    "rotor_axis_z",
+    "turning_direction",
+    "tilt_axis_x",
+    "tilt_axis_y",
+    "tilt_axis_z",
+    "max_tilt_angle_deg",
+    "diameter",
+]
+# rotor settings saved in the rotor groups of the header, as list of the group rotors
+ROTOR_STRING_KEYS = {
+    "description": "descriptions",
+    "dataframe_name": "dataframe_names",
+    "tilt_actuator_dataframe_name": "tilt_actuator_dataframe_names",
+}
+# required header entries and their types
+HEADER_SCHEMA = {
+    "version": int,
+    "model_name": str,
+    "model_class": (str, type(None)),
+    "dtype": str,
+    "coefficient_names": list,
+    "rotor_groups": list,
+    "rotor_fields": list,
+    "model": dict,
+    "metrics": dict,
+}
+
+
+def is_rotor_group(value):
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(rotor, dict) and "rotor_type" in rotor for rotor in value)
+    )
+
+
+def get_rotor_row(rotor_config_dict):
+    # keys without value are labels of the list entries, e.g. "- rotor_0:" in the configs
+    unknown_keys = {
+        key for key, value in rotor_config_dict.items() if value is not None
+    } - set(
+        ["rotor_type"] + ROTOR_VECTOR_KEYS + ROTOR_SCALAR_KEYS + list(ROTOR_STRING_KEYS)
+    )
+    if unknown_keys:
+        raise ValueError(
+            "Rotor settings not supported by the parameter pack: "
+            + ", ".join(sorted(unknown_keys))
+        )
+    field_values = {}
+    for key in ROTOR_VECTOR_KEYS:
+        vec = rotor_config_dict.get(key, [math.nan] * 3)
+        field_values.update({key + "_" + k: vec[i] for i, k in enumerate("xyz")})
+    for key in ROTOR_SCALAR_KEYS:
+        field_values[key] = rotor_config_dict.get(key, math.nan)
+    return [field_values[field] for field in ROTOR_FIELDS]
+
+
+def check_parameter_pack_header(header):
+    """Raise a ValueError if the header does not match the schema of the format."""
+    for key, value_type in HEADER_SCHEMA.items():
+        if key not in header:
+            raise ValueError("Parameter pack header misses the entry: " + key)
+        if not isinstance(header[key], value_type):
+            raise ValueError("Parameter pack header entry has a wrong type: " + key)
+    if header["version"] > VERSION:
+        raise ValueError(
+            "Parameter pack version {0} is not supported (<= {1})".format(
+                header["version"], VERSION
+            )
+        )
+    if header["dtype"] != "<f8":
+        raise ValueError("Parameter pack dtype not supported: " + header["dtype"])
+    names = header["coefficient_names"]
+    if not all(isinstance(name, str) for name in names) or len(set(names)) != len(
+        names
+    ):
+        raise ValueError("Parameter pack coefficient names are not unique strings")
+    for group in header["rotor_groups"]:
+        if not isinstance(group.get("name"), str) or not isinstance(
+            group.get("rotor_types"), list
+        ):
+            raise ValueError("Parameter pack rotor group is malformed")
+
+
+def save_parameter_pack(file_path, result_dict, model_name, model_class=None):
+    """
+    Write the coefficients and rotor geometry of a model result to a parameter pack.
+
+    Inputs:
+    file_path: path of the pack file
+    result_dict: model results as saved to yaml by the DynamicsModel, with the
+        coefficients and the model dict
+    model_name: name of the model, e.g. DynamicsModel.model_name
+    model_class: optional model class of the config
+    """
+    coefficient_names = sorted(result_dict["coefficients"].keys())
+    coefficient_vec = np.array(
+        [result_dict["coefficients"][coef] for coef in coefficient_names], dtype="<f8"
+    )
+    if not np.all(np.isfinite(coefficient_vec)):
+        raise ValueError("Parameter pack coefficients need to be finite")
+
+    rotor_groups = []
+    rotor_rows = []
+    model_dict = {}
+    for key, value in result_dict.get("model", {}).items():
+        if is_rotor_group(value):
+            rotor_group = {
+                "name": key,
+                "rotor_types": [rotor["rotor_type"] for rotor in value],
+            }
+            for rotor_key, group_key in ROTOR_STRING_KEYS.items():
+                rotor_group[group_key] = [rotor.get(rotor_key, "") for rotor in value]
+            rotor_groups.append(rotor_group)
+            rotor_rows += [get_rotor_row(rotor) for rotor in value]
+        elif isinstance(value, (numbers.Number, str)) or value is None:
+            model_dict[key] = value
+    rotor_mat = np.array(rotor_rows, dtype="<f8").reshape((-1, len(ROTOR_FIELDS)))
+
+    header = {
+        "version": VERSION,
+        "model_name": model_name,
+        "model_class": model_class,
+        "dtype": "<f8",
+        "coefficient_names": coefficient_names,
+        "rotor_groups": rotor_groups,
+        "rotor_fields": ROTOR_FIELDS,
+        "model": model_dict,
+        "metrics": {
+            key: float(value)
+            for key, value in result_dict.get("metrics", {}).items()
+            if isinstance(value, numbers.Number)
+        },
+    }
+    check_parameter_pack_header(header)
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_end = len(MAGIC) + 8 + len(header_bytes)
+    header_bytes += b" " * (-header_end % DATA_ALIGNMENT)
+
+    with open(file_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<Q", len(header_bytes)))
+        file.write(header_bytes)
+        coefficient_vec.tofile(file)
+        rotor_mat.tofile(file)
+
+
+def read_parameter_pack_header(file_path):
+    """
+    Returns:
+    header: dict of the JSON header, checked against the schema
+    data_offset: byte offset of the coefficient array
+    """
+    with open(file_path, "rb") as file:
+        magic = file.read(len(MAGIC))
+        if magic != MAGIC:
+            raise TypeError("Not a parameter pack: " + str(file_path))
+        (header_length,) = struct.unpack("<Q", file.read(8))
+        header = json.loads(file.read(header_length).decode("utf-8"))
+    check_parameter_pack_header(header)
+    return header, len(MAGIC) + 8 + header_length
+
+
+def load_parameter_pack(file_path, mmap_mode="r"):
+    """
+    Memory map a parameter pack.
+
+    Returns:
+    header: dict of the JSON header
+    coefficient_vec: numpy array of shape (n_coefficients,) in the order of
+        header["coefficient_names"]
+    rotor_mat: numpy array of shape (n_rotors, len(header["rotor_fields"]))
+    """
+    header, data_offset = read_parameter_pack_header(file_path)
+    n_coefficients = len(header["coefficient_names"])
+    n_rotors = sum(len(group["rotor_types"]) for group in header["rotor_groups"])
+    n_fields = len(header["rotor_fields"])
+    data = np.memmap(
+        file_path,
+        dtype=header["dtype"],
+        mode=mmap_mode,
+        offset=data_offset,
+        shape=(n_coefficients + n_rotors * n_fields,),
+    )
+    coefficient_vec = data[:n_coefficients]
+    rotor_mat = data[n_coefficients:].reshape((n_rotors, n_fields))
+    return header, coefficient_vec, rotor_mat
+
+
+def load_result_dict(file_path):
+    """
+    Read a parameter pack into a dict like the model results yaml file, with the
+    coefficients, the model (including the rotor groups) and the metrics.
+    """
+    header, coefficient_vec, rotor_mat = load_parameter_pack(file_path)
+    model_dict = dict(header["model"])
+    field_index = {field: i for i, field in enumerate(header["rotor_fields"])}
+    i = 0
+    for group in header["rotor_groups"]:
+        rotor_list = []
+        for j, rotor_type in enumerate(group["rotor_types"]):
+            rotor_row = rotor_mat[i]
+            rotor_dict = {
+                "rotor_type": rotor_type,
+                "description": group["descriptions"][j],
+                "dataframe_name": group["dataframe_names"][j],
+            }
+            # packs of version 1 have no tilt settings
+            tilt_actuator_names = group.get("tilt_actuator_dataframe_names")
+            if tilt_actuator_names and tilt_actuator_names[j]:
+                rotor_dict["tilt_actuator_dataframe_name"] = tilt_actuator_names[j]
+            for name in ROTOR_VECTOR_KEYS:
+                if name + "_x" not in field_index:
+                    continue
+                vec = [float(rotor_row[field_index[name + "_" + k]]) for k in "xyz"]
+                if not np.any(np.isnan(vec)):
+                    rotor_dict[name] = vec
+            for name in ROTOR_SCALAR_KEYS:
+                if name not in field_index:
+                    continue
+                value = float(rotor_row[field_index[name]])
+                if not math.isnan(value):
+                    rotor_dict[name] = value
+            rotor_list.append(rotor_dict)
+            i += 1
+        model_dict[group["name"]] = rotor_list
+    return {
+        "coefficients": dict(
+            zip(header["coefficient_names"], coefficient_vec.tolist())
+        ),
+        "model": model_dict,
+        "metrics": dict(header["metrics"]),
+    }
@@ -0,0 +1,183 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Sufficient statistics of the linear least squares problem X * c = y. Once the statistics
+of a data subset are known, the problem restricted to any union of subsets can be solved
+and scored without touching the regression matrix again.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import math
+import numpy as np
+
+
+class RegressionStatistics:
+    def __init__(self, gram, moment, y_sq_sum, y_sum, n_samples):
+        """
+        Inputs:
+        gram: X^T X, numpy array of shape (p, p)
+        moment: X^T y, numpy array of shape (p,)
+        y_sq_sum: y^T y
+        y_sum: sum of all entries of y
+        n_samples: number of rows of X
+        """
+        self.gram = gram
+        self.moment = moment
+        self.y_sq_sum = y_sq_sum
+        self.y_sum = y_sum
+        self.n_samples = n_samples
+
+    @classmethod
+    def from_data(cls, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float).flatten()
+        return cls(X.T @ X, X.T @ y, float(y @ y), float(np.sum(y)), y.shape[0])
+
+    @classmethod
+    def zeros(cls, n_coef):
+        return cls(np.zeros((n_coef, n_coef)), np.zeros(n_coef), 0.0, 0.0, 0)
+
+    def __add__(self, other):
+        return RegressionStatistics(
+            self.gram + other.gram,
+            self.moment + other.moment,
+            self.y_sq_sum + other.y_sq_sum,
+            self.y_sum + other.y_sum,
+            self.n_samples + other.n_samples,
+        )
+
+    def __sub__(self, other):
+        return RegressionStatistics(
+            self.gram - other.gram,
+            self.moment - other.moment,
+            self.y_sq_sum - other.y_sq_sum,
+            self.y_sum - other.y_sum,
+            self.n_samples - other.n_samples,
+        )
+
+    def save(self, file_path, coef_name_list):
+        """Save the statistics together with the coefficient names to a npz file."""
+        np.savez(
+            file_path,
+            gram=self.gram,
+            moment=self.moment,
+            y_sq_sum=self.y_sq_sum,
+            y_sum=self.y_sum,
+            n_samples=self.n_samples,
+            coef_name_list=np.array(coef_name_list, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, file_path, coef_name_list):
+        """
+        Load statistics saved with save, reordered to the coefficients of coef_name_list.
+        Raises a ValueError if the saved statistics belong to other coefficients.
+        """
+        with np.load(file_path) as data:
+            saved_name_list = data["coef_name_list"].tolist()
+            if sorted(saved_name_list) != sorted(coef_name_list):
+                raise ValueError(
+                    "Regression statistics {0} belong to other coefficients".format(
+                        file_path
+                    )
+                )
+            order = [saved_name_list.index(coef) for coef in coef_name_list]
+            return cls(
+                data["gram"][np.ix_(order, order)],
+                data["moment"][order],
+                float(data["y_sq_sum"]),
+                float(data["y_sum"]),
+                int(data["n_samples"]),
+            )
+
+    def sse(self, c):
+        """Sum of squared residuals (X * c - y)^T (X * c - y) for the coefficients c."""
+        c = np.asarray(c, dtype=float).flatten()
+        sse = self.y_sq_sum - 2 * c @ self.moment + c @ self.gram @ c
+        return max(float(sse), 0.0)
+
+    def compute_metrics(self, c):
+        if self.n_samples == 0:
+            return {"R2": float("nan"), "RMSE": float("nan")}
+        sse = self.sse(c)
+        sst = self.y_sq_sum - self.y_sum**2 / self.n_samples
+        r2 = 1.0 - sse / sst if sst > 0.0 else float("nan")
+        return {"R2": float(r2), "RMSE": math.sqrt(sse / self.n_samples)}
+
+
+def compute_contiguous_folds(timestamps, n_folds, gap_factor=5.0, segment_ids=None):
+    """
+    Assign every sample to one of n_folds folds made of contiguous blocks of data.
+
+    Neighbouring samples of a flight log are strongly correlated, randomly shuffled folds
+    would therefore leak information into the validation set. If the data consists of several
+    flight segments (detected by gaps in the timestamps) and there are at least as many
+    segments as folds, complete segments are assigned to the folds. Otherwise the samples are
+    split into n_folds blocks of consecutive samples.
+
+    Inputs:
+    timestamps: numpy array of shape (n,) with the timestamps of the samples
+    n_folds: number of folds
+    segment_ids: optional numpy array of shape (n,) with known segment ids (e.g. from
+        dataframe_tools.extract_segments), replaces the detection from timestamp gaps
+
+    Returns:
+    fold_vec: numpy array of shape (n,) with the fold index of each sample
+    """
+    timestamps = np.asarray(timestamps, dtype=float).flatten()
+    n_samples = timestamps.shape[0]
+    assert n_folds >= 2, "Cross validation requires at least two folds"
+    assert (
+        n_samples >= n_folds
+    ), "Cross validation requires at least as many samples as folds"
+
+    position = np.arange(n_samples, dtype=float)
+    dt = np.diff(timestamps)
+    if dt.shape[0] > 0:
+        nominal_dt = np.median(dt[dt > 0]) if np.any(dt > 0) else 0.0
+        if segment_ids is not None:
+            segment_breaks = np.diff(np.asarray(segment_ids)) != 0
+        else:
+            segment_breaks = (dt <= 0) | (dt > gap_factor * nominal_dt)
+        segment_starts = np.concatenate(([0], np.flatnonzero(segment_breaks) + 1))
+        if segment_starts.shape[0] >= n_folds:
+            segment_ends = np.append(segment_starts[1:], n_samples)
+            segment_centers = 0.5 * (segment_starts + segment_ends - 1)
+            position = np.repeat(segment_centers, segment_ends - segment_starts)
+
+    fold_vec = np.minimum((position * n_folds / n_samples).astype(int), n_folds - 1)
+    if np.unique(fold_vec).shape[0] < n_folds:
+        # segments too unbalanced, fall back to blocks of consecutive samples
+        fold_vec = (np.arange(n_samples) * n_folds) // n_samples
+    return fold_vec
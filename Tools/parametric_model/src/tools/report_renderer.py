@@ -0,0 +1,314 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Headless rendering of diagnostic plots to a directory of png files with an html index.
+
+A report consists of figure specs, plain dicts with the name, title, kind and data of a
+figure. The data is reduced in the calling process before rendering, so that the rendering
+cost and the data sent to the worker processes do not grow with the number of samples:
+
+- time series are reduced to the min/max envelope per pixel column
+- scatter plots are replaced by 2-D histograms
+
+The figures are drawn with the Agg backend in parallel worker processes.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import concurrent.futures
+import html
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FIGURE_SIZE = (12.0, 8.0)
+DPI = 100
+# pixel columns of a time series axis
+N_COLUMNS = int(FIGURE_SIZE[0] * DPI)
+HISTOGRAM_BINS = 200
+
+
+def minmax_envelope(x, y, n_columns=N_COLUMNS):
+    """
+    Reduce a time series to the minimum and maximum of every pixel column. Drawing the
+    reduced series as a line looks the same as drawing all samples.
+
+    Inputs:
+    x: numpy array of shape (n,), e.g. timestamps
+    y: numpy array of shape (n,)
+    n_columns: number of pixel columns along the x axis
+
+    Returns:
+    x_env, y_env: numpy arrays of at most 2 * n_columns points
+    """
+    x = np.asarray(x, dtype=float).flatten()
+    y = np.asarray(y, dtype=float).flatten()
+    if x.shape[0] <= 2 * n_columns:
+        return x, y
+    if np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind="stable")
+        x = x[order]
+        y = y[order]
+    x_range = x[-1] - x[0]
+    if x_range <= 0:
+        columns = np.zeros(x.shape[0], dtype=int)
+    else:
+        columns = np.minimum(
+            ((x - x[0]) * (n_columns / x_range)).astype(int), n_columns - 1
+        )
+    starts = np.flatnonzero(np.concatenate(([True], np.diff(columns) != 0)))
+    y_env = np.column_stack(
+        (np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts))
+    ).flatten()
+    return np.repeat(x[starts], 2), y_env
+
+
+def histogram_2d(x, y, bins=HISTOGRAM_BINS):
+    """2-D histogram replacing a scatter plot, empty bins are nan (not drawn)."""
+    x = np.asarray(x, dtype=float).flatten()
+    y = np.asarray(y, dtype=float).flatten()
+    valid = np.isfinite(x) & np.isfinite(y)
+    counts, x_edges, y_edges = np.histogram2d(x[valid], y[valid], bins=bins)
+    counts[counts == 0] = np.nan
+    return {"counts": counts, "x_edges": x_edges, "y_edges": y_edges}
+
+
+def time_series_spec(name, title, timestamps, signal_dict, ylabels, xlabel="time [s]"):
+    """
+    Figure spec with one subplot per entry of ylabels.
+
+    Inputs:
+    timestamps: numpy array of shape (n,)
+    signal_dict: dict of label: numpy array of shape (n, len(ylabels))
+    """
+    subplots = []
+    for i, ylabel in enumerate(ylabels):
+        lines = []
+        for label, signal_mat in signal_dict.items():
+            signal_mat = np.asarray(signal_mat, dtype=float).reshape((-1, len(ylabels)))
+            x_env, y_env = minmax_envelope(timestamps, signal_mat[:, i])
+            lines.append({"x": x_env, "y": y_env, "label": label})
+        subplots.append({"ylabel": ylabel, "lines": lines})
+    return {
+        "name": name,
+        "title": title,
+        "kind": "time_series",
+        "data": {"subplots": subplots, "xlabel": xlabel},
+    }
+
+
+def scatter_3d_spec(name, title, data_mat, labels):
+    """Figure spec with the 2-D histograms of the three projections of a 3-D point cloud."""
+    data_mat = np.asarray(data_mat, dtype=float)
+    panels = []
+    for i, j in [(0, 1), (0, 2), (1, 2)]:
+        panel = histogram_2d(data_mat[:, i], data_mat[:, j])
+        panel.update({"xlabel": labels[i], "ylabel": labels[j]})
+        panels.append(panel)
+    return {
+        "name": name,
+        "title": title,
+        "kind": "histogram_2d",
+        "data": {"panels": panels},
+    }
+
+
+def matrix_spec(name, title, matrix, labels):
+    """Figure spec of a (correlation) matrix with values between -1 and 1."""
+    return {
+        "name": name,
+        "title": title,
+        "kind": "matrix",
+        "data": {"matrix": np.atleast_2d(matrix), "labels": list(labels)},
+    }
+
+
+def pyplot_function_spec(name, title, module, function, *args):
+    """
+    Figure spec drawn by an existing pyplot based plot function, which is called with args
+    in the worker process. The args should already be reduced in size.
+    """
+    return {
+        "name": name,
+        "title": title,
+        "kind": "pyplot_function",
+        "data": {"module": module, "function": function, "args": args},
+    }
+
+
+def _draw_time_series(fig, data):
+    subplots = data["subplots"]
+    axes = fig.subplots(len(subplots), 1, sharex=True, squeeze=False)[:, 0]
+    for ax, subplot in zip(axes, subplots):
+        for line in subplot["lines"]:
+            ax.plot(line["x"], line["y"], label=line["label"], linewidth=0.8)
+        ax.set_ylabel(subplot["ylabel"])
+    axes[0].legend(loc="upper right")
+    axes[-1].set_xlabel(data["xlabel"])
+
+
+def _draw_histogram_2d(fig, data):
+    from matplotlib.colors import LogNorm
+
+    panels = data["panels"]
+    axes = fig.subplots(1, len(panels), squeeze=False)[0, :]
+    for ax, panel in zip(axes, panels):
+        mesh = ax.pcolormesh(
+            panel["x_edges"], panel["y_edges"], panel["counts"].T, norm=LogNorm()
+        )
+        ax.set_xlabel(panel["xlabel"])
+        ax.set_ylabel(panel["ylabel"])
+    fig.colorbar(mesh, ax=list(axes), label="samples")
+
+
+def _draw_matrix(fig, data):
+    ax = fig.subplots()
+    image = ax.imshow(data["matrix"], vmin=-1.0, vmax=1.0, cmap="coolwarm")
+    n = len(data["labels"])
+    ax.set_xticks(range(n))
+    ax.set_yticks(range(n))
+    ax.set_xticklabels(data["labels"], rotation=90, fontsize="small")
+    ax.set_yticklabels(data["labels"], fontsize="small")
+    fig.colorbar(image, ax=ax)
+
+
+_DRAW_FUNCTIONS = {
+    "time_series": _draw_time_series,
+    "histogram_2d": _draw_histogram_2d,
+    "matrix": _draw_matrix,
+}
+
+
+def render_figure(spec, output_dir):
+    """Draw one figure spec with the Agg backend and save it as png."""
+    file_path = os.path.join(output_dir, spec["name"] + ".png")
+    if spec["kind"] == "pyplot_function":
+        # a process that already uses pyplot keeps its (interactive) backend
+        if "matplotlib.pyplot" not in sys.modules:
+            import matplotlib
+
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        module = importlib.import_module(spec["data"]["module"])
+        getattr(module, spec["data"]["function"])(*spec["data"]["args"])
+        fig = plt.gcf()
+        fig.set_size_inches(FIGURE_SIZE)
+        fig.tight_layout()
+        fig.savefig(file_path, dpi=DPI)
+        plt.close(fig)
+    else:
+        # the object oriented interface does not touch the pyplot backend
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=FIGURE_SIZE, constrained_layout=True)
+        _DRAW_FUNCTIONS[spec["kind"]](fig, spec["data"])
+        fig.suptitle(spec["title"])
+        fig.savefig(file_path, dpi=DPI)
+    return file_path
+
+
+def write_html_index(output_dir, title, figure_specs, summary_dict=None):
+    lines = [
+        "<!DOCTYPE html>",
+        "<html>",
+        "<head><meta charset='utf-8'><title>{0}</title></head>".format(
+            html.escape(title)
+        ),
+        "<body>",
+        "<h1>{0}</h1>".format(html.escape(title)),
+    ]
+    for section, values in (summary_dict or {}).items():
+        lines.append("<h2>{0}</h2>".format(html.escape(str(section))))
+        lines.append("<table>")
+        for key, value in values.items():
+            lines.append(
+                "<tr><td>{0}</td><td>{1}</td></tr>".format(
+                    html.escape(str(key)), html.escape(str(value))
+                )
+            )
+        lines.append("</table>")
+    for spec in figure_specs:
+        lines.append(
+            "<figure><img src='{0}.png' width='100%'><figcaption>{1}</figcaption>"
+            "</figure>".format(html.escape(spec["name"]), html.escape(spec["title"]))
+        )
+    lines += ["</body>", "</html>"]
+    file_path = os.path.join(output_dir, "index.html")
+    with open(file_path, "w") as outfile:
+        outfile.write("\n".join(lines) + "\n")
+    return file_path
+
+
+def render_report(
+    figure_specs, output_dir, title="Report", summary_dict=None, n_workers=None
+):
+    """
+    Render all figure specs to png files in output_dir and write an index.html.
+
+    Inputs:
+    figure_specs: list of figure specs, see the *_spec functions
+    output_dir: directory of the report, created if needed
+    summary_dict: optional dict of section: dict of key: value, shown as tables
+    n_workers: number of worker processes, defaults to the number of cpus, 1 renders in
+        the calling process
+
+    Returns:
+    file path of the html index
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = max(min(n_workers, len(figure_specs)), 1)
+    if n_workers == 1:
+        for spec in figure_specs:
+            render_figure(spec, output_dir)
+    else:
+        # spawned workers do not inherit an interactive backend of the calling process
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(render_figure, spec, output_dir)
+                for spec in figure_specs
+            ]
+            for future in futures:
+                future.result()
+    file_path = write_html_index(output_dir, title, figure_specs, summary_dict)
+    logger.info("Report saved to: %s", file_path, extra={"file_path": file_path})
+    return file_path
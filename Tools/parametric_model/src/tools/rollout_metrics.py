@@ -0,0 +1,174 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Open loop prediction error of an identified model. The logged actuator inputs are replayed
+from many start points of the log, all windows are simulated as one batch by the
+ForwardSimulator, so every Runge-Kutta stage evaluates the features of all windows at once.
+The velocity, attitude and angular velocity errors are reported over the horizon.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import logging
+import os
+import time
+import numpy as np
+import yaml
+from src.tools.logging_tools import log_section
+
+logger = logging.getLogger(__name__)
+
+
+def compute_window_starts(timestamps, n_steps, stride=1, gap_factor=1.5):
+    """
+    Start indices of the windows of n_steps + 1 consecutive samples without gaps.
+
+    Inputs:
+    timestamps: numpy array of shape (n,)
+    n_steps: number of simulated steps per window
+    stride: number of samples between the starts of neighbouring windows
+    gap_factor: time steps longer than gap_factor times the median time step are gaps
+
+    Returns:
+    numpy array of the window start indices
+    """
+    timestamps = np.asarray(timestamps, dtype=float).flatten()
+    n_samples = timestamps.shape[0]
+    if n_samples <= n_steps:
+        return np.zeros(0, dtype=int)
+    dt = np.diff(timestamps)
+    nominal_dt = np.median(dt)
+    gap_count = np.concatenate(
+        ([0], np.cumsum((dt <= 0) | (dt > gap_factor * nominal_dt)))
+    )
+    starts = np.arange(0, n_samples - n_steps, max(int(stride), 1))
+    return starts[gap_count[starts + n_steps] == gap_count[starts]]
+
+
+def attitude_error(q_mat, q_ref_mat):
+    """Rotation angle [rad] between the quaternions of the last axis of both arrays."""
+    dot = np.abs(np.sum(q_mat * q_ref_mat, axis=-1))
+    dot /= np.linalg.norm(q_mat, axis=-1) * np.linalg.norm(q_ref_mat, axis=-1)
+    return 2.0 * np.arccos(np.clip(dot, 0.0, 1.0))
+
+
+def compute_rollout_metrics(
+    simulator, data_df, horizon=1.0, stride=None, max_windows=None, dt=None
+):
+    """
+    Replay the logged inputs open loop from many start points and compare the simulated
+    with the logged states.
+
+    Inputs:
+    simulator: ForwardSimulator of the identified model
+    data_df: dataframe of the pipeline with the states and unnormalized actuator outputs
+    horizon: duration of every rollout [s]
+    stride: samples between window starts, defaults to non overlapping windows
+    max_windows: evenly thin out the windows to at most max_windows
+    dt: sample time [s], defaults to the inverse of the resample frequency of the config
+
+    Returns:
+    dict with the horizon times, the root mean square errors over all windows at every
+    step and the number of windows
+    """
+    if dt is None:
+        dt = 1.0 / simulator.model.resample_freq
+    n_steps = max(int(round(horizon / dt)), 1)
+    if stride is None:
+        stride = n_steps
+    starts = compute_window_starts(data_df["timestamp"].to_numpy(), n_steps, stride)
+    assert starts.shape[0] > 0, "The data contains no window of the rollout horizon"
+    if max_windows is not None and starts.shape[0] > max_windows:
+        starts = starts[np.linspace(0, starts.shape[0] - 1, max_windows).astype(int)]
+
+    state_mat = simulator.get_states(data_df)
+    input_mat = simulator.get_inputs(data_df)
+    window_index = starts[:, np.newaxis] + np.arange(n_steps + 1)
+    state_traces = simulator.simulate(
+        state_mat[starts], input_mat[window_index[:, :-1]], dt
+    )
+    logged_traces = state_mat[window_index]
+
+    error_dict = {
+        "velocity": np.linalg.norm(
+            state_traces[:, :, 3:6] - logged_traces[:, :, 3:6], axis=-1
+        ),
+        "attitude": attitude_error(state_traces[:, :, 6:10], logged_traces[:, :, 6:10]),
+        "angular_velocity": np.linalg.norm(
+            state_traces[:, :, 10:13] - logged_traces[:, :, 10:13], axis=-1
+        ),
+    }
+    metrics_dict = {
+        "horizon": (np.arange(n_steps + 1) * dt).tolist(),
+        "n_windows": int(starts.shape[0]),
+    }
+    for name, error_mat in error_dict.items():
+        metrics_dict[name + "_rmse"] = np.sqrt(np.mean(error_mat**2, axis=0)).tolist()
+    return metrics_dict
+
+
+def summarize_rollout_metrics(metrics_dict, n_points=5):
+    """Errors at n_points evenly spaced times of the horizon, e.g. for logging."""
+    horizon = metrics_dict["horizon"]
+    index = np.unique(np.linspace(0, len(horizon) - 1, n_points + 1).astype(int))[1:]
+    summary_dict = {}
+    for i in index:
+        summary_dict["t = {0:.3f} s".format(horizon[i])] = {
+            key[: -len("_rmse")]: float(metrics_dict[key][i])
+            for key in metrics_dict
+            if key.endswith("_rmse")
+        }
+    return summary_dict
+
+
+def log_rollout_metrics(metrics_dict):
+    log_section(logger, "Open Loop Rollout Metrics")
+    logger.info(
+        "RMSE of %d rollouts over the horizon (velocity [m/s], attitude [rad], angular"
+        " velocity [rad/s])",
+        metrics_dict["n_windows"],
+        extra={"data": summarize_rollout_metrics(metrics_dict)},
+    )
+
+
+def save_rollout_metrics_to_yaml(
+    metrics_dict, file_name="rollout_metrics", result_path="model_results/"
+):
+    timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+    file_path = os.path.join(result_path, file_name + "_" + timestr + ".yaml")
+    with open(file_path, "w") as outfile:
+        yaml.dump(metrics_dict, outfile, default_flow_style=False)
+    logger.info(
+        "Rollout metrics saved to: %s", file_path, extra={"file_path": file_path}
+    )
+    return file_path
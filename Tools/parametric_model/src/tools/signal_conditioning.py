@@ -0,0 +1,136 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Zero phase signal conditioning of uniformly resampled log data. All functions operate on
+numpy arrays of shape (n_samples, n_signals) and process all signals at once. Butterworth
+filter designs only depend on their parameters and are cached.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import functools
+import warnings
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def design_butterworth_filter(cutoff_freq, sample_freq, order=4):
+    """Second order sections of a Butterworth low pass filter."""
+    from scipy import signal
+
+    assert (
+        0.0 < cutoff_freq < 0.5 * sample_freq
+    ), "Cutoff frequency needs to be between 0 and the Nyquist frequency"
+    return signal.butter(order, cutoff_freq, btype="low", fs=sample_freq, output="sos")
+
+
+def lowpass_filter(data, cutoff_freq, sample_freq, order=4):
+    """
+    Zero phase Butterworth low pass filter applied forwards and backwards along the time axis.
+    Signals that are too short for the filter are returned unchanged.
+    """
+    data = np.asarray(data, dtype=float)
+    sos = design_butterworth_filter(float(cutoff_freq), float(sample_freq), int(order))
+    # default padding length of sosfiltfilt
+    padlen = 3 * (
+        2 * sos.shape[0] + 1 - min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum())
+    )
+    if data.shape[0] <= padlen:
+        warnings.warn(
+            "Signal too short for low pass filtering, returning unfiltered data.",
+            RuntimeWarning,
+        )
+        return data
+    from scipy import signal
+
+    return signal.sosfiltfilt(sos, data, axis=0)
+
+
+def differentiate(
+    data,
+    sample_freq,
+    method="butterworth",
+    cutoff_freq=10.0,
+    order=4,
+    window_duration=None,
+    window_length=33,
+    polyorder=3,
+):
+    """
+    Time derivative of uniformly sampled signals.
+
+    Inputs:
+    data: numpy array of shape (n_samples, n_signals)
+    sample_freq: sample frequency [Hz]
+    method: butterworth: zero phase Butterworth low pass filter with cutoff_freq [Hz] followed
+                by central differences
+            savgol: Savitzky-Golay differentiation with a window of window_length samples
+                (or window_duration seconds) and a polynomial of order polyorder
+            gradient: central differences without filtering
+    """
+    data = np.asarray(data, dtype=float)
+    dt = 1.0 / sample_freq
+    if method == "savgol":
+        if window_duration is not None:
+            window_length = int(round(window_duration * sample_freq))
+        # odd window length, at most as long as the signal
+        window_length = min(int(window_length), data.shape[0])
+        window_length -= 1 - window_length % 2
+        if window_length <= polyorder:
+            return np.gradient(data, dt, axis=0)
+        from scipy import signal
+
+        return signal.savgol_filter(
+            data,
+            window_length,
+            polyorder,
+            deriv=1,
+            delta=dt,
+            axis=0,
+            mode="interp",
+        )
+    elif method == "butterworth":
+        assert (
+            cutoff_freq is not None
+        ), "Butterworth differentiation requires a cutoff_freq"
+        return np.gradient(
+            lowpass_filter(data, cutoff_freq, sample_freq, order), dt, axis=0
+        )
+    elif method == "gradient":
+        return np.gradient(data, dt, axis=0)
+    else:
+        raise AttributeError(
+            "Differentiation method '{0}' not found, use savgol | butterworth | gradient".format(
+                method
+            )
+        )
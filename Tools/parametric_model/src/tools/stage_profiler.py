@@ -0,0 +1,219 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Lightweight wall clock, cpu time and memory instrumentation of the pipeline stages.
+
+Stages are marked with the profile_stage context manager. As long as no profiler is
+active it does nothing, so the instrumentation can stay in the code permanently:
+
+    with profile_stage("resampling"):
+        ...
+
+Nested stages are reported with their full path, e.g. "data_loading/ulog_parse". Repeated
+stages (e.g. one resampling per flight segment) are accumulated.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import contextlib
+import logging
+import os
+import platform
+import time
+import tracemalloc
+import yaml
+from src.tools.logging_tools import log_section
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_active_profiler = None
+
+
+def get_max_rss_mb():
+    """High-water mark of the resident set size of the process in MB (None if unknown)."""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if platform.system() == "Darwin":
+        return max_rss / 1024**2
+    return max_rss / 1024
+
+
+class StageProfiler:
+    def __init__(self, track_memory=False):
+        """
+        Inputs:
+        track_memory: trace python and numpy allocations with tracemalloc to report the peak
+            memory of every stage. This slows down allocation heavy python code considerably,
+            the resident set size high-water mark is always reported.
+        """
+        self.track_memory = track_memory
+        self.stage_dict = {}
+        self._stack = []
+        self._started_tracemalloc = False
+        self._start_time = None
+
+    def start(self):
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._start_time = time.perf_counter()
+        self._start_cpu_time = time.process_time()
+
+    def stop(self):
+        self.total_wall_time = time.perf_counter() - self._start_time
+        self.total_cpu_time = time.process_time() - self._start_cpu_time
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        path = "/".join([entry["path"] for entry in self._stack[-1:]] + [name])
+        entry = {"path": path, "peak": 0}
+        # registered on entry so that parents are listed before their children
+        stage_entry = self.stage_dict.setdefault(
+            path, {"calls": 0, "wall_time": 0.0, "cpu_time": 0.0}
+        )
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if len(self._stack) > 0:
+                # the peak of the parent stage up to now is kept before resetting
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            entry["start_memory"] = current
+        self._stack.append(entry)
+        start_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_time
+            cpu_time = time.process_time() - start_cpu_time
+            self._stack.pop()
+            stage_entry["calls"] += 1
+            stage_entry["wall_time"] += wall_time
+            stage_entry["cpu_time"] += cpu_time
+            if "start_memory" in entry and tracemalloc.is_tracing():
+                peak = max(entry["peak"], tracemalloc.get_traced_memory()[1])
+                if len(self._stack) > 0:
+                    self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+                stage_entry["peak_memory_mb"] = max(
+                    stage_entry.get("peak_memory_mb", 0.0),
+                    (peak - entry["start_memory"]) / 1024**2,
+                )
+            max_rss = get_max_rss_mb()
+            if max_rss is not None:
+                stage_entry["max_rss_mb"] = max_rss
+
+    def get_report(self):
+        report = {
+            "stages": {
+                path: {
+                    key: round(value, 6) if isinstance(value, float) else value
+                    for key, value in stage_entry.items()
+                }
+                for path, stage_entry in self.stage_dict.items()
+            },
+            "max_rss_mb": get_max_rss_mb(),
+            "cpu_count": os.cpu_count(),
+            "python_version": platform.python_version(),
+        }
+        if hasattr(self, "total_wall_time"):
+            report["total_wall_time"] = round(self.total_wall_time, 6)
+            report["total_cpu_time"] = round(self.total_cpu_time, 6)
+        return report
+
+    def log_report(self):
+        log_section(logger, "Stage Profile")
+        table = [
+            "{:<50}{:>6}{:>11}{:>14}".format(
+                "stage",
+                "calls",
+                "wall [s]",
+                "peak [MB]" if self.track_memory else "max rss [MB]",
+            )
+        ]
+        for path, stage_entry in self.stage_dict.items():
+            peak = stage_entry.get("peak_memory_mb", stage_entry.get("max_rss_mb"))
+            table.append(
+                "{:<50}{:>6}{:>11.3f}{:>14.1f}".format(
+                    "  " * path.count("/") + path.split("/")[-1],
+                    stage_entry["calls"],
+                    stage_entry["wall_time"],
+                    float("nan") if peak is None else peak,
+                )
+            )
+        if hasattr(self, "total_wall_time"):
+            table.append("{:<56}{:>11.3f}".format("total", self.total_wall_time))
+        logger.info("\n".join(table), extra={"profile": self.get_report()})
+
+    def save_report_to_yaml(self, file_name="profile", result_path="model_results/"):
+        timestr = time.strftime("%Y-%m-%d-%H-%M-%S")
+        file_path = os.path.join(result_path, file_name + "_" + timestr + ".yaml")
+        with open(file_path, "w") as outfile:
+            yaml.dump(self.get_report(), outfile, default_flow_style=False)
+        logger.info(
+            "Profiling report saved to: %s", file_path, extra={"file_path": file_path}
+        )
+        return file_path
+
+
+def start_profiling(track_memory=False):
+    """Activate a new profiler for all profile_stage calls and return it."""
+    global _active_profiler
+    _active_profiler = StageProfiler(track_memory=track_memory)
+    _active_profiler.start()
+    return _active_profiler
+
+
+def stop_profiling():
+    """Deactivate the current profiler and return it (None if none was active)."""
+    global _active_profiler
+    profiler = _active_profiler
+    _active_profiler = None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def profile_stage(name):
+    if _active_profiler is None:
+        return contextlib.nullcontext()
+    return _active_profiler.stage(name)
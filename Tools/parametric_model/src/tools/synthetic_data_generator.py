@@ -0,0 +1,395 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+
+Generation of synthetic flight data from an identified model.
+
+The flight states (actuator outputs and setpoints, body velocity and attitude) follow
+configurable excitation signals. The measured forces and moments are computed with the
+feature code of the model (rotor and aerodynamic models) and a set of known coefficients,
+converted to the accelerometer and angular acceleration measurements and perturbed by sensor
+noise. The states are prescribed and not integrated, the generated data is therefore a
+consistent regression problem with known solution but not a simulated trajectory.
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import copy
+import numpy as np
+import pandas as pd
+import yaml
+from scipy.spatial.transform import Rotation
+from src.models.model_config import ModelConfig
+
+# Default excitation of the signal groups, see SyntheticDataGenerator.generate
+DEFAULT_EXCITATION = {
+    "actuators": {
+        "signal": "chirp",
+        "amplitude": 0.15,
+        "f_start": 0.05,
+        "f_end": 3.0,
+        "sweep_duration": 60.0,
+    },
+    "setpoints": {
+        "signal": "doublet",
+        "amplitude": 0.3,
+        "period": 6.0,
+        "pulse_duration": 0.5,
+    },
+    "velocity": {
+        "signal": "chirp",
+        "offset": [0.0, 0.0, 0.0],
+        "amplitude": [4.0, 4.0, 2.0],
+        "f_start": 0.02,
+        "f_end": 0.5,
+        "sweep_duration": 120.0,
+    },
+    "attitude": {
+        "signal": "chirp",
+        "offset": [0.0, 0.0, 0.0],
+        "amplitude": [0.3, 0.3, 1.0],
+        "f_start": 0.02,
+        "f_end": 1.0,
+        "sweep_duration": 90.0,
+    },
+}
+
+# trim airspeed [m/s] in body x direction of models with wings
+FORWARD_FLIGHT_AIRSPEED = 15.0
+
+# inputs in [0, 1], all other inputs are in [-1, 1]
+UNIPOLAR_ACTUATOR_TYPES = ["motor"]
+UNIPOLAR_INPUTS = ["throttle"]
+
+STATE_COLUMNS = {
+    "velocity": ["vx", "vy", "vz"],
+    "attitude": ["q0", "q1", "q2", "q3"],
+    "angular_velocity": ["ang_vel_x", "ang_vel_y", "ang_vel_z"],
+    "acceleration": ["acc_b_x", "acc_b_y", "acc_b_z"],
+    "angular_acceleration": ["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"],
+}
+
+
+def chirp_signal(t, f_start, f_end, sweep_duration, time_shift=0.0):
+    """
+    Unit amplitude frequency sweep from f_start to f_end and back within sweep_duration [s],
+    repeated for longer time vectors. The phase is integrated, the signal stays continuous.
+    """
+    sweep_position = np.mod(t + time_shift, sweep_duration) / sweep_duration
+    frequency = f_start + (f_end - f_start) * (1.0 - np.abs(2.0 * sweep_position - 1.0))
+    dt = np.diff(t, prepend=t[0])
+    phase = 2.0 * np.pi * np.cumsum(frequency * dt)
+    return np.sin(phase)
+
+
+def doublet_signal(t, period, pulse_duration, time_shift=0.0):
+    """
+    Unit amplitude doublets (+1 for pulse_duration, -1 for pulse_duration, then 0) repeated
+    every period [s].
+    """
+    position = np.mod(t + time_shift, period)
+    signal = np.zeros(t.shape)
+    signal[position < pulse_duration] = 1.0
+    signal[(position >= pulse_duration) & (position < 2 * pulse_duration)] = -1.0
+    return signal
+
+
+def excitation_signal(t, spec, channel=0, n_channels=1):
+    """
+    Evaluate the excitation spec for one channel of a group. The channels of a group are
+    shifted in time (chirp, doublet) or phase (sine) against each other, so that their
+    excitation is not correlated.
+    """
+    offset = spec.get("offset", 0.0)
+    amplitude = spec.get("amplitude", 0.0)
+    if isinstance(offset, (list, tuple)):
+        offset = offset[channel]
+    if isinstance(amplitude, (list, tuple)):
+        amplitude = amplitude[channel]
+
+    signal_type = spec.get("signal", "constant")
+    if signal_type == "chirp":
+        sweep_duration = spec.get("sweep_duration", 60.0)
+        unit_signal = chirp_signal(
+            t,
+            spec.get("f_start", 0.1),
+            spec.get("f_end", 2.0),
+            sweep_duration,
+            time_shift=channel * sweep_duration / n_channels,
+        )
+    elif signal_type == "doublet":
+        period = spec.get("period", 5.0)
+        unit_signal = doublet_signal(
+            t,
+            period,
+            spec.get("pulse_duration", 0.5),
+            time_shift=-channel * period / n_channels,
+        )
+    elif signal_type == "sine":
+        unit_signal = np.sin(
+            2 * np.pi * spec.get("frequency", 1.0) * t
+            + 2 * np.pi * channel / n_channels
+        )
+    elif signal_type == "constant":
+        unit_signal = np.zeros(t.shape)
+    else:
+        raise ValueError("Unknown excitation signal: " + str(signal_type))
+    return offset + amplitude * unit_signal
+
+
+class SyntheticDataGenerator:
+    def __init__(self, config_file, coefficients, normalization=True):
+        """
+        Inputs:
+        config_file: model config, defines the model, its features and the dataframe columns
+        coefficients: dict of coefficient names and values or path of a model results yaml
+            file (as written by the model estimation)
+        normalization: output the actuator outputs unnormalized (pwm), as expected by the
+            pipeline with actuator normalization enabled
+        """
+        import src.models as models
+
+        if isinstance(coefficients, str):
+            with open(coefficients) as file:
+                coefficients = yaml.load(file, Loader=yaml.FullLoader)["coefficients"]
+        self.coefficients = dict(coefficients)
+        self.config_file = config_file
+        self.config = ModelConfig(config_file)
+        self.normalization = normalization
+        self.model_class = getattr(models, self.config.model_class)
+        self.resample_freq = self.config.dynamics_model_config["resample_freq"]
+
+        req_topics_dict = self.config.dynamics_model_config["data"][
+            "required_ulog_topics"
+        ]
+        self.columns = self.config.dynamics_model_config["data"][
+            "req_dataframe_topic_list"
+        ]
+        self.actuator_types = {}
+        if "actuator_outputs" in req_topics_dict:
+            actuator_dict = req_topics_dict["actuator_outputs"]
+            for name, actuator_type in zip(
+                actuator_dict.get("dataframe_name", actuator_dict["ulog_name"]),
+                actuator_dict["actuator_type"],
+            ):
+                if name != "timestamp":
+                    self.actuator_types[name] = actuator_type
+        state_columns = sum(STATE_COLUMNS.values(), [])
+        self.setpoint_columns = [
+            col
+            for col in self.columns
+            if col not in state_columns
+            and col not in self.actuator_types
+            and col not in ["timestamp", "landed"]
+        ]
+
+    def get_default_excitation(self):
+        excitation = copy.deepcopy(DEFAULT_EXCITATION)
+        if "aerodynamics" in self.config.model_config:
+            excitation["velocity"]["offset"] = [FORWARD_FLIGHT_AIRSPEED, 0.0, 0.0]
+        return excitation
+
+    def is_unipolar(self, col):
+        return (
+            self.actuator_types.get(col, None) in UNIPOLAR_ACTUATOR_TYPES
+            or col in UNIPOLAR_INPUTS
+        )
+
+    def generate_input_signals(self, t, excitation):
+        input_dict = {}
+        for group, group_columns in [
+            ("actuators", list(self.actuator_types.keys())),
+            ("setpoints", self.setpoint_columns),
+        ]:
+            for channel, col in enumerate(group_columns):
+                # column specific excitation overrides the one of its group
+                spec = dict(excitation.get(group, {}))
+                spec.setdefault("offset", 0.5 if self.is_unipolar(col) else 0.0)
+                spec.update(excitation.get(col, {}))
+                signal = excitation_signal(t, spec, channel, len(group_columns))
+                if self.is_unipolar(col):
+                    input_dict[col] = np.clip(signal, 0.0, 1.0)
+                else:
+                    input_dict[col] = np.clip(signal, -1.0, 1.0)
+        return input_dict
+
+    def generate_state_signals(self, t, excitation):
+        """Attitude quaternions (FRD body to NED), NED velocity and body angular velocity."""
+        euler_mat = np.column_stack(
+            [excitation_signal(t, excitation["attitude"], i, 3) for i in range(3)]
+        )
+        # roll, pitch, yaw
+        rotations = Rotation.from_euler("ZYX", euler_mat[:, ::-1])
+        q_xyzw = rotations.as_quat()
+        q_mat = np.column_stack((q_xyzw[:, 3], q_xyzw[:, :3]))
+
+        v_body_mat = np.column_stack(
+            [excitation_signal(t, excitation["velocity"], i, 3) for i in range(3)]
+        )
+        v_ned_mat = rotations.apply(v_body_mat)
+
+        # body rates from the relative rotation of the neighbouring samples
+        ang_vel_mat = np.zeros((t.shape[0], 3))
+        if t.shape[0] > 1:
+            ang_vel_mat[1:-1, :] = (
+                rotations[:-2].inv() * rotations[2:]
+            ).as_rotvec() / (t[2:] - t[:-2])[:, np.newaxis]
+            ang_vel_mat[0, :] = (rotations[0].inv() * rotations[1]).as_rotvec() / (
+                t[1] - t[0]
+            )
+            ang_vel_mat[-1, :] = (rotations[-2].inv() * rotations[-1]).as_rotvec() / (
+                t[-1] - t[-2]
+            )
+        return q_mat, v_ned_mat, ang_vel_mat
+
+    def compute_features(self, data_df):
+        """
+        Regression matrix of the model for the normalized data.
+
+        Returns:
+        X: regression matrix for the force and moment measurements of the model
+        coef_name_list: coefficient names of the columns of X
+        model: the model instance with the computed features
+        configuration: estimated measurement groups ("lin" and/or "rot") in the row order
+            of X
+        """
+        model = self.model_class(self.config_file, normalization=False)
+        model.load_dataframes(data_df.copy())
+        model.prepare_regression_matrices()
+        configuration = []
+        if model.estimate_forces:
+            configuration.append("lin")
+        if model.estimate_moments:
+            configuration.append("rot")
+        X, _, coef_name_list = model.assemble_regression_matrices(configuration)
+        return X, coef_name_list, model, configuration
+
+    def denormalize_actuators(self, data_df):
+        # inverse of DynamicsModel.normalize_actuators
+        min_output = 0
+        max_output = 2000
+        trim_output = 1500
+        for col, actuator_type in self.actuator_types.items():
+            if actuator_type == "motor":
+                data_df[col] = min_output + data_df[col] * (max_output - min_output)
+            else:
+                data_df[col] = (
+                    trim_output + data_df[col] * (max_output - min_output) / 2
+                )
+
+    def generate_states(self, duration=None, n_samples=None, excitation=None):
+        """
+        Flight states and inputs without measurements (accelerations are zero), see generate.
+        """
+        if n_samples is None:
+            assert duration is not None, "Either duration or n_samples is required"
+            n_samples = int(duration * self.resample_freq)
+        t = np.arange(n_samples) / self.resample_freq
+
+        excitation_config = self.get_default_excitation()
+        for key, spec in (excitation or {}).items():
+            excitation_config.setdefault(key, {}).update(spec)
+
+        data_df = pd.DataFrame({"timestamp": 1e6 + 1e6 * t})
+        for col, signal in self.generate_input_signals(t, excitation_config).items():
+            data_df[col] = signal
+        q_mat, v_ned_mat, ang_vel_mat = self.generate_state_signals(
+            t, excitation_config
+        )
+        data_df[STATE_COLUMNS["attitude"]] = q_mat
+        data_df[STATE_COLUMNS["velocity"]] = v_ned_mat
+        data_df[STATE_COLUMNS["angular_velocity"]] = ang_vel_mat
+        for col in (
+            STATE_COLUMNS["acceleration"] + STATE_COLUMNS["angular_acceleration"]
+        ):
+            data_df[col] = 0.0
+        data_df["landed"] = 0.0
+        return data_df
+
+    def generate(
+        self, duration=None, n_samples=None, excitation=None, noise=None, seed=0
+    ):
+        """
+        Inputs:
+        duration: length of the generated log [s], alternatively n_samples
+        excitation: dict of excitation specs for the groups actuators (actuator outputs),
+            setpoints (other inputs), velocity (body frame) and attitude (roll, pitch, yaw)
+            or single columns. A spec contains signal (chirp | doublet | sine | constant),
+            offset, amplitude and the parameters of the signal, see DEFAULT_EXCITATION.
+            Specs are merged into the defaults.
+        noise: dict of noise standard deviations for the state groups of STATE_COLUMNS,
+            defaults to the measurement noise of the model for the accelerations only.
+            False disables the noise.
+
+        Returns:
+        data_df: resampled dataframe with the columns of req_dataframe_topic_list
+        """
+        data_df = self.generate_states(duration, n_samples, excitation)
+        n_samples = data_df.shape[0]
+
+        X, coef_name_list, model, configuration = self.compute_features(data_df)
+        missing_coefficients = [
+            coef for coef in coef_name_list if coef not in self.coefficients
+        ]
+        assert len(missing_coefficients) == 0, "missing coefficients: " + str(
+            missing_coefficients
+        )
+        c = np.array([self.coefficients[coef] for coef in coef_name_list])
+        y = (X @ c).reshape(len(configuration) * 3, n_samples).T
+        if "lin" in configuration:
+            force_mat = y[:, 0:3]
+            data_df[STATE_COLUMNS["acceleration"]] = force_mat / model.mass
+        if "rot" in configuration:
+            moment_mat = y[:, -3:]
+            data_df[STATE_COLUMNS["angular_acceleration"]] = moment_mat @ np.linalg.inv(
+                model.moment_of_inertia
+            )
+
+        if noise is not False:
+            if noise is None:
+                noise_covariances = model.get_measurement_noise_covariances()
+                noise = {
+                    "acceleration": np.sqrt(np.diag(noise_covariances["lin"])),
+                    "angular_acceleration": np.sqrt(np.diag(noise_covariances["rot"])),
+                }
+            rng = np.random.default_rng(seed)
+            for group, std in noise.items():
+                columns = STATE_COLUMNS[group]
+                data_df[columns] += rng.normal(size=(n_samples, len(columns))) * std
+            q_mat = data_df[STATE_COLUMNS["attitude"]].to_numpy()
+            data_df[STATE_COLUMNS["attitude"]] = q_mat / np.linalg.norm(
+                q_mat, axis=1, keepdims=True
+            )
+
+        if self.normalization:
+            self.denormalize_actuators(data_df)
+        return data_df[[col for col in self.columns if col in data_df]]
@@ -40,13 +40,15 @@ import pandas as pd
 import os
 
 from pathlib import Path
-from pyulog import core
 
 
-def load_ulog(rel_ulog_path):
+def load_ulog(rel_ulog_path, message_name_filter_list=None):
+    """Parse a ulog file, if message_name_filter_list is given only the listed topics are parsed."""
+    from pyulog import core
+
     proj_path = Path(os.getcwd())
     log_file_path = os.path.join(proj_path, rel_ulog_path)
-    ulog = core.ULog(log_file_path)
+    ulog = core.ULog(log_file_path, message_name_filter_list)
     return ulog
 
 
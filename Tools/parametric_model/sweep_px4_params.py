@@ -0,0 +1,167 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import argparse
+import logging
+import os
+import yaml
+from src.models.model_config import ModelConfig
+from src.tools import string_to_bool
+from src.tools.logging_tools import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_px4_params(
+    config,
+    model_results,
+    mass=None,
+    rho=None,
+    vcruise=None,
+    n_workers=1,
+    file_format="csv",
+    point_yamls=True,
+    output_folder="model_results/",
+):
+    import src.models.extractor_models as extractors
+
+    model_config = ModelConfig(config)
+    with open(model_results) as file:
+        coefficients = yaml.load(file, Loader=yaml.FullLoader)["coefficients"]
+    try:
+        extractor = getattr(extractors, model_config.extractor_class)(
+            config=model_config.extractor_config,
+            model_config_file=config,
+            coefficients=coefficients,
+        )
+    except AttributeError:
+        error_str = (
+            "Model '{0}' not found, is it added to models/extractors "
+            "directory and models/extractors/__init__.py exists?".format(
+                model_config.extractor_class
+            )
+        )
+        raise AttributeError(error_str)
+
+    sweep_df = extractors.sweep_px4_params(
+        extractor,
+        masses=mass,
+        densities=rho,
+        cruise_speeds=vcruise,
+        n_workers=n_workers,
+    )
+    extractors.save_sweep_results(
+        sweep_df,
+        output_folder,
+        extractor.model_name,
+        file_format=file_format,
+        save_point_yamls=point_yamls,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Extract PX4 parameters on a grid of masses, air densities and cruise speeds."
+    )
+    parser.add_argument(
+        "--config",
+        metavar="config",
+        type=str,
+        default="configs/fixedwing_model.yaml",
+        help="Configuration file path for pipeline configurations",
+    )
+    parser.add_argument(
+        "--model_results",
+        metavar="model_results",
+        type=str,
+        required=True,
+        help="Model results file path with the identified coefficients",
+    )
+    parser.add_argument(
+        "--mass",
+        metavar="mass",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Masses of the sweep [kg] (default: mass of the model config).",
+    )
+    parser.add_argument(
+        "--rho",
+        metavar="rho",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Air densities of the sweep [kg/m^3] (default: 1.225).",
+    )
+    parser.add_argument(
+        "--vcruise",
+        metavar="vcruise",
+        type=float,
+        nargs="+",
+        default=None,
+        help="Cruise speeds of the sweep [m/s] (default: extractor_config vcruise or the speed for maximum range).",
+    )
+    parser.add_argument(
+        "--n_workers",
+        metavar="n_workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes computing the grid points (default: number of cpus).",
+    )
+    parser.add_argument(
+        "--file_format",
+        metavar="file_format",
+        type=str,
+        default="csv",
+        help="File format of the sweep table csv | parquet.",
+    )
+    parser.add_argument(
+        "--point_yamls",
+        metavar="point_yamls",
+        type=string_to_bool,
+        default="True",
+        help="Additionally save the PX4 parameters of every grid point as yaml file.",
+    )
+    parser.add_argument(
+        "--output_folder",
+        metavar="output_folder",
+        type=str,
+        default="model_results/",
+        help="Folder in which the sweep folder is created.",
+    )
+    arg_list = parser.parse_args()
+    configure_logging()
+    sweep_px4_params(**vars(arg_list))
@@ -0,0 +1,90 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import AutomaticDataSelector, DOptimalDataSelector
+from src.tools.d_optimal_data_selector import cholesky_rank_one_update
+import numpy as np
+import pandas as pd
+
+
+def test_window_selection():
+    score = np.ones(1000)
+    score[300:400] = 10.0
+    score[700:800] = 5.0
+    data_df = pd.DataFrame(
+        {"timestamp": np.arange(1000), "fisher_information_force": score}
+    )
+
+    selected_df = AutomaticDataSelector(data_df, window_length=100).select_dataframes(
+        ratio=20
+    )
+    assert np.array_equal(
+        selected_df["timestamp"].to_numpy(),
+        np.concatenate((np.arange(300, 400), np.arange(700, 800))),
+    )
+
+    # streamed chunks with a sample budget select the same windows
+    selector = AutomaticDataSelector(window_length=100, sample_budget=200)
+    for chunk_start in range(0, 1000, 130):
+        selector.add_chunk(data_df.iloc[chunk_start : chunk_start + 130])
+    assert len(selector.window_df_list) <= 2
+    assert selector.select_dataframes().equals(selected_df)
+
+    # the single best window already contains more than 10% of the information
+    selected_df = AutomaticDataSelector(data_df, window_length=100).select_dataframes(
+        target_information=0.1
+    )
+    assert selected_df.shape[0] == 100
+
+
+def test_cholesky_rank_one_update():
+    rng = np.random.default_rng(0)
+    B = rng.normal(size=(5, 5))
+    A = B @ B.T + np.eye(5)
+    x = rng.normal(size=5)
+    L = cholesky_rank_one_update(np.linalg.cholesky(A), x)
+    assert np.allclose(L @ L.T, A + np.outer(x, x))
+
+
+def test_d_optimal_selection():
+    # windows 0 and 1 carry strong information on the same coefficient, window 2 on the
+    # other one: a D-optimal pair needs to cover both coefficients
+    factors = np.array([[[10.0, 0.0]], [[9.0, 0.0]], [[0.0, 3.0]], [[0.1, 0.1]]])
+    data_df = pd.DataFrame({"timestamp": np.arange(8)})
+    selector = DOptimalDataSelector(data_df, factors, np.arange(0, 8, 2))
+    selected_df = selector.select_dataframes(sample_budget=4)
+    assert np.array_equal(selector.selected_index, [0, 2])
+    assert np.array_equal(selected_df["timestamp"].to_numpy(), [0, 1, 4, 5])
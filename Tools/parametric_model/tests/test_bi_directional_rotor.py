@@ -0,0 +1,77 @@
+"""
+ *
+ * Copyright (c) 2021 Manuel Yves Galliker
+ *               2021 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__author__ = "Manuel Yves Galliker"
+__maintainer__ = "Manuel Yves Galliker"
+__license__ = "BSD 3"
+
+from src.models.rotor_models import BiDirectionalRotorModel
+import numpy as np
+
+
+def test_bi_directional_rotor_features():
+    rotor_config_dict = {
+        "description": "test rotor",
+        "dataframe_name": "u0",
+        "rotor_type": "BiDirectionalRotorModel",
+        "rotor_axis": [0, 0, -1],
+        "turning_direction": 1,
+        "position": [0.2, 0.1, 0],
+    }
+
+    actuator_input_vec = np.array([-1.0, -0.5, 0.0, 0.5, 1.0])
+    v_airspeed_mat = np.array(
+        [[0, 0, 0], [1, 0, 0], [0, 2, 0], [1, 0, 0], [0, 0, -3]], dtype=float
+    )
+    rotor = BiDirectionalRotorModel(
+        rotor_config_dict, actuator_input_vec, v_airspeed_mat
+    )
+    # the rotor axis flips with the sign of the actuator input
+    assert np.allclose(
+        rotor.rotor_axis_mat,
+        np.outer(np.sign(actuator_input_vec), [0, 0, -1]),
+    )
+    assert np.allclose(rotor.actuator_input_vec, np.abs(actuator_input_vec))
+
+    X_forces, _, _ = rotor.compute_actuator_force_matrix()
+    assert X_forces.shape == (5, 9)
+    # reversed inputs produce mirrored quadratic thrust features
+    assert np.allclose(X_forces[1, 6:], -X_forces[3, 6:])
+
+    X_moments, _, _ = rotor.compute_actuator_moment_matrix()
+    for i in range(5):
+        X_moments_curr = rotor.compute_actuator_moment_features(
+            i, rotor.rotor_axis_mat[i, :]
+        )
+        assert np.allclose(X_moments[i, :], X_moments_curr.flatten("F"))
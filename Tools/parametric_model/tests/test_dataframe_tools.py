@@ -0,0 +1,101 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools.dataframe_tools import (
+    compute_flight_time,
+    compute_zero_crossings,
+    extract_segments,
+)
+import numpy as np
+import pandas as pd
+
+
+def test_extract_segments():
+    aux = -np.ones(100)
+    aux[10:20] = 1.0
+    aux[30:32] = 1.0
+    aux[50:70] = 0.0
+    data_df = pd.DataFrame({"timestamp": np.arange(100), "aux1": aux})
+    zero_crossings = compute_zero_crossings(data_df["aux1"])
+    assert np.array_equal(zero_crossings, [9, 19, 29, 31, 49, 69])
+
+    # same samples as concatenating data_df.iloc[start:end] per activation
+    segment_df = extract_segments(data_df, zero_crossings[0::2], zero_crossings[1::2])
+    expected_df = pd.concat(
+        [data_df.iloc[9:19], data_df.iloc[29:31], data_df.iloc[49:69]],
+        ignore_index=True,
+    )
+    assert segment_df[["timestamp", "aux1"]].equals(expected_df)
+    assert np.array_equal(
+        segment_df["segment_id"].to_numpy(), np.repeat([0, 1, 2], [10, 2, 20])
+    )
+
+    # short activations are dropped, overlapping padding is not duplicated
+    segment_df = extract_segments(
+        data_df, [9, 29, 49], [19, 31, 69], min_length=5, padding=15
+    )
+    assert np.array_equal(segment_df["timestamp"].to_numpy(), np.arange(0, 84))
+    assert np.array_equal(
+        segment_df["segment_id"].to_numpy(), np.repeat([0, 1], [34, 50])
+    )
+
+
+def test_compute_flight_time():
+    # two flights of 10 s and 0.5 s, the log starts and ends landed
+    timestamps = np.arange(0, 30e6, 1e5)
+    landed = np.ones(timestamps.shape[0])
+    landed[20:120] = 0
+    landed[200:205] = 0
+    landed_df = pd.DataFrame({"timestamp": timestamps, "landed": landed})
+
+    flight_times = compute_flight_time(landed_df)
+    assert flight_times == [
+        {"t_start": 2.0e6, "t_end": 11.9e6},
+        {"t_start": 20.0e6, "t_end": 20.4e6},
+    ]
+
+    flight_times = compute_flight_time(landed_df, min_duration=1.0, trim=0.5)
+    assert len(flight_times) == 1
+    assert np.isclose(flight_times[0]["t_start"], 2.5e6)
+    assert np.isclose(flight_times[0]["t_end"], 11.4e6)
+
+    # airborne during the whole log
+    landed_df["landed"] = 0
+    flight_times = compute_flight_time(landed_df)
+    assert flight_times == [{"t_start": timestamps[0], "t_end": timestamps[-1]}]
+
+    landed_df["landed"] = 1
+    assert compute_flight_time(landed_df) == []
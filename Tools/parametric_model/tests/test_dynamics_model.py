@@ -41,10 +41,19 @@ import pytest
 from src.models import DynamicsModel
 from src.models import ModelConfig
 from src.tools import DataHandler
+from src.models import MultiRotorModel
+from src.tools import SyntheticDataGenerator
 from src.tools.math_tools import rmse_between_numpy_arrays
+import numpy as np
 import os
 from pathlib import Path
 
+QUADROTOR_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "configs",
+    "quadrotor_model.yaml",
+)
+
 
 def test_transformations(config_file="dynamics_model_test_config.yaml"):
     rel_config_file_path = "Tools/parametric_model/configs/" + config_file
@@ -79,3 +88,66 @@ def test_transformations(config_file="dynamics_model_test_config.yaml"):
     assert rmse_between_numpy_arrays(accel_NED_mat, accel_FRD_transformed_to_NED) <= 0.1
 
     return
+
+
+def test_chunked_model_evaluation():
+    generator = SyntheticDataGenerator(QUADROTOR_CONFIG_PATH, {})
+    _, coef_name_list, _, _ = generator.compute_features(
+        generator.generate_states(n_samples=10)
+    )
+    rng = np.random.default_rng(1)
+    generator.coefficients = {
+        coef: float(rng.uniform(0.1, 1.0)) for coef in coef_name_list
+    }
+    data_df = generator.generate(duration=2.0, noise=False)
+
+    model = MultiRotorModel(QUADROTOR_CONFIG_PATH)
+    model.load_dataframes(data_df.copy())
+    model.prepare_regression_matrices()
+    X, y, coef_name_list = model.assemble_regression_matrices(["lin", "rot"])
+    c = np.array([generator.coefficients[coef] for coef in coef_name_list])
+
+    # the chunks are evaluated without the regression matrix of all samples
+    chunked_model = MultiRotorModel(QUADROTOR_CONFIG_PATH)
+    chunked_model.load_dataframes(data_df.copy())
+    measured_mat, pred_mat = chunked_model.evaluate_wrench(
+        generator.coefficients, chunk_size=70
+    )
+    assert np.allclose(measured_mat.T.flatten(), y)
+    assert np.allclose(pred_mat.T.flatten(), X @ c)
+    assert np.allclose(measured_mat, pred_mat)
+    assert chunked_model.data_df.shape[0] == data_df.shape[0]
+    assert np.allclose(
+        chunked_model.data_df["V_air_body_x"], model.data_df["V_air_body_x"]
+    )
+    assert np.allclose(
+        np.nan_to_num(chunked_model.compute_feature_correlation()),
+        np.nan_to_num(np.corrcoef(X, rowvar=False)),
+    )
+
+
+def test_wrench_predictions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("model_results")
+    generator = SyntheticDataGenerator(QUADROTOR_CONFIG_PATH, {})
+    _, coef_name_list, _, _ = generator.compute_features(
+        generator.generate_states(n_samples=10)
+    )
+    generator.coefficients = {coef: 0.5 for coef in coef_name_list}
+    data_df = generator.generate(duration=2.0, noise=False)
+
+    model = MultiRotorModel(QUADROTOR_CONFIG_PATH)
+    model.load_dataframes(data_df)
+    model.prepare_regression_matrices()
+    model.compute_fisher_information()
+    model.estimate_model()
+    wrench_dict = model.compute_wrench_predictions()
+    # the measurements are read from the stacked regression targets
+    force_mat = data_df[["acc_b_x", "acc_b_y", "acc_b_z"]].to_numpy() * model.mass
+    assert np.allclose(wrench_dict["lin"][0], force_mat)
+    y_pred = model.optimizer.predict(model.X)
+    for index, measurement in enumerate(["lin", "rot"]):
+        measured_mat, pred_mat = wrench_dict[measurement]
+        rows = slice(3 * index * model.n_samples, 3 * (index + 1) * model.n_samples)
+        assert np.array_equal(measured_mat.T.flatten(), model.y[rows])
+        assert np.array_equal(pred_mat.T.flatten(), y_pred[rows])
@@ -0,0 +1,346 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import src.models.extractor_models as extractor_models
+from src.models.extractor_models import (
+    FixedWingExtractorModel,
+    SingularityFreeExtractorModel,
+    sweep_px4_params,
+    save_sweep_results,
+)
+from scipy.optimize import fsolve
+import numpy as np
+import os
+import pandas as pd
+import pytest
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "configs",
+    "fixedwing_model.yaml",
+)
+
+SINGULARITYFREE_CONFIG_PATH = os.path.join(
+    os.path.dirname(CONFIG_PATH), "fixedwing_singularityfree_model.yaml"
+)
+
+# coefficients identified on resources/fixedwing_model.csv, the log has no thrust excitation
+SHIPPED_LOG_COEFFICIENTS = {
+    "FixedWingExtractorModel": {
+        "cd0": 0.010852067475965314,
+        "cdalpha": 0.014693089373349283,
+        "cdalphasq": 0.1835157956343826,
+        "cl0": 0.07062685915671303,
+        "clalpha": 2.2264174081658488,
+        "cldelta": -0.037193524971360574,
+        "cm0": -1.7893902374536123e-05,
+        "cmalpha": -0.000231066114010911,
+        "cmdelta": 0.0001626420912876388,
+        "cmq": 1.8289509689801158e-06,
+        "puller_cmt": 6.106226635438361e-16,
+        "puller_ct": 0.0,
+    },
+    "SingularityFreeExtractorModel": {
+        "cmdelta": -0.0006031886510321788,
+        "phifv_11": -0.0008398552734992462,
+        "phifv_12": 0.0,
+        "phifv_13": -0.42383314240241404,
+        "phifv_21": 3.545447980210968e-20,
+        "phifv_22": 0.0,
+        "phifv_23": 1.695627450550749e-18,
+        "phifv_31": 0.0755783928707577,
+        "phifv_32": 0.0,
+        "phifv_33": 2.098293487376389,
+        "phimv_11": 8.86361995052742e-21,
+        "phimv_12": 0.0,
+        "phimv_13": 4.2390686263768726e-19,
+        "phimv_21": 2.9234240285822508e-05,
+        "phimv_22": 4.336808689942018e-19,
+        "phimv_23": -0.00036299659794710766,
+        "phimv_31": 1.7727239901054853e-20,
+        "phimv_32": 0.0,
+        "phimv_33": 8.478137252753746e-19,
+        "puller_cmt": 8.326672684688674e-17,
+        "puller_ct": 0.0,
+    },
+}
+
+# parameters extracted from the shipped log coefficients, nan where no physical flight
+# state exists
+SHIPPED_LOG_PX4_PARAMS = {
+    "FixedWingExtractorModel": {
+        "FW_AIRSPD_MAX": 20.0,
+        "FW_AIRSPD_MAX_RANGE": 10.420672397448367,
+        "FW_AIRSPD_MIN": 8.0,
+        "FW_AIRSPD_MIN_SINK": 7.81486404853667,
+        "FW_AIRSPD_TRIM": 10.420672397448367,
+        "FW_DTRIM_P_VMAX": np.nan,
+        "FW_DTRIM_P_VMIN": np.nan,
+        "FW_PSP_OFF": np.nan,
+        "FW_THR_TRIM": np.nan,
+        "FW_THR_VMAX": np.nan,
+        "FW_THR_VMIN": np.nan,
+        "FW_T_CLIMB_MAX": np.nan,
+        "FW_T_SINK_MAX": 1.6344467429124176,
+        "FW_T_SINK_MIN": 0.38238756043849303,
+        "TRIM_PITCH": np.nan,
+        "TRIM_PITCH_MAX_CLIMB": np.nan,
+        "TRIM_PITCH_MAX_RANGE": 0.4071739391669079,
+        "TRIM_PITCH_MAX_SINK": 0.15878004658830916,
+        "TRIM_PITCH_MIN_SINK": 0.6720284303058789,
+    },
+    "SingularityFreeExtractorModel": {
+        "FW_AIRSPD_MAX": 20.0,
+        "FW_AIRSPD_MAX_RANGE": np.nan,
+        "FW_AIRSPD_MIN": 8.0,
+        "FW_AIRSPD_MIN_SINK": 11.523497272560533,
+        "FW_AIRSPD_TRIM": np.nan,
+        "FW_DTRIM_P_VMAX": np.nan,
+        "FW_DTRIM_P_VMIN": np.nan,
+        "FW_PSP_OFF": np.nan,
+        "FW_THR_TRIM": np.nan,
+        "FW_THR_VMAX": np.nan,
+        "FW_THR_VMIN": np.nan,
+        "FW_T_CLIMB_MAX": np.nan,
+        "FW_T_SINK_MAX": np.nan,
+        "FW_T_SINK_MIN": 0.007151387079656168,
+        "TRIM_PITCH": np.nan,
+        "TRIM_PITCH_MAX_CLIMB": np.nan,
+        "TRIM_PITCH_MAX_RANGE": np.nan,
+        "TRIM_PITCH_MAX_SINK": np.nan,
+        "TRIM_PITCH_MIN_SINK": -7.285946047763368e-17,
+    },
+}
+
+COEFFICIENTS = {
+    "cl0": 0.07,
+    "clalpha": 2.2,
+    "cldelta": -0.04,
+    "cd0": 0.011,
+    "cdalpha": 0.015,
+    "cdalphasq": 0.18,
+    "cm0": -0.01,
+    "cmalpha": -0.2,
+    "cmdelta": -0.5,
+    "cmq": -5.0,
+    "puller_ct": 8.0,
+    "puller_cmt": 0.01,
+}
+
+
+def get_extractor():
+    return FixedWingExtractorModel(
+        {"vmin": 8.0, "vmax": 20.0}, CONFIG_PATH, dict(COEFFICIENTS)
+    )
+
+
+def test_glide_polar():
+    extractor = get_extractor()
+    alphas = np.linspace(-0.1, 0.3, 9)
+    glide_polar = extractor.get_glide_polar(alphas)
+    # states with negative lift are no physical gliding states
+    assert np.all(np.isnan(glide_polar["airspeed"][alphas < -0.04]))
+    assert np.all(np.isfinite(glide_polar["airspeed"][alphas >= 0.0]))
+    for i, alpha in enumerate(alphas):
+        if np.isnan(glide_polar["airspeed"][i]):
+            continue
+
+        def glide_eom(x):
+            airspeed, gamma = x
+            trim = extractor.zero_moment_trim(alpha, 0.0, airspeed)
+            return (
+                -extractor.mass * extractor.gravity * np.sin(gamma)
+                - extractor.drag(alpha, airspeed),
+                extractor.mass * extractor.gravity * np.cos(gamma)
+                - extractor.lift(alpha, trim, airspeed),
+            )
+
+        airspeed, gamma = fsolve(
+            glide_eom,
+            [glide_polar["airspeed"][i] * 1.1, glide_polar["flight_path_angle"][i]],
+            xtol=1e-12,
+        )
+        assert np.isclose(glide_polar["airspeed"][i], airspeed)
+        assert np.isclose(glide_polar["flight_path_angle"][i], gamma)
+
+
+def test_level_and_steady_flight_polar():
+    extractor = get_extractor()
+    airspeeds = np.linspace(8.0, 20.0, 13)
+    level_flight_polar = extractor.get_level_flight_polar(airspeeds)
+    for key in ["alpha", "throttle", "elevator_trim"]:
+        assert np.all(np.isfinite(level_flight_polar[key]))
+    # level flight: thrust balances the drag and the weight is carried
+    alphas = level_flight_polar["alpha"]
+    thrust = extractor.thrust(level_flight_polar["throttle"])
+    lift = extractor.lift(alphas, level_flight_polar["elevator_trim"], airspeeds)
+    np.testing.assert_allclose(
+        thrust * np.cos(alphas), extractor.drag(alphas, airspeeds)
+    )
+    np.testing.assert_allclose(
+        lift + thrust * np.sin(alphas), extractor.mass * extractor.gravity
+    )
+    # warm start from the solution reproduces it
+    warm_polar = extractor.get_level_flight_polar(airspeeds, alpha_init=alphas)
+    np.testing.assert_allclose(warm_polar["alpha"], alphas)
+
+    # at the level flight throttle the steady flight is level
+    for i, airspeed in enumerate(airspeeds[::4]):
+        steady_polar = extractor.get_steady_flight_polar(
+            airspeed, level_flight_polar["throttle"][4 * i]
+        )
+        assert np.isclose(steady_polar["flight_path_angle"][0], 0.0, atol=1e-8)
+        assert np.isclose(steady_polar["alpha"][0], alphas[4 * i])
+
+
+def test_singularityfree_extractor():
+    coefficients = {
+        "cmdelta": -0.5,
+        "phifv_11": 0.03,
+        "phifv_12": 0.0,
+        "phifv_13": 0.1,
+        "phifv_21": 0.001,
+        "phifv_22": 0.0,
+        "phifv_23": -0.01,
+        "phifv_31": 0.0,
+        "phifv_32": 0.0,
+        "phifv_33": 2.0,
+        "puller_ct": 8.0,
+        "puller_cmt": 0.01,
+    }
+    extractor = SingularityFreeExtractorModel(
+        {"vmin": 8.0, "vmax": 20.0}, CONFIG_PATH, coefficients
+    )
+    extractor.compute_px4_params()
+    px4_params = extractor.get_px4_params()
+    assert all(np.isfinite(value) for value in px4_params.values())
+    assert px4_params["FW_AIRSPD_MIN_SINK"] < px4_params["FW_AIRSPD_MAX_RANGE"]
+    assert px4_params["FW_T_SINK_MIN"] < px4_params["FW_T_SINK_MAX"]
+    # the glide polars are computed once per grid
+    assert len(extractor.glide_polar_cache) == 2
+    glide_polar = extractor.get_cached_glide_polar((-30.0, 30.0))
+    idx = np.nanargmax(glide_polar["lift_drag_ratio"][glide_polar["alpha"] < 0.35])
+    lift = extractor.lift(
+        glide_polar["alpha"][idx],
+        glide_polar["elevator_trim"][idx],
+        glide_polar["airspeed"][idx],
+    )
+    assert np.isclose(
+        lift,
+        extractor.mass
+        * extractor.gravity
+        * np.cos(glide_polar["flight_path_angle"][idx]),
+    )
+
+
+@pytest.mark.parametrize(
+    "extractor_class, config_path",
+    [
+        ("FixedWingExtractorModel", CONFIG_PATH),
+        ("SingularityFreeExtractorModel", SINGULARITYFREE_CONFIG_PATH),
+    ],
+)
+def test_shipped_log_px4_params(extractor_class, config_path):
+    extractor = getattr(extractor_models, extractor_class)(
+        {"vmin": 8.0, "vmax": 20.0},
+        config_path,
+        dict(SHIPPED_LOG_COEFFICIENTS[extractor_class]),
+    )
+    extractor.compute_px4_params()
+    px4_params = extractor.get_px4_params()
+    expected_params = SHIPPED_LOG_PX4_PARAMS[extractor_class]
+    assert sorted(px4_params) == sorted(expected_params)
+    np.testing.assert_allclose(
+        [px4_params[name] for name in expected_params],
+        list(expected_params.values()),
+        rtol=1e-6,
+        atol=1e-9,
+    )
+    # without thrust no level flight state exists and the throttle is rejected
+    assert not np.any(np.isinf(list(px4_params.values())))
+    assert not px4_params["FW_T_SINK_MIN"] <= 0.0
+    assert not px4_params["FW_T_SINK_MAX"] <= 0.0
+    assert not px4_params["FW_T_CLIMB_MAX"] <= 0.0
+    assert "FW_THR_TRIM" in extractor.invalid_params
+
+
+def test_px4_param_sweep(tmp_path):
+    extractor = get_extractor()
+    sweep_df = sweep_px4_params(
+        extractor, masses=[1.2, 1.8], densities=[1.0, 1.225], cruise_speeds=[12.0]
+    )
+    assert sweep_df.shape[0] == 4
+    np.testing.assert_array_equal(sweep_df["FW_AIRSPD_TRIM"], 12.0)
+    # the gliding speeds scale with sqrt(mass / rho)
+    np.testing.assert_allclose(
+        sweep_df["FW_AIRSPD_MAX_RANGE"] / np.sqrt(sweep_df["mass"] / sweep_df["rho"]),
+        sweep_df["FW_AIRSPD_MAX_RANGE"][0] / np.sqrt(1.2 / 1.0),
+    )
+    # the extractor itself is not modified
+    assert extractor.mass == 1.45 and extractor.rho == 1.225
+
+    assert sweep_df["valid"].all()
+
+    sweep_folder = save_sweep_results(sweep_df, str(tmp_path), extractor.model_name)
+    saved_df = pd.read_csv(
+        os.path.join(sweep_folder, "px4_params.csv"), keep_default_na=False
+    )
+    pd.testing.assert_frame_equal(saved_df, sweep_df, check_dtype=False)
+    assert len(os.listdir(sweep_folder)) == 5
+
+
+def test_px4_param_sweep_invalid_points(tmp_path):
+    # the shipped log model has no thrust, the level flight states do not converge
+    extractor = FixedWingExtractorModel(
+        {"vmin": 8.0, "vmax": 20.0},
+        CONFIG_PATH,
+        dict(SHIPPED_LOG_COEFFICIENTS["FixedWingExtractorModel"]),
+    )
+    sweep_df = sweep_px4_params(extractor, masses=[1.2, 1.8])
+    assert not sweep_df["valid"].any()
+    for invalid_params in sweep_df["invalid_params"]:
+        assert "FW_THR_TRIM" in invalid_params.split(";")
+    assert sweep_df["FW_THR_TRIM"].isna().all()
+    param_df = sweep_df.drop(columns=["valid", "invalid_params"])
+    assert not np.isinf(param_df.to_numpy()).any()
+
+    sweep_folder = save_sweep_results(sweep_df, str(tmp_path), extractor.model_name)
+    # only the table is saved
+    assert os.listdir(sweep_folder) == ["px4_params.csv"]
+    saved_df = pd.read_csv(os.path.join(sweep_folder, "px4_params.csv"))
+    assert not saved_df["valid"].any()
+    assert saved_df["FW_THR_TRIM"].isna().all()
@@ -0,0 +1,62 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import flight_data_container
+import numpy as np
+import pandas as pd
+
+
+def test_flight_data_container(tmp_path):
+    data_df = pd.DataFrame(
+        np.random.default_rng(0).normal(size=(500, 4)),
+        columns=["timestamp", "ang_vel_x", "ang_vel_y", "u0"],
+    )
+    file_path = str(tmp_path / "log.ddf")
+    flight_data_container.save_flight_data(file_path, data_df, sample_rate=250.0)
+
+    header, _ = flight_data_container.read_flight_data_header(file_path)
+    assert header["columns"] == list(data_df.columns)
+    assert header["sample_rate"] == 250.0
+
+    loaded_df = flight_data_container.load_flight_data(
+        file_path, columns=["u0", "ang_vel_x"]
+    )
+    assert list(loaded_df.columns) == ["u0", "ang_vel_x"]
+    np.testing.assert_array_equal(
+        loaded_df.to_numpy(), data_df[["u0", "ang_vel_x"]].to_numpy()
+    )
+    # columns are views into the memory map and not copies
+    assert isinstance(loaded_df["u0"].to_numpy().base, np.memmap)
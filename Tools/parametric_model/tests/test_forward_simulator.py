@@ -0,0 +1,129 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import ForwardSimulator, SyntheticDataGenerator, rollout_metrics
+from src.tools.forward_simulator import STATE_COLUMNS
+import numpy as np
+import os
+import pandas as pd
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "configs",
+    "quadrotor_model.yaml",
+)
+
+
+def get_generator():
+    generator = SyntheticDataGenerator(CONFIG_PATH, {})
+    _, coef_name_list, _, _ = generator.compute_features(
+        generator.generate_states(n_samples=10)
+    )
+    rng = np.random.default_rng(0)
+    generator.coefficients = {
+        coef: float(rng.uniform(0.1, 1.0)) for coef in coef_name_list
+    }
+    return generator
+
+
+def test_wrench_matches_synthetic_data():
+    generator = get_generator()
+    data_df = generator.generate(duration=2.0, noise=False)
+    simulator = ForwardSimulator(CONFIG_PATH, generator.coefficients)
+    force_mat, moment_mat = simulator.compute_wrench(
+        simulator.get_states(data_df), simulator.get_inputs(data_df)
+    )
+    acc_mat = data_df[["acc_b_x", "acc_b_y", "acc_b_z"]].to_numpy()
+    ang_acc_mat = data_df[["ang_acc_b_x", "ang_acc_b_y", "ang_acc_b_z"]].to_numpy()
+    assert np.allclose(force_mat / simulator.mass, acc_mat)
+    assert np.allclose(moment_mat, ang_acc_mat @ simulator.moment_of_inertia)
+
+
+def test_simulate():
+    generator = get_generator()
+    simulator = ForwardSimulator(
+        CONFIG_PATH, {coef: 0.0 for coef in generator.coefficients}
+    )
+    initial_states = np.zeros((3, len(STATE_COLUMNS)))
+    initial_states[:, 6] = 1.0
+    initial_states[1, 10:13] = [0.0, 0.0, 1.0]
+    initial_states[2, 3:6] = [1.0, 0.0, -2.0]
+    input_traces = np.zeros((3, 50, len(simulator.input_columns)))
+    state_traces = simulator.simulate(initial_states, input_traces, 0.02)
+    assert state_traces.shape == (3, 51, len(STATE_COLUMNS))
+
+    # free fall without a wrench
+    t = 1.0
+    assert np.allclose(state_traces[0, -1, 0:3], [0.0, 0.0, 0.5 * 9.81 * t**2])
+    assert np.allclose(state_traces[2, -1, 3:6], [1.0, 0.0, -2.0 + 9.81 * t])
+    # constant yaw rate
+    assert np.allclose(
+        state_traces[1, -1, 6:10], [np.cos(0.5 * t), 0.0, 0.0, np.sin(0.5 * t)]
+    )
+
+    # a batch gives the same trajectories as single simulations
+    single_traces = simulator.simulate(initial_states[1], input_traces[1], 0.02)
+    assert np.allclose(single_traces[0], state_traces[1])
+
+
+def test_rollout_metrics():
+    timestamps = np.concatenate((np.arange(10), np.arange(20, 40))) * 1e4
+    starts = rollout_metrics.compute_window_starts(timestamps, 5, stride=2)
+    assert np.all(starts + 5 < timestamps.shape[0])
+    assert np.all(np.isin(starts, [0, 2, 4, 10, 12, 14, 16, 18, 20, 22, 24]))
+    assert starts.shape[0] == 11
+
+    # rollouts of data simulated with the same model do not diverge
+    generator = get_generator()
+    simulator = ForwardSimulator(CONFIG_PATH, generator.coefficients)
+    initial_state = np.zeros(len(STATE_COLUMNS))
+    initial_state[6] = 1.0
+    t = np.arange(100) * 0.01
+    input_mat = 0.5 + 0.02 * np.sin(np.outer(t, [1.0, 2.0, 3.0, 4.0]))
+    state_trace = simulator.simulate(initial_state, input_mat, 0.01)[0, :-1]
+    data_df = pd.DataFrame(state_trace, columns=STATE_COLUMNS)
+    data_df["timestamp"] = t * 1e6
+    # unnormalized motor outputs
+    data_df[simulator.input_columns] = 2000 * input_mat
+    metrics_dict = rollout_metrics.compute_rollout_metrics(
+        simulator, data_df, horizon=0.1, stride=10, dt=0.01
+    )
+    assert metrics_dict["n_windows"] == 9
+    assert len(metrics_dict["horizon"]) == 11
+    assert np.max(metrics_dict["velocity_rmse"]) < 1e-9
+    assert np.max(metrics_dict["attitude_rmse"]) < 1e-6
+    assert np.max(metrics_dict["angular_velocity_rmse"]) < 1e-9
@@ -0,0 +1,92 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+import json
+import os
+import subprocess
+import sys
+
+# third party packages the pipeline needs in every run
+REQUIRED_IMPORTS = [
+    "numpy",
+    "pandas",
+    "scipy.linalg",
+    "scipy.spatial.transform",
+    "yaml",
+]
+# only loaded by code paths that need them (plots, solvers, ulog parsing, ...)
+LAZY_IMPORTS = [
+    "matplotlib",
+    "seaborn",
+    "cvxpy",
+    "sklearn",
+    "h5py",
+    "pyulog",
+    "scipy.signal",
+    "scipy.optimize",
+]
+# import time of the package on top of the required third party packages [s]
+IMPORT_TIME_BUDGET = 0.5
+
+IMPORT_SCRIPT = """
+import json, sys, time
+for module in {required}:
+    __import__(module)
+t_start = time.perf_counter()
+import src.models, src.tools, src.optimizers
+t_end = time.perf_counter()
+print(json.dumps({{
+    "import_time": t_end - t_start,
+    "loaded": [module for module in {lazy} if module in sys.modules],
+}}))
+"""
+
+
+def test_import_time():
+    package_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = IMPORT_SCRIPT.format(required=REQUIRED_IMPORTS, lazy=LAZY_IMPORTS)
+    # fresh interpreter, the test session has imported everything already
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=package_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+    assert result["loaded"] == []
+    assert result["import_time"] < IMPORT_TIME_BUDGET
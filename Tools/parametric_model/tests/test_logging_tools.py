@@ -0,0 +1,111 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools.logging_tools import (
+    configure_logging,
+    log_section,
+    ProgressReporter,
+    quiet_logging,
+)
+import io
+import json
+import logging
+import numpy as np
+
+
+def configure_test_logger(name, level, log_format):
+    stream = io.StringIO()
+    configure_logging(level, log_format, stream=stream, logger_names=(name,))
+    return logging.getLogger(name), stream
+
+
+def test_json_logging():
+    logger, stream = configure_test_logger("test_json_logging", "INFO", "json")
+    log_section(logger, "Optimization Results")
+    logger.info("Optimal coefficients", extra={"data": {"c_d": np.float64(0.5)}})
+    logger.debug("not emitted")
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(records) == 2
+    assert records[0]["section"] == "Optimization Results"
+    assert records[1]["level"] == "INFO"
+    assert records[1]["logger"] == "test_json_logging"
+    assert records[1]["data"] == {"c_d": 0.5}
+
+
+def test_text_logging():
+    logger, stream = configure_test_logger("test_text_logging", "INFO", "text")
+    log_section(logger, "Optimization Results")
+    logger.info("Optimization metrics", extra={"data": {"R2": 0.99}})
+    logger.warning("No flight detected.")
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "=" * 79
+    assert lines[1].strip() == "Optimization Results"
+    assert lines[3:] == [
+        "Optimization metrics:",
+        "R2: 0.99",
+        "WARNING: No flight detected.",
+    ]
+
+
+def test_progress_reporter():
+    logger, stream = configure_test_logger("test_progress_reporter", "INFO", "json")
+    progress = ProgressReporter("Feature computation", 1000, logger, n_reports=4)
+    for _ in range(1000):
+        progress.next()
+    progress.finish()
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    # three chunk boundaries and the final report
+    assert [record["progress"] for record in records] == [250, 500, 750, 1000]
+
+    # quiet runs do not emit progress records
+    logger, stream = configure_test_logger("test_progress_quiet", "WARNING", "json")
+    progress = ProgressReporter("Feature computation", 1000, logger)
+    for _ in range(1000):
+        progress.next()
+    progress.finish()
+    assert stream.getvalue() == ""
+
+
+def test_quiet_logging():
+    logger, stream = configure_test_logger("test_quiet_logging", "INFO", "text")
+    with quiet_logging("test_quiet_logging"):
+        logger.info("not emitted")
+        logger.warning("emitted")
+    logger.info("emitted again")
+    assert logger.level == logging.INFO
+    assert "not emitted" not in stream.getvalue()
+    assert "emitted again" in stream.getvalue()
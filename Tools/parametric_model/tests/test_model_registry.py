@@ -0,0 +1,110 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import model_registry
+import math
+import yaml
+
+
+def make_result_dict(c_d, r2, bound):
+    return {
+        "coefficients": {"c_d_fuselage_x": c_d, "vertical_rot_thrust_quad": 4.0},
+        "metrics": {"R2": r2, "RMSE": 0.2},
+        "number of samples": 1000,
+        "Cramer": {"c_d_fuselage_x": bound, "vertical_rot_thrust_quad": bound},
+        "FIM": {"lin": {"trace": 1.0}},
+    }
+
+
+def test_model_registry(tmp_path):
+    log_path = tmp_path / "log.csv"
+    log_path.write_text("timestamp\n0\n")
+    config_hash = model_registry.compute_config_hash({"b": 1, "a": [1, 2]})
+    assert config_hash == model_registry.compute_config_hash({"a": [1, 2], "b": 1})
+
+    with model_registry.ModelRegistry(str(tmp_path / "registry.sqlite")) as registry:
+        first_id = registry.register(
+            str(tmp_path / "multirotor_model_2023-01-01-12-00-00.yaml"),
+            make_result_dict(0.1, 0.95, 0.03),
+            config_hash=config_hash,
+            log_files=[str(log_path)],
+        )
+        second_id = registry.register(
+            str(tmp_path / "multirotor_model_2023-01-02-12-00-00.yaml"),
+            make_result_dict(0.14, 0.99, 0.04),
+        )
+        run_list = registry.query(model_name="multirotor_model")
+        assert [run["id"] for run in run_list] == [second_id, first_id]
+        assert run_list[0]["created"] == "2023-01-02-12-00-00"
+        assert [run["id"] for run in registry.query(min_r2=0.97)] == [second_id]
+        assert [run["id"] for run in registry.query(config_hash=config_hash[:8])] == [
+            first_id
+        ]
+        log_hash = registry.get_run(first_id)["logs"][0]["log_hash"]
+        assert [run["id"] for run in registry.query(log_hash=log_hash)] == [first_id]
+
+        diff_dict = {diff["name"]: diff for diff in registry.diff(first_id, second_id)}
+        assert math.isclose(diff_dict["c_d_fuselage_x"]["delta"], 0.04)
+        assert math.isclose(diff_dict["c_d_fuselage_x"]["z"], 0.8)
+        assert diff_dict["vertical_rot_thrust_quad"]["delta"] == 0.0
+
+        # registering a file again replaces its entry
+        registry.register(
+            str(tmp_path / "multirotor_model_2023-01-01-12-00-00.yaml"),
+            make_result_dict(0.1, 0.9, 0.03),
+        )
+        assert len(registry.query()) == 2
+        assert registry.remove_missing() == 2
+        assert registry.query() == []
+
+
+def test_index_directory(tmp_path):
+    result_dict = make_result_dict(0.1, 0.95, 0.03)
+    file_path = tmp_path / "simple_fixedwing_model_2023-01-01-12-00-00.yaml"
+    with open(file_path, "w") as file:
+        yaml.dump(result_dict, file)
+    (tmp_path / "rollout_metrics.yaml").write_text("horizon: 1.0\n")
+
+    with model_registry.ModelRegistry(str(tmp_path / "registry.sqlite")) as registry:
+        assert registry.index_directory(str(tmp_path)) == 1
+        assert registry.index_directory(str(tmp_path)) == 0
+        run_dict = registry.get_run(str(file_path))
+    assert run_dict["model_name"] == "simple_fixedwing_model"
+    assert run_dict["kind"] == "estimation"
+    assert run_dict["coefficients"] == result_dict["coefficients"]
+    assert run_dict["cramer_rao_bounds"]["c_d_fuselage_x"] == 0.03
+    assert run_dict["fim"] == result_dict["FIM"]
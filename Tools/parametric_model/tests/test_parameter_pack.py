@@ -0,0 +1,143 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import parameter_pack
+import json
+import numpy as np
+import pytest
+
+RESULT_DICT = {
+    "coefficients": {"c_d_fuselage_x": 0.1, "vertical_rot_thrust_quad": 4.0},
+    "metrics": {"R2": 0.99, "RMSE": 0.2},
+    "model": {
+        "area": 0.41,
+        "vertical_": [
+            {
+                "rotor_0": None,
+                "dataframe_name": "u0",
+                "description": "front right rotor",
+                "position": [0.13, 0.22, -0.023],
+                "rotor_axis": [0, 0, -1],
+                "rotor_type": "RotorModel",
+                "turning_direction": -1,
+            }
+        ],
+        "puller_": [
+            {
+                "dataframe_name": "throttle",
+                "description": "puller rotor",
+                "rotor_type": "LinearRotorModel",
+            }
+        ],
+        "tilting_": [
+            {
+                "dataframe_name": "u4",
+                "description": "tilting front rotor",
+                "diameter": 0.2,
+                "max_tilt_angle_deg": 90,
+                "position": [0.3, 0.0, -0.05],
+                "rotor_axis": [0, 0, -1],
+                "rotor_type": "TiltingRotorModel",
+                "tilt_actuator_dataframe_name": "u_tilt",
+                "tilt_axis": [0, 1, 0],
+                "turning_direction": 1,
+            }
+        ],
+    },
+}
+
+
+def test_parameter_pack(tmp_path):
+    file_path = str(tmp_path / ("model" + parameter_pack.FILE_EXTENSION))
+    parameter_pack.save_parameter_pack(
+        file_path, RESULT_DICT, "multirotor_model", "MultiRotorModel"
+    )
+    header, coefficient_vec, rotor_mat = parameter_pack.load_parameter_pack(file_path)
+    assert header["coefficient_names"] == ["c_d_fuselage_x", "vertical_rot_thrust_quad"]
+    assert np.array_equal(coefficient_vec, [0.1, 4.0])
+    assert rotor_mat.shape == (3, len(parameter_pack.ROTOR_FIELDS))
+    assert np.isnan(rotor_mat[1, 0])
+
+    result_dict = parameter_pack.load_result_dict(file_path)
+    assert result_dict["coefficients"] == RESULT_DICT["coefficients"]
+    assert result_dict["metrics"] == RESULT_DICT["metrics"]
+    assert result_dict["model"]["area"] == 0.41
+    assert result_dict["model"]["vertical_"][0]["position"] == [0.13, 0.22, -0.023]
+    assert result_dict["model"]["vertical_"][0]["turning_direction"] == -1
+    assert "position" not in result_dict["model"]["puller_"][0]
+    # all settings of a tilting rotor are restored
+    assert result_dict["model"]["tilting_"] == RESULT_DICT["model"]["tilting_"]
+    assert "tilt_axis" not in result_dict["model"]["vertical_"][0]
+
+
+def test_parameter_pack_schema(tmp_path):
+    file_path = str(tmp_path / ("model" + parameter_pack.FILE_EXTENSION))
+    with pytest.raises(ValueError):
+        parameter_pack.save_parameter_pack(
+            file_path,
+            {"coefficients": {"c": float("nan")}, "model": {}},
+            "model",
+        )
+
+    # rotor settings without a field in the pack are rejected
+    with pytest.raises(ValueError):
+        parameter_pack.save_parameter_pack(
+            file_path,
+            {
+                "coefficients": {"c": 1.0},
+                "model": {"puller_": [{"rotor_type": "RotorModel", "blades": 2}]},
+            },
+            "model",
+        )
+
+    parameter_pack.save_parameter_pack(file_path, RESULT_DICT, "model")
+    header, data_offset = parameter_pack.read_parameter_pack_header(file_path)
+    with open(file_path, "rb") as file:
+        content = file.read()
+    # a pack of a newer format version is rejected
+    header["version"] = parameter_pack.VERSION + 1
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (data_offset - 16 - len(header_bytes))
+    with open(file_path, "wb") as file:
+        file.write(content[:16] + header_bytes + content[data_offset:])
+    with pytest.raises(ValueError):
+        parameter_pack.load_parameter_pack(file_path)
+
+    with open(file_path, "wb") as file:
+        file.write(b"coefficients: {}\n")
+    with pytest.raises(TypeError):
+        parameter_pack.load_parameter_pack(file_path)
@@ -0,0 +1,141 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import SyntheticDataGenerator
+from src.models import MultiRotorModel
+import numpy as np
+import os
+import yaml
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "configs",
+    "quadrotor_model.yaml",
+)
+
+
+def test_estimation_with_prior(tmp_path, monkeypatch):
+    # the estimation saves its results to model_results/
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("model_results")
+    generator = SyntheticDataGenerator(CONFIG_PATH, {})
+    _, coef_name_list, _, _ = generator.compute_features(
+        generator.generate_states(n_samples=10)
+    )
+    generator.coefficients = {coef: 0.5 for coef in coef_name_list}
+    data_df = generator.generate(duration=2.0, noise=None)
+    n_first = data_df.shape[0] // 2
+    first_df = data_df.iloc[:n_first].reset_index(drop=True)
+    second_df = data_df.iloc[n_first:].reset_index(drop=True)
+
+    def estimate(data_df, **kwargs):
+        model = MultiRotorModel(CONFIG_PATH)
+        model.load_dataframes(data_df)
+        model.prepare_regression_matrices()
+        model.compute_fisher_information()
+        model.estimate_model(**kwargs)
+        return model
+
+    first_model = estimate(first_df)
+    statistics_path = first_model.save_regression_statistics(str(tmp_path))
+    prior_path = str(tmp_path / "prior.yaml")
+    with open(prior_path, "w") as outfile:
+        yaml.dump(first_model.result_dict, outfile)
+        yaml.dump(first_model.fisher_metric, outfile)
+
+    # the cached statistics of the first log give the estimate of both logs
+    full_model = estimate(data_df)
+    incremental_model = estimate(second_df, prior_statistics=[statistics_path])
+    assert incremental_model.result_dict["prior"]["n_samples_total"] == data_df.shape[0]
+    for coef, value in full_model.result_dict["coefficients"].items():
+        assert np.isclose(
+            incremental_model.result_dict["coefficients"][coef], value, atol=1e-6
+        )
+
+    # a strong prior keeps the coefficients of the first estimation
+    prior_model = estimate(second_df, prior_results=prior_path, prior_weight=1e12)
+    for coef, value in first_model.result_dict["coefficients"].items():
+        assert np.isclose(
+            prior_model.result_dict["coefficients"][coef], value, atol=1e-3
+        )
+
+
+def test_robust_estimation_with_prior(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("model_results")
+    with open(CONFIG_PATH) as file:
+        config = file.read()
+    robust_config_path = str(tmp_path / "robust_model.yaml")
+    with open(robust_config_path, "w") as file:
+        file.write(config.replace('"QPOptimizer"', '"RobustRegressor"'))
+    generator = SyntheticDataGenerator(CONFIG_PATH, {})
+    _, coef_name_list, _, _ = generator.compute_features(
+        generator.generate_states(n_samples=10)
+    )
+    generator.coefficients = {coef: 0.5 for coef in coef_name_list}
+    data_df = generator.generate(duration=2.0, noise=None)
+    n_first = data_df.shape[0] // 2
+    first_df = data_df.iloc[:n_first].reset_index(drop=True)
+    # outliers in the second log
+    second_df = data_df.iloc[n_first:].reset_index(drop=True)
+    second_df.loc[::10, "acc_b_z"] += 20.0
+
+    def estimate(config_path, data_df, **kwargs):
+        model = MultiRotorModel(config_path)
+        model.load_dataframes(data_df)
+        model.prepare_regression_matrices()
+        model.compute_fisher_information()
+        model.estimate_model(**kwargs)
+        return model
+
+    statistics_path = estimate(CONFIG_PATH, first_df).save_regression_statistics(
+        str(tmp_path)
+    )
+    full_model = estimate(CONFIG_PATH, data_df)
+    robust_model = estimate(
+        robust_config_path, second_df, prior_statistics=[statistics_path]
+    )
+    qp_model = estimate(CONFIG_PATH, second_df, prior_statistics=[statistics_path])
+    assert robust_model.result_dict["metrics"]["Downweighted Ratio"] >= 0.05
+
+    # the outliers of the second log are downweighted, not the first log
+    coef_list = list(full_model.result_dict["coefficients"])
+    c_full = np.array([full_model.result_dict["coefficients"][c] for c in coef_list])
+    c_robust = np.array(
+        [robust_model.result_dict["coefficients"][c] for c in coef_list]
+    )
+    c_qp = np.array([qp_model.result_dict["coefficients"][c] for c in coef_list])
+    assert np.linalg.norm(c_robust - c_full) < 0.25 * np.linalg.norm(c_qp - c_full)
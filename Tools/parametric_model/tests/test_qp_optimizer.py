@@ -0,0 +1,91 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.optimizers import QPOptimizer
+import numpy as np
+import pytest
+
+
+def test_regularization_path():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 3))
+    y = X @ np.array([1.0, -2.0, 0.5]) + 0.1 * rng.normal(size=300)
+    optimizer_config = {
+        "parameter_bounds": {
+            "a": (0.0, 2.0),
+            "b": (-1.0, 0.0),
+            "c": (0.5, 0.5),
+        }
+    }
+    optimizer = QPOptimizer(optimizer_config, ["a", "b", "c"])
+    optimizer.estimate_parameters(X, y)
+    c_qp = np.array(optimizer.get_optimization_parameters())
+
+    grid_list, c_mat = optimizer.solve_regularization_path(
+        X.T @ X, X.T @ y, [0.0, 1.0], [1.0, 4.0]
+    )
+    assert grid_list == [(0.0, 1.0), (0.0, 4.0), (1.0, 1.0), (1.0, 4.0)]
+    # unregularized path point equals the direct QP solution with active bound b >= -1
+    assert np.allclose(c_mat[0], c_qp, atol=1e-5)
+    assert np.isclose(c_mat[0, 1], -1.0, atol=1e-5)
+    # scaled bounds allow b >= -4, fixed coefficient c is not scaled
+    assert c_mat[1, 1] < -1.5
+    assert np.allclose(c_mat[:, 2], 0.5)
+    # ridge penalty shrinks the free coefficients
+    assert np.linalg.norm(c_mat[3, :2]) < np.linalg.norm(c_mat[1, :2])
+
+
+def test_infeasible_regularization_path():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(100, 2))
+    y = X @ np.array([1.0, 3.0])
+    optimizer = QPOptimizer(
+        {"parameter_bounds": {"a": (0.5, 2.0), "b": (0.0, 2.0)}}, ["a", "b"]
+    )
+    # the negative bound scaling gives a >= -0.5 and a <= -2, no solution
+    with pytest.warns(RuntimeWarning):
+        grid_list, c_mat = optimizer.solve_regularization_path(
+            X.T @ X, X.T @ y, [0.0], [1.0, -1.0]
+        )
+    # b <= 2 is active on the feasible grid point
+    assert np.isclose(c_mat[0, 1], 2.0, atol=1e-5)
+    assert np.all(np.isfinite(c_mat[0]))
+    assert np.all(np.isnan(c_mat[1]))
+
+    # a single solve raises instead of returning nan coefficients
+    optimizer.h = -optimizer.h
+    with pytest.raises(RuntimeError), pytest.warns(RuntimeWarning):
+        optimizer.solve_gram(X.T @ X, X.T @ y)
@@ -0,0 +1,95 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools.regression_statistics import (
+    RegressionStatistics,
+    compute_contiguous_folds,
+)
+import numpy as np
+import pytest
+
+
+def test_statistics_metrics():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    y = X @ np.array([1.0, -2.0, 0.5]) + 0.1 * rng.normal(size=200)
+    c = np.array([0.9, -2.1, 0.4])
+
+    stats = RegressionStatistics.from_data(X[:120], y[:120]) + (
+        RegressionStatistics.from_data(X[120:], y[120:])
+    )
+    metrics = stats.compute_metrics(c)
+
+    residuals = X @ c - y
+    assert np.isclose(metrics["RMSE"], np.sqrt(np.mean(residuals**2)))
+    assert np.isclose(
+        metrics["R2"], 1 - np.sum(residuals**2) / np.sum((y - np.mean(y)) ** 2)
+    )
+
+    difference = stats - RegressionStatistics.from_data(X[120:], y[120:])
+    assert difference.n_samples == 120
+    assert np.allclose(difference.gram, X[:120].T @ X[:120])
+
+
+def test_statistics_file(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, 3))
+    y = rng.normal(size=50)
+    stats = RegressionStatistics.from_data(X, y)
+    file_path = str(tmp_path / "statistics.npz")
+    stats.save(file_path, ["a", "b", "c"])
+
+    # the statistics are reordered to the requested coefficients
+    loaded_stats = RegressionStatistics.load(file_path, ["c", "a", "b"])
+    order = [2, 0, 1]
+    assert np.allclose(loaded_stats.gram, stats.gram[np.ix_(order, order)])
+    assert np.allclose(loaded_stats.moment, stats.moment[order])
+    assert loaded_stats.n_samples == 50
+    with pytest.raises(ValueError):
+        RegressionStatistics.load(file_path, ["a", "b", "d"])
+
+
+def test_contiguous_folds():
+    # three flight segments separated by gaps in the timestamps
+    timestamps = np.concatenate(
+        (np.arange(0, 100), np.arange(1000, 1100), np.arange(5000, 5100))
+    )
+    fold_vec = compute_contiguous_folds(timestamps, 3)
+    assert np.array_equal(fold_vec, np.repeat([0, 1, 2], 100))
+
+    # a single segment is split into blocks of consecutive samples
+    fold_vec = compute_contiguous_folds(np.arange(10), 5)
+    assert np.array_equal(fold_vec, np.repeat(np.arange(5), 2))
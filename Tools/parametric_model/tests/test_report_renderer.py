@@ -0,0 +1,99 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools.report_renderer import (
+    minmax_envelope,
+    time_series_spec,
+    scatter_3d_spec,
+    matrix_spec,
+    render_report,
+)
+import os
+import numpy as np
+
+
+def test_minmax_envelope():
+    x = np.linspace(0.0, 10.0, 100000)
+    y = np.sin(x) + 0.1 * np.cos(1000.0 * x)
+    x_env, y_env = minmax_envelope(x, y, n_columns=500)
+    assert x_env.shape[0] <= 1000
+    assert np.min(y_env) == np.min(y)
+    assert np.max(y_env) == np.max(y)
+    # unsorted input gives the same envelope
+    order = np.random.default_rng(0).permutation(x.shape[0])
+    x_shuffled, y_shuffled = minmax_envelope(x[order], y[order], n_columns=500)
+    np.testing.assert_array_equal(x_shuffled, x_env)
+    np.testing.assert_array_equal(y_shuffled, y_env)
+    # short series are not reduced
+    x_short, y_short = minmax_envelope(x[:800], y[:800], n_columns=500)
+    np.testing.assert_array_equal(y_short, y[:800])
+
+
+def test_render_report(tmp_path):
+    rng = np.random.default_rng(0)
+    timestamps = np.linspace(0.0, 10.0, 5000)
+    force_mat = rng.normal(size=(5000, 3))
+    figure_specs = [
+        time_series_spec(
+            "force_predictions",
+            "Predictions of the forces",
+            timestamps,
+            {"measured": force_mat, "predicted": 0.9 * force_mat},
+            ["force_x [N]", "force_y [N]", "force_z [N]"],
+        ),
+        scatter_3d_spec(
+            "measured_forces", "Measured forces", force_mat, ["x", "y", "z"]
+        ),
+        matrix_spec(
+            "correlation_matrix",
+            "Correlation",
+            np.corrcoef(force_mat, rowvar=False),
+            "xyz",
+        ),
+    ]
+    index_path = render_report(
+        figure_specs,
+        str(tmp_path),
+        summary_dict={"metrics": {"R2": 0.99}},
+        n_workers=1,
+    )
+    with open(index_path) as file:
+        index = file.read()
+    for spec in figure_specs:
+        assert os.path.getsize(tmp_path / (spec["name"] + ".png")) > 0
+        assert spec["name"] + ".png" in index
+    assert "R2" in index
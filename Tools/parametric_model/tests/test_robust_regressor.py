@@ -0,0 +1,132 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.optimizers import RobustRegressor
+import numpy as np
+import pytest
+
+C_TRUE = np.array([1.0, -2.0, 0.5])
+
+
+def generate_outlier_data(n=400, outlier_ratio=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3))
+    y = X @ C_TRUE + 0.05 * rng.normal(size=n)
+    outliers = rng.random(n) < outlier_ratio
+    y[outliers] += rng.choice([-1.0, 1.0], size=np.count_nonzero(outliers)) * 20.0
+    return X, y, outliers
+
+
+@pytest.mark.parametrize("loss", ["huber", "tukey"])
+def test_robust_regression(loss):
+    X, y, outliers = generate_outlier_data()
+    c_ls, _, _, _ = np.linalg.lstsq(X, y, rcond=None)
+
+    optimizer = RobustRegressor({"robust_regression": {"loss": loss}}, ["a", "b", "c"])
+    optimizer.estimate_parameters(X, y)
+    c_robust = np.array(optimizer.get_optimization_parameters())
+    assert optimizer.converged
+    assert np.linalg.norm(c_robust - C_TRUE) < 0.2 * np.linalg.norm(c_ls - C_TRUE)
+    assert optimizer.compute_optimization_metrics()["Downweighted Ratio"] >= 0.09
+
+
+def test_robust_regression_with_bounds_and_weights():
+    X, y, outliers = generate_outlier_data()
+    optimizer_config = {
+        "parameter_bounds": {"a": (0.0, 2.0), "b": (-1.0, 0.0), "c": (0.5, 0.5)},
+        "robust_regression": {"loss": "tukey"},
+    }
+    optimizer = RobustRegressor(optimizer_config, ["a", "b", "c"])
+    optimizer.estimate_parameters(X, y)
+    c_robust = np.array(optimizer.get_optimization_parameters())
+    # active bound b >= -1, fixed coefficient c
+    assert np.isclose(c_robust[1], -1.0, atol=1e-5)
+    assert c_robust[2] == 0.5
+
+    # squared loss with zero weights on the outliers is least squares on the clean data
+    optimizer = RobustRegressor(
+        {"robust_regression": {"loss": "squared"}}, ["a", "b", "c"]
+    )
+    optimizer.estimate_parameters(X, y, sample_weights=(~outliers).astype(float))
+    c_clean, _, _, _ = np.linalg.lstsq(X[~outliers], y[~outliers], rcond=None)
+    assert np.allclose(optimizer.get_optimization_parameters(), c_clean)
+
+
+def test_robust_regression_with_prior():
+    X, y, outliers = generate_outlier_data()
+    c_prior = np.array([0.0, 0.0, 0.0])
+
+    # the rows are reweighted with a weak prior, a strong prior keeps its coefficients
+    for prior_weight, c_expected, tol in [(1e-3, C_TRUE, 0.05), (1e9, c_prior, 1e-5)]:
+        optimizer = RobustRegressor({}, ["a", "b", "c"])
+        optimizer.estimate_parameters(
+            X,
+            y,
+            prior_gram=prior_weight * np.eye(3),
+            prior_moment=prior_weight * c_prior,
+        )
+        c_robust = np.array(optimizer.get_optimization_parameters())
+        assert optimizer.converged
+        assert np.allclose(c_robust, c_expected, atol=tol)
+
+    # the normal equations of previous clean data enter unweighted
+    X_clean = X[~outliers]
+    y_clean = X_clean @ C_TRUE
+    optimizer = RobustRegressor({}, ["a", "b", "c"])
+    optimizer.estimate_parameters(
+        X, y, prior_gram=X_clean.T @ X_clean, prior_moment=X_clean.T @ y_clean
+    )
+    assert np.allclose(optimizer.get_optimization_parameters(), C_TRUE, atol=0.02)
+
+    # normal equations alone can not be reweighted
+    with pytest.warns(RuntimeWarning):
+        c_gram = optimizer.solve_gram(X.T @ X, X.T @ y)
+    assert np.allclose(c_gram, np.linalg.lstsq(X, y, rcond=None)[0])
+    with pytest.warns(RuntimeWarning):
+        optimizer.solve_regularization_path(X.T @ X, X.T @ y, [0.0, 1e-3])
+
+
+def test_robust_regression_infeasible_bounds():
+    X, y, _ = generate_outlier_data()
+    optimizer = RobustRegressor(
+        {"parameter_bounds": {"a": (0.0, 2.0), "b": (-1.0, 0.0), "c": (0.0, 1.0)}},
+        ["a", "b", "c"],
+    )
+    # a >= 2 and a <= 0
+    optimizer.h = -optimizer.h
+    with pytest.raises(RuntimeError):
+        optimizer.estimate_parameters(X, y)
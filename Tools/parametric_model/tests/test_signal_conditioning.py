@@ -0,0 +1,63 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import signal_conditioning
+import numpy as np
+
+
+def test_angular_acceleration_estimation():
+    t = np.arange(2500) / 250.0
+    freq = np.array([0.5, 2.0, 5.0])
+    ang_vel = np.sin(2 * np.pi * freq * t[:, np.newaxis])
+    ang_acc = 2 * np.pi * freq * np.cos(2 * np.pi * freq * t[:, np.newaxis])
+    noisy_ang_vel = ang_vel + 0.005 * np.random.default_rng(0).normal(
+        size=ang_vel.shape
+    )
+
+    for filter_config in [
+        {},
+        {"method": "butterworth", "cutoff_freq": 15.0},
+        {"method": "savgol", "window_duration": 0.1},
+    ]:
+        ang_acc_est = signal_conditioning.differentiate(
+            noisy_ang_vel, 250.0, **filter_config
+        )
+        # zero phase: no lag, the error stays small compared to the amplitude
+        error = ang_acc_est[100:-100] - ang_acc[100:-100]
+        assert np.all(np.sqrt(np.mean(error**2, axis=0)) < 0.05 * 2 * np.pi * freq)
+
+    filtered = signal_conditioning.lowpass_filter(noisy_ang_vel, 15.0, 250.0)
+    assert np.sqrt(np.mean((filtered - ang_vel) ** 2)) < 0.005
@@ -0,0 +1,79 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import stage_profiler
+from src.tools.stage_profiler import profile_stage
+import numpy as np
+import yaml
+
+
+def test_stage_profiler(tmp_path):
+    # without an active profiler the stages are no-ops
+    with profile_stage("unprofiled"):
+        pass
+    assert stage_profiler.stop_profiling() is None
+
+    profiler = stage_profiler.start_profiling(track_memory=True)
+    with profile_stage("data_loading"):
+        for _ in range(3):
+            with profile_stage("resampling"):
+                np.ones(2**20)
+        with profile_stage("allocation"):
+            data = np.ones(2**22)
+    assert stage_profiler.stop_profiling() is profiler
+    with profile_stage("unprofiled"):
+        pass
+
+    assert list(profiler.stage_dict.keys()) == [
+        "data_loading",
+        "data_loading/resampling",
+        "data_loading/allocation",
+    ]
+    assert profiler.stage_dict["data_loading/resampling"]["calls"] == 3
+    # 32 MB array allocated in the nested stage also counts for its parent
+    for path in ["data_loading", "data_loading/allocation"]:
+        assert profiler.stage_dict[path]["peak_memory_mb"] >= data.nbytes / 1024**2
+    assert profiler.stage_dict["data_loading/resampling"]["peak_memory_mb"] < 16.0
+    assert (
+        profiler.stage_dict["data_loading"]["wall_time"]
+        >= profiler.stage_dict["data_loading/resampling"]["wall_time"]
+    )
+
+    file_path = profiler.save_report_to_yaml("profile", str(tmp_path))
+    with open(file_path) as file:
+        report = yaml.safe_load(file)
+    assert report["stages"]["data_loading/resampling"]["calls"] == 3
+    assert "total_wall_time" in report
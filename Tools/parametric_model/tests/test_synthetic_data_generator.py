@@ -0,0 +1,82 @@
+"""
+ *
+ * Copyright (c) 2023 Autonomous Systems Lab ETH Zurich
+ * All rights reserved.
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions
+ * are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright
+ *    notice, this list of conditions and the following disclaimer.
+ * 2. Redistributions in binary form must reproduce the above copyright
+ *    notice, this list of conditions and the following disclaimer in
+ *    the documentation and/or other materials provided with the
+ *    distribution.
+ * 3. Neither the name Data Driven Dynamics nor the names of its contributors may be
+ *    used to endorse or promote products derived from this software
+ *    without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+ * FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+ * COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+ * INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+ * BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS
+ * OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED
+ * AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+ * LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+ * ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+ * POSSIBILITY OF SUCH DAMAGE.
+ *
+"""
+
+__maintainer__ = "Manuel Yves Galliker, Julius Schlapbach"
+__license__ = "BSD 3"
+
+from src.tools import SyntheticDataGenerator
+from src.tools.synthetic_data_generator import chirp_signal, doublet_signal
+from src.models import MultiRotorModel
+import numpy as np
+import os
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "configs",
+    "quadrotor_model.yaml",
+)
+
+
+def test_excitation_signals():
+    t = np.arange(0, 20, 0.01)
+    chirp = chirp_signal(t, 0.1, 2.0, 10.0)
+    assert np.max(np.abs(chirp)) <= 1.0
+    # continuous, also at the turning points of the sweep
+    assert np.max(np.abs(np.diff(chirp))) < 2 * np.pi * 2.0 * 0.01 * 1.01
+
+    doublet = doublet_signal(t, 5.0, 0.5)
+    assert np.sum(doublet) == 0.0
+    assert np.sum(doublet > 0) == 4 * 50
+
+
+def test_coefficient_recovery():
+    generator = SyntheticDataGenerator(CONFIG_PATH, {})
+    _, coef_name_list, _, _ = generator.compute_features(
+        generator.generate_states(n_samples=10)
+    )
+    rng = np.random.default_rng(0)
+    generator.coefficients = {
+        coef: float(rng.uniform(0.1, 1.0)) for coef in coef_name_list
+    }
+    data_df = generator.generate(duration=20.0, noise=False)
+    assert list(data_df.columns) == generator.columns
+    assert data_df.shape[0] == 20 * generator.resample_freq
+
+    # the pipeline identifies the simulated coefficients from the unnormalized data
+    model = MultiRotorModel(CONFIG_PATH)
+    model.load_dataframes(data_df)
+    model.prepare_regression_matrices()
+    X, y, coef_name_list = model.assemble_regression_matrices(["lin", "rot"])
+    c = np.linalg.lstsq(X, y, rcond=None)[0]
+    c_true = np.array([generator.coefficients[coef] for coef in coef_name_list])
+    assert np.allclose(c, c_true, rtol=1e-6)
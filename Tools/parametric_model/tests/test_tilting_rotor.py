@@ -236,6 +236,34 @@ def test_tilting_z_axis():
     assert np.linalg.norm(rotor.rotor_axis_mat[2, :] - np.array([1, 0, 0])) < 10e-10
 
 
+def test_tilting_moment_features():
+    rotor_config_dict = {
+        "description": "test rotor",
+        "dataframe_name": "u0",
+        "rotor_type": "TiltingRotorModel",
+        "tilt_actuator_dataframe_name": "u_tilt",
+        "rotor_axis": [1, 0, 0],
+        "tilt_axis": [0, 1, 0],
+        "max_tilt_angle_deg": 90,
+        "turning_direction": 1,
+        "position": [0.2, 0.1, 0],
+    }
+
+    actuator_input_vec = np.array([0.2, 0.5, 1])
+    tilt_actuator_vec = np.array([0, 0.5, 1])
+    v_airspeed_mat = np.array([[3, 0, 0], [2, 1, -1], [0, 0, -4]])
+    rotor = TiltingRotorModel(
+        rotor_config_dict, actuator_input_vec, v_airspeed_mat, tilt_actuator_vec
+    )
+    X_moments, coef_dict, col_names = rotor.compute_actuator_moment_matrix()
+    # the leaver moment follows the tilted rotor axis of every timestamp
+    for i in range(3):
+        X_moments_curr = rotor.compute_actuator_moment_features(
+            i, rotor.rotor_axis_mat[i, :]
+        )
+        assert np.allclose(X_moments[i, :], X_moments_curr.flatten("F"))
+
+
 # Run uas module using 'python3 -m tests.test_dynamics_model' for development and testing of the test.
 if __name__ == "__main__":
     # set cwd to project directory when run as module
@@ -249,3 +277,4 @@ if __name__ == "__main__":
     test_tilting_x_axis()
     test_tilting_y_axis()
     test_tilting_z_axis()
+    test_tilting_moment_features()